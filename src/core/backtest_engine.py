@@ -0,0 +1,288 @@
+"""
+Vectorized Backtest Engine
+Long-only backtest with the position rules of tests/validate_signals.py:
+
+- enter at the close when the signal is Buy and confidence > 40
+- while in a position, exit at the stop loss, else at the take profit,
+  else at the close on a Sell signal with confidence > 30
+  (both gates, like the signal thresholds, come from SignalParams)
+- a bar that exits may enter again; a position still open at the end is
+  closed at the last price
+
+With High/Low columns, stop and target hits are decided intrabar: a bar
+stops out when its low reaches the stop and takes profit when its high
+reaches the target, filling at the level (or at the open if the bar gaps
+through it). `ambiguous` picks the outcome of bars that touch both. Without
+them every bar's range collapses to its close, which is the close-only rule.
+
+Signals, confidence, momentum and SL/TP levels are computed for every bar
+up front, then the position logic jumps from event to event: the next entry
+is found by binary search over the entry bars and each exit by scanning
+forward in growing chunks, so the whole run is one linear pass.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, List, Optional
+from .signals import (
+    load_weights, compute_indicator_series, generate_signal_series, _confidence_series,
+    calculate_sl_tp_array, SignalParams, DEFAULT_PARAMS, SIGNAL_BUY, SIGNAL_SELL
+)
+from .metrics import calculate_advanced_metrics
+from .bootstrap import metric_intervals
+
+_FIRST_CHUNK = 64
+
+# Outcomes for a bar whose range touches both the stop and the target:
+# 'stop_first' (conservative), 'target_first' (optimistic) or 'open_nearest'
+# (the level closer to the bar's open is hit first; needs Open, else stop_first)
+AMBIGUOUS_RULES = ('stop_first', 'target_first', 'open_nearest')
+
+
+class ExitReason(IntEnum):
+    """Why a trade was closed."""
+    STOP_LOSS = 0
+    TAKE_PROFIT = 1
+    SIGNAL_EXIT = 2
+    END_OF_PERIOD = 3
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+@dataclass
+class BacktestArrays:
+    """Per-bar inputs to the simulation."""
+    prices: np.ndarray
+    signal: np.ndarray       # int8 signal codes
+    confidence: np.ndarray   # Overall confidence, float64
+    momentum: np.ndarray     # 10-bar momentum used for TP sizing
+    stop_loss: np.ndarray    # SL if entering at this bar
+    take_profit: np.ndarray  # TP if entering at this bar (NaN when open-ended)
+    high: Optional[np.ndarray] = None  # Intrabar range; None means close-only
+    low: Optional[np.ndarray] = None
+    open: Optional[np.ndarray] = None  # For gap fills and 'open_nearest'
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+@dataclass
+class TradeColumns:
+    """Closed trades as parallel arrays, in execution order."""
+    entry_idx: np.ndarray
+    exit_idx: np.ndarray
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    pnl: np.ndarray
+    reason: np.ndarray      # ExitReason codes
+    confidence: np.ndarray  # Overall confidence at entry
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict]:
+        """Trades as the dicts run_backtest reports in 'trade_details'."""
+        n = len(self) if limit is None else min(limit, len(self))
+        return [
+            {
+                'entry': float(self.entry_price[i]),
+                'exit': float(self.exit_price[i]),
+                'pnl': float(self.pnl[i]),
+                'reason': ExitReason(int(self.reason[i])).label
+            }
+            for i in range(n)
+        ]
+
+
+def precompute_arrays(
+    prices,
+    volumes,
+    timeframe: str,
+    weights: Optional[Dict] = None,
+    params: SignalParams = DEFAULT_PARAMS,
+    series: Optional[Dict[str, np.ndarray]] = None,
+    high=None,
+    low=None,
+    open=None
+) -> BacktestArrays:
+    """
+    Everything the simulation reads, computed once for the full series.
+    Works along the last axis, so (symbols x bars) inputs give per-symbol rows.
+    series: Precomputed `compute_indicator_series` output (e.g. shared by
+        configurations that only differ in thresholds)
+    high, low, open: Optional bar prices for intrabar SL/TP (High and Low are
+        used only together)
+    """
+    if weights is None:
+        weights = load_weights()
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    if series is None:
+        series = compute_indicator_series(prices, volumes, timeframe, params)
+
+    signal = generate_signal_series(prices, volumes, timeframe, weights, params, series)
+    confidence = _confidence_series(prices, volumes, timeframe, weights, params, series)['overall']
+
+    base = prices[..., np.maximum(np.arange(prices.shape[-1]) - 10, 0)]
+    momentum = (prices - base) / base * 100
+    stop_loss, take_profit = calculate_sl_tp_array(
+        prices, timeframe, params.risk_percent, momentum, params.sl_tp_factor(timeframe)
+    )
+
+    if high is None or low is None:
+        high = low = None
+    else:
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+    if open is not None:
+        open = np.asarray(open, dtype=float)
+
+    return BacktestArrays(prices, signal, confidence, momentum, stop_loss, take_profit, high, low, open)
+
+
+def _find_exit(
+    low: np.ndarray,
+    high: np.ndarray,
+    exit_signal: np.ndarray,
+    start: int,
+    stop: int,
+    sl: float,
+    tp: float
+) -> int:
+    """First bar in [start, stop) that closes a position, or `stop` if none."""
+    chunk = _FIRST_CHUNK
+    while start < stop:
+        end = min(start + chunk, stop)
+        hit = (low[start:end] <= sl) | exit_signal[start:end]
+        if tp == tp:  # Not NaN
+            hit |= high[start:end] >= tp
+        found = np.flatnonzero(hit)
+        if len(found):
+            return start + int(found[0])
+        start = end
+        chunk *= 2
+    return stop
+
+
+def simulate(
+    arrays: BacktestArrays,
+    start: int = 50,
+    stop: Optional[int] = None,
+    params: SignalParams = DEFAULT_PARAMS,
+    ambiguous: str = 'stop_first'
+) -> TradeColumns:
+    """
+    Run the position logic over bars [start, stop).
+
+    Args:
+        arrays: Output of precompute_arrays
+        start: First tradable bar (earlier bars only feed the indicators)
+        stop: End of the period (default: end of the series)
+        params: Supplies the entry/exit confidence gates
+        ambiguous: Rule for bars touching both SL and TP (see AMBIGUOUS_RULES)
+    """
+    if ambiguous not in AMBIGUOUS_RULES:
+        raise ValueError(f"ambiguous must be one of {AMBIGUOUS_RULES}")
+    n = len(arrays) if stop is None else min(stop, len(arrays))
+    prices = arrays.prices
+    high = arrays.high if arrays.high is not None else prices
+    low = arrays.low if arrays.low is not None else prices
+    bar_open = arrays.open
+    entry_bars = np.flatnonzero((arrays.signal == SIGNAL_BUY) & (arrays.confidence > params.entry_confidence))
+    exit_signal = (arrays.signal == SIGNAL_SELL) & (arrays.confidence > params.exit_confidence)
+
+    entry_idx, exit_idx, exit_price, reasons = [], [], [], []
+    i = start
+    while i < n:
+        k = np.searchsorted(entry_bars, i)
+        if k == len(entry_bars) or entry_bars[k] >= n:
+            break
+        entry = int(entry_bars[k])
+        sl = arrays.stop_loss[entry]
+        tp = arrays.take_profit[entry]
+
+        j = _find_exit(low, high, exit_signal, entry + 1, n, sl, tp)
+        entry_idx.append(entry)
+        if j == n:
+            exit_idx.append(n - 1)
+            exit_price.append(prices[n - 1])
+            reasons.append(ExitReason.END_OF_PERIOD)
+            break
+        exit_idx.append(j)
+        stop_hit = low[j] <= sl
+        target_hit = tp == tp and high[j] >= tp
+        if stop_hit and target_hit:
+            if ambiguous == 'target_first':
+                stop_hit = False
+            elif ambiguous == 'open_nearest' and bar_open is not None:
+                stop_hit = bar_open[j] - sl <= tp - bar_open[j]
+        if stop_hit:
+            # Gapping through the stop fills at the open
+            fill = min(sl, bar_open[j]) if bar_open is not None else sl
+            exit_price.append(fill)
+            reasons.append(ExitReason.STOP_LOSS)
+        elif target_hit:
+            fill = max(tp, bar_open[j]) if bar_open is not None else tp
+            exit_price.append(fill)
+            reasons.append(ExitReason.TAKE_PROFIT)
+        else:
+            exit_price.append(prices[j])
+            reasons.append(ExitReason.SIGNAL_EXIT)
+        i = j  # The exit bar may also enter
+
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    entry_price = prices[entry_idx]
+    exit_price = np.asarray(exit_price, dtype=float)
+    return TradeColumns(
+        entry_idx=entry_idx,
+        exit_idx=np.asarray(exit_idx, dtype=np.int64),
+        entry_price=entry_price,
+        exit_price=exit_price,
+        pnl=(exit_price - entry_price) / entry_price,
+        reason=np.asarray(reasons, dtype=np.int8),
+        confidence=arrays.confidence[entry_idx]
+    )
+
+
+def run_backtest_arrays(
+    prices,
+    volumes,
+    timeframe: str,
+    weights: Optional[Dict] = None,
+    min_history: int = 50,
+    params: SignalParams = DEFAULT_PARAMS,
+    high=None,
+    low=None,
+    open=None,
+    ambiguous: str = 'stop_first',
+    n_bootstrap: int = 0,
+    trade_log=None,
+    bank=None
+) -> Dict:
+    """
+    Backtest a full series; returns the same dict as
+    tests/validate_signals.run_backtest.
+    high, low, open: Optional bar prices for intrabar SL/TP resolution
+    n_bootstrap: If > 0, add 'intervals' (95% bootstrap CI per metric)
+    trade_log: Optional trade_log.TradeLog that receives every closed trade
+    bank: Optional indicator_bank.IndicatorBank over the same prices/volumes,
+        shared by runs on other timeframes or params
+    """
+    series = bank.series(timeframe, params) if bank is not None else None
+    arrays = precompute_arrays(prices, volumes, timeframe, weights, params, series, high=high, low=low, open=open)
+    start = max(min_history, 50)
+    trades = simulate(arrays, start, params=params, ambiguous=ambiguous)
+    if trade_log is not None:
+        trade_log.append(trades)
+
+    equity_curve = np.concatenate(([1.0], np.cumprod(1 + trades.pnl)))
+    metrics = calculate_advanced_metrics(trades.pnl, equity_curve)
+    scores = arrays.confidence[start:]
+    metrics['avg_signal_confidence'] = float(np.mean(scores)) if len(scores) else 0
+    metrics['trade_details'] = trades.to_records(limit=5)
+    if n_bootstrap > 0:
+        metrics['intervals'] = metric_intervals(trades.pnl, n_samples=n_bootstrap, seed=0)
+    return metrics
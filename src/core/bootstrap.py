@@ -0,0 +1,162 @@
+"""
+Bootstrap Confidence Intervals
+Resamples a backtest's trade P&L sequence thousands of times and reports
+percentile intervals for the calculate_advanced_metrics outputs.
+
+All resamples are drawn as one (samples x trades) index matrix and every
+metric is computed along its rows, so a 2000-sample interval costs a few
+array operations. The block bootstrap keeps runs of consecutive trades
+together, which preserves streaks and gives more honest drawdown intervals.
+"""
+
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+METRICS = ('roi', 'sharpe', 'drawdown', 'win_rate', 'profit_factor', 'recovery', 'calmar')
+
+# Rows per chunk are capped so a chunk holds about this many floats
+_MAX_CHUNK_ELEMENTS = 1 << 22
+
+
+def resample_indices(
+    n_trades: int,
+    n_samples: int,
+    block_size: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    (n_samples x n_trades) indices into the trade sequence.
+
+    Args:
+        block_size: None for the iid bootstrap, else the length of the
+            circular blocks drawn for the moving-block bootstrap
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if block_size is None or block_size <= 1:
+        return rng.integers(0, n_trades, size=(n_samples, n_trades))
+    n_blocks = -(-n_trades // block_size)
+    starts = rng.integers(0, n_trades, size=(n_samples, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % n_trades
+    return idx.reshape(n_samples, -1)[:, :n_trades]
+
+
+def metrics_matrix(pnl: np.ndarray) -> Dict[str, np.ndarray]:
+    """calculate_advanced_metrics for every row of a (samples x trades) matrix."""
+    n = pnl.shape[1]
+    cum = np.cumsum(pnl, axis=1)
+    total = cum[:, -1]
+    roi = total * 100
+    std = pnl.std(axis=1) if n > 1 else np.zeros(len(pnl))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, total / n / std * np.sqrt(n), 0.0)
+
+    peak = np.maximum.accumulate(cum, axis=1)
+    drawdown = np.min(np.subtract(cum, peak, out=peak), axis=1) * 100
+
+    gross_wins = np.maximum(pnl, 0.0).sum(axis=1)
+    gross_losses = -np.minimum(pnl, 0.0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_factor = np.where(
+            gross_losses > 0, gross_wins / gross_losses, np.where(gross_wins > 0, 999.0, 0.0)
+        )
+        recovery = np.where(drawdown < 0, roi / np.abs(drawdown), 0.0)
+
+    return {
+        'roi': roi,
+        'sharpe': sharpe,
+        'drawdown': drawdown,
+        'win_rate': np.count_nonzero(pnl > 0, axis=1) / n * 100,
+        'profit_factor': profit_factor,
+        'recovery': recovery,
+        'calmar': recovery
+    }
+
+
+def bootstrap_metrics(
+    trades: Sequence[float],
+    n_samples: int = 2000,
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Metric values for `n_samples` resampled trade sequences.
+
+    Returns:
+        Dict metric -> (n_samples,) array; empty arrays when there are no trades
+    """
+    trades = np.asarray(trades, dtype=float)
+    if len(trades) == 0:
+        return {name: np.zeros(0) for name in METRICS}
+    rng = np.random.default_rng(seed)
+    rows = max(1, _MAX_CHUNK_ELEMENTS // len(trades))
+    parts = []
+    for start in range(0, n_samples, rows):
+        idx = resample_indices(len(trades), min(rows, n_samples - start), block_size, rng)
+        parts.append(metrics_matrix(trades[idx]))
+    return {name: np.concatenate([p[name] for p in parts]) for name in METRICS}
+
+
+def metric_intervals(
+    trades: Sequence[float],
+    confidence: float = 0.95,
+    n_samples: int = 2000,
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    metrics: Sequence[str] = METRICS
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Percentile bootstrap intervals.
+
+    Returns:
+        Dict metric -> (low, high) at the given two-sided confidence level
+        ((0.0, 0.0) when there are no trades)
+    """
+    samples = bootstrap_metrics(trades, n_samples, block_size, seed)
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for name in metrics:
+        values = samples[name]
+        if len(values) == 0:
+            intervals[name] = (0.0, 0.0)
+            continue
+        low, high = np.percentile(values, [tail, 100 - tail])
+        intervals[name] = (float(low), float(high))
+    return intervals
+
+
+def probability_above(
+    trades: Sequence[float],
+    threshold: float,
+    metric: str = 'sharpe',
+    n_samples: int = 2000,
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None
+) -> float:
+    """Share of resamples where `metric` exceeds `threshold`."""
+    values = bootstrap_metrics(trades, n_samples, block_size, seed)[metric]
+    return float(np.mean(values > threshold)) if len(values) else 0.0
+
+
+if __name__ == '__main__':
+    import time
+    from .metrics import calculate_advanced_metrics
+
+    rng = np.random.default_rng(4)
+    trades = rng.normal(0.004, 0.03, 400)
+    point = calculate_advanced_metrics(trades, None)
+
+    start = time.perf_counter()
+    iid = metric_intervals(trades, seed=1)
+    iid_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    block = metric_intervals(trades, block_size=10, seed=1)
+    block_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(trades)} trades, 2000 resamples: iid {iid_ms:.1f} ms, block {block_ms:.1f} ms\n")
+    print("| Metric        | Point   | iid 95% CI          | Block 95% CI        |")
+    print("|---------------|---------|---------------------|---------------------|")
+    for name in METRICS:
+        lo, hi = iid[name]
+        blo, bhi = block[name]
+        print(f"| {name:13} | {point[name]:7.2f} | [{lo:7.2f}, {hi:7.2f}] | [{blo:7.2f}, {bhi:7.2f}] |")
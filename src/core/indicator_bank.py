@@ -0,0 +1,121 @@
+"""
+Indicator Bank
+Shared indicator series for one price/volume history.
+
+Cumulative sums of prices and volumes are taken once; after that a moving
+average or volume mean of any window is a single subtraction per bar. RSI,
+momentum and every derived series are cached by period, so backtests over
+several timeframes or many SignalParams configurations compute each
+indicator only once. The cache can be bounded, evicting the least recently
+used series. Results are identical to the per-call functions in signals.py.
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from .signals import (
+    _shifted_cumsum, _window_sum, _window_partial_mean, calculate_rsi_series,
+    calculate_momentum_series, SignalParams, DEFAULT_PARAMS
+)
+
+
+class IndicatorBank:
+    """Lazily built, cached indicator series (along the last axis)."""
+
+    def __init__(self, prices, volumes, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries: Most cached series kept (None: unbounded); long sweeps
+                over many periods should set it
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.prices = np.asarray(prices, dtype=float)
+        self.volumes = np.asarray(volumes, dtype=float)
+        if self.prices.shape != self.volumes.shape:
+            raise ValueError("prices and volumes must have the same shape")
+        self._price_sums: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._volume_sums: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.max_entries = max_entries
+        self._cache: Dict[Tuple[str, int], np.ndarray] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return self.prices.shape[-1]
+
+    def _cached(self, name: str, period: int, build) -> np.ndarray:
+        key = (name, period)
+        values = self._cache.get(key)
+        if values is not None:
+            self._cache.move_to_end(key)
+            return values
+        values = build()
+        values.flags.writeable = False  # Shared by every caller
+        self._cache[key] = values
+        if self.max_entries is not None and len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return values
+
+    def ma(self, period: int) -> np.ndarray:
+        """calculate_ma_series(prices, period)."""
+        if self._price_sums is None:
+            self._price_sums = _shifted_cumsum(self.prices)
+        return self._cached('ma', period, lambda: _window_sum(*self._price_sums, period) / period)
+
+    def avg_volume(self, period: int) -> np.ndarray:
+        """calculate_partial_mean_series(volumes, period)."""
+        if self._volume_sums is None:
+            self._volume_sums = _shifted_cumsum(self.volumes)
+        return self._cached('avg_volume', period, lambda: _window_partial_mean(*self._volume_sums, period))
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        """calculate_rsi_series(prices, period)."""
+        return self._cached('rsi', period, lambda: calculate_rsi_series(self.prices, period))
+
+    def momentum(self, period: int = 10) -> np.ndarray:
+        """calculate_momentum_series(prices, period)."""
+        return self._cached('momentum', period, lambda: calculate_momentum_series(self.prices, period))
+
+    def series(self, timeframe: str, params: SignalParams = DEFAULT_PARAMS) -> Dict[str, np.ndarray]:
+        """compute_indicator_series(prices, volumes, timeframe, params), from the cache."""
+        short_period, long_period = params.periods(timeframe)
+        return {
+            'ma_short': self.ma(short_period),
+            'ma_long': self.ma(long_period),
+            'rsi': self.rsi(),
+            'momentum': self.momentum(min(10, short_period)),
+            'current_volume': self.volumes,
+            'avg_volume': self.avg_volume(long_period)
+        }
+
+    def clear(self):
+        """Drop cached series (the cumulative sums are kept)."""
+        self._cache.clear()
+
+
+if __name__ == '__main__':
+    import time
+    from .signals import compute_indicator_series
+
+    np.random.seed(19)
+    n_bars = 200000
+    prices = 60000 * np.cumprod(1 + np.random.normal(0, 0.02, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e10
+    periods = [(s, l) for s in range(3, 21) for l in range(20, 101, 10) if s < l]
+    configs = [SignalParams(short_period=s, long_period=l) for s, l in periods]
+
+    start = time.perf_counter()
+    direct = [compute_indicator_series(prices, volumes, 'daily', p) for p in configs]
+    direct_s = time.perf_counter() - start
+    bank = IndicatorBank(prices, volumes)
+    start = time.perf_counter()
+    shared = [bank.series('daily', p) for p in configs]
+    bank_s = time.perf_counter() - start
+
+    same = all(
+        np.array_equal(a[k], b[k], equal_nan=True) for a, b in zip(direct, shared) for k in a
+    )
+    print(f"{len(configs)} configs x {n_bars} bars: direct {direct_s:.2f}s, bank {bank_s:.2f}s "
+          f"({direct_s / bank_s:.0f}x)")
+    print(f"Identical series: {'OK' if same else 'MISMATCH'}")
@@ -0,0 +1,199 @@
+"""
+Backtest Metrics
+Trade-level performance metrics shared by the backtest engine and the
+validation scripts.
+
+`calculate_advanced_metrics` works on a full trade list; `MetricsAccumulator`
+produces the same numbers online, one trade (or batch) at a time, and merges
+shards computed in parallel.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+
+def calculate_advanced_metrics(trades: List[float], equity_curve: List[float]) -> Dict[str, float]:
+    """
+    Calculate comprehensive backtest metrics.
+    
+    Args:
+        trades: List of trade P&L ratios
+        equity_curve: List of cumulative equity values
+    
+    Returns:
+        Dictionary with advanced metrics
+    """
+    if len(trades) == 0:
+        return {
+            'roi': 0, 'sharpe': 0, 'drawdown': 0, 'win_rate': 0, 
+            'count': 0, 'profit_factor': 0, 'recovery': 0, 'calmar': 0
+        }
+    
+    trades = np.asarray(trades, dtype=float)
+    roi = trades.sum() * 100
+    win_count = int(np.count_nonzero(trades > 0))
+    win_rate = win_count / len(trades) * 100
+    
+    # Sharpe Ratio
+    avg_pnl = np.mean(trades)
+    std_pnl = np.std(trades) if len(trades) > 1 else 0
+    sharpe = (avg_pnl / std_pnl * np.sqrt(len(trades))) if std_pnl > 0 else 0
+    
+    # Maximum Drawdown
+    cum_returns = np.cumsum(trades)
+    peak = np.maximum.accumulate(cum_returns)
+    drawdown = np.min(cum_returns - peak) * 100
+    
+    # Profit Factor (gross wins / gross losses)
+    gross_wins = trades[trades > 0].sum()
+    gross_losses = abs(trades[trades < 0].sum())
+    profit_factor = (gross_wins / gross_losses) if gross_losses > 0 else float('inf') if gross_wins > 0 else 0
+    
+    # Recovery Factor (ROI / Max Drawdown)
+    recovery = (roi / abs(drawdown)) if drawdown < 0 else 0
+    
+    # Calmar Ratio (annual return / max drawdown)
+    calmar = (roi / abs(drawdown)) if drawdown < 0 else 0
+    
+    return {
+        'roi': float(roi),
+        'sharpe': float(sharpe),
+        'drawdown': float(drawdown),
+        'win_rate': float(win_rate),
+        'count': len(trades),
+        'profit_factor': float(profit_factor) if profit_factor != float('inf') else 999,
+        'recovery': float(recovery),
+        'calmar': float(calmar)
+    }
+
+
+@dataclass
+class MetricsAccumulator:
+    """
+    Running state for calculate_advanced_metrics over a trade sequence.
+
+    Mean and variance use Welford's update; drawdown tracks the running peak
+    of cumulative P&L. Shards merge in sequence order: `a.merge(b)` is the
+    state of a's trades followed by b's.
+
+    Usage:
+        acc = MetricsAccumulator()
+        for pnl in closed_trades:
+            acc.update(pnl)
+        metrics = acc.to_dict()
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0            # Sum of squared deviations from the mean
+    total: float = 0.0         # Cumulative P&L
+    peak: float = -np.inf      # Highest cumulative P&L after any trade
+    trough: float = np.inf     # Lowest cumulative P&L after any trade
+    max_drawdown: float = 0.0  # Most negative cumulative P&L minus its running peak
+    wins: int = 0
+    gross_wins: float = 0.0
+    gross_losses: float = 0.0  # Sum of losing trades (<= 0)
+
+    def update(self, pnl: float):
+        """Add one closed trade's P&L ratio."""
+        pnl = float(pnl)
+        self.count += 1
+        delta = pnl - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (pnl - self.mean)
+
+        self.total += pnl
+        self.peak = max(self.peak, self.total)
+        self.trough = min(self.trough, self.total)
+        self.max_drawdown = min(self.max_drawdown, self.total - self.peak)
+
+        if pnl > 0:
+            self.wins += 1
+            self.gross_wins += pnl
+        elif pnl < 0:
+            self.gross_losses += pnl
+
+    def update_many(self, pnls: Sequence[float]):
+        """Add a batch of trades in order (vectorized, then merged)."""
+        self.merge_inplace(MetricsAccumulator.from_trades(pnls))
+
+    @classmethod
+    def from_trades(cls, pnls: Sequence[float]) -> 'MetricsAccumulator':
+        """Accumulator for a whole trade list, computed with array operations."""
+        pnls = np.asarray(pnls, dtype=float)
+        if len(pnls) == 0:
+            return cls()
+        cum = np.cumsum(pnls)
+        running_peak = np.maximum.accumulate(cum)
+        mean = float(pnls.mean())
+        return cls(
+            count=len(pnls),
+            mean=mean,
+            m2=float(np.sum((pnls - mean) ** 2)),
+            total=float(cum[-1]),
+            peak=float(running_peak[-1]),
+            trough=float(cum.min()),
+            max_drawdown=float(np.min(cum - running_peak)),
+            wins=int(np.count_nonzero(pnls > 0)),
+            gross_wins=float(pnls[pnls > 0].sum()),
+            gross_losses=float(pnls[pnls < 0].sum())
+        )
+
+    def merge(self, other: 'MetricsAccumulator') -> 'MetricsAccumulator':
+        """State for this shard's trades followed by `other`'s."""
+        if other.count == 0:
+            return MetricsAccumulator(**self.__dict__)
+        if self.count == 0:
+            return MetricsAccumulator(**other.__dict__)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return MetricsAccumulator(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            total=self.total + other.total,
+            peak=max(self.peak, self.total + other.peak),
+            trough=min(self.trough, self.total + other.trough),
+            # Either shard's own drawdown, or other's low measured from self's peak
+            max_drawdown=min(self.max_drawdown, other.max_drawdown, self.total + other.trough - self.peak),
+            wins=self.wins + other.wins,
+            gross_wins=self.gross_wins + other.gross_wins,
+            gross_losses=self.gross_losses + other.gross_losses
+        )
+
+    def merge_inplace(self, other: 'MetricsAccumulator'):
+        """Append `other`'s trades to this accumulator."""
+        self.__dict__.update(self.merge(other).__dict__)
+
+    @classmethod
+    def merge_all(cls, shards: Sequence['MetricsAccumulator']) -> 'MetricsAccumulator':
+        """Merge shards given in sequence order."""
+        result = cls()
+        for shard in shards:
+            result = result.merge(shard)
+        return result
+
+    def to_dict(self) -> Dict[str, float]:
+        """Same keys and values as calculate_advanced_metrics."""
+        if self.count == 0:
+            return calculate_advanced_metrics([], [])
+        roi = self.total * 100
+        std = np.sqrt(self.m2 / self.count) if self.count > 1 else 0
+        sharpe = (self.mean / std * np.sqrt(self.count)) if std > 0 else 0
+        drawdown = self.max_drawdown * 100
+        gross_losses = abs(self.gross_losses)
+        if gross_losses > 0:
+            profit_factor = self.gross_wins / gross_losses
+        else:
+            profit_factor = 999 if self.gross_wins > 0 else 0
+        recovery = (roi / abs(drawdown)) if drawdown < 0 else 0
+        return {
+            'roi': float(roi),
+            'sharpe': float(sharpe),
+            'drawdown': float(drawdown),
+            'win_rate': float(self.wins / self.count * 100),
+            'count': self.count,
+            'profit_factor': float(profit_factor),
+            'recovery': float(recovery),
+            'calmar': float(recovery)
+        }
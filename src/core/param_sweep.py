@@ -0,0 +1,339 @@
+"""
+Parameter Sweep Runner
+Grid or random search over SignalParams, with backtests spread over a
+process pool.
+
+The price/volume series is copied once into a shared-memory block that each
+worker attaches to in its initializer, so only the small SignalParams
+objects travel to the workers. Each worker keeps a bounded IndicatorBank
+over the shared data and gets configurations grouped by period, so an MA,
+RSI or volume mean is computed once for all the neighbouring configurations
+that use it. Result rows arrive as chunks finish.
+"""
+
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields, replace
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+from .signals import load_weights, SignalParams, DEFAULT_PARAMS
+from .backtest_engine import precompute_arrays, simulate, BacktestArrays, TradeColumns
+from .indicator_bank import IndicatorBank
+from .metrics import calculate_advanced_metrics
+from .bootstrap import metric_intervals
+
+PARAM_NAMES = tuple(f.name for f in fields(SignalParams))
+METRIC_COLUMNS = ('roi', 'sharpe', 'drawdown', 'win_rate', 'count', 'profit_factor')
+
+# Indicator series each worker keeps cached (a config needs five; chunks are
+# ordered by period, so recent series are the ones reused)
+BANK_ENTRIES = 64
+
+
+def grid_space(
+    space: Dict[str, Sequence],
+    base: SignalParams = DEFAULT_PARAMS,
+    timeframe: str = 'daily'
+) -> List[SignalParams]:
+    """
+    Every valid combination of the listed values.
+
+    Args:
+        space: SignalParams field name -> candidate values
+        base: Values for fields not in `space`
+        timeframe: Timeframe the configs will run on; periods left as None
+            are checked at its default values
+    """
+    unknown = set(space) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    names = list(space)
+    configs = [replace(base, **dict(zip(names, values))) for values in itertools.product(*space.values())]
+    return [c for c in configs if _valid(c, timeframe)]
+
+
+def random_space(
+    space: Dict[str, Sequence],
+    n_samples: int,
+    base: SignalParams = DEFAULT_PARAMS,
+    seed: Optional[int] = None,
+    timeframe: str = 'daily'
+) -> List[SignalParams]:
+    """
+    `n_samples` random valid configurations.
+
+    Args:
+        space: Field name -> list of choices, or a (low, high) tuple sampled
+            uniformly (integers when both bounds are ints)
+        timeframe: As in grid_space
+    """
+    unknown = set(space) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    rng = np.random.default_rng(seed)
+    configs = []
+    attempts = 0
+    while len(configs) < n_samples and attempts < n_samples * 20:
+        attempts += 1
+        values = {}
+        for name, spec in space.items():
+            if isinstance(spec, tuple) and len(spec) == 2:
+                low, high = spec
+                if isinstance(low, int) and isinstance(high, int):
+                    values[name] = int(rng.integers(low, high + 1))
+                else:
+                    values[name] = float(rng.uniform(low, high))
+            else:
+                values[name] = spec[rng.integers(len(spec))]
+        config = replace(base, **values)
+        if _valid(config, timeframe):
+            configs.append(config)
+    return configs
+
+
+def _valid(params: SignalParams, timeframe: str) -> bool:
+    short_period, long_period = params.periods(timeframe)
+    return 0 < short_period < long_period
+
+
+class SharedSeries:
+    """
+    Prices, volumes and any optional bar columns ('open', 'high', 'low') as
+    rows of one float64 shared-memory block.
+    """
+
+    def __init__(self, prices, volumes, bars: Optional[Dict[str, Sequence]] = None):
+        bars = {k: v for k, v in (bars or {}).items() if v is not None}
+        self.columns = ('prices', 'volumes') + tuple(bars)
+        data = np.vstack([np.asarray(c, dtype=float) for c in [prices, volumes, *bars.values()]])
+        self.shape = data.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)[:] = data
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """Release and remove the block (owner only)."""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-worker state, set by attach_shared
+_worker = {}
+
+
+def attach_shared(
+    shm_name: str,
+    shape,
+    columns,
+    timeframe: str,
+    weights: Dict,
+    min_history: int = 50,
+    ambiguous: str = 'stop_first',
+    n_bootstrap: int = 0
+):
+    """
+    Process pool initializer: attach this worker to a SharedSeries (by its
+    name, shape and columns) and set the backtest settings used by
+    worker_arrays and evaluate_window.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker.update(
+        shm=shm,  # Keep the mapping alive
+        bars={name: data[i] for i, name in enumerate(columns[2:], start=2)},
+        prices=data[0],
+        volumes=data[1],
+        timeframe=timeframe,
+        weights=weights,
+        min_history=min_history,
+        ambiguous=ambiguous,
+        n_bootstrap=n_bootstrap,
+        bank=IndicatorBank(data[0], data[1], max_entries=BANK_ENTRIES)
+    )
+
+
+def worker_arrays(params: SignalParams) -> BacktestArrays:
+    """Backtest arrays for a config from the attached shared data."""
+    return precompute_arrays(
+        _worker['prices'], _worker['volumes'], _worker['timeframe'], _worker['weights'],
+        params, _worker['bank'].series(_worker['timeframe'], params), **_worker['bars']
+    )
+
+
+def evaluate_window(
+    params: SignalParams,
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+    arrays: Optional[BacktestArrays] = None
+) -> TradeColumns:
+    """
+    Trades of a config over bars [start, stop) of the attached series.
+
+    Args:
+        start: First tradable bar (default: the attached min_history)
+        arrays: worker_arrays(params), when evaluating several windows
+    """
+    if arrays is None:
+        arrays = worker_arrays(params)
+    if start is None:
+        start = max(_worker['min_history'], 50)
+    return simulate(arrays, start, stop, params=params, ambiguous=_worker['ambiguous'])
+
+
+def _evaluate(params: SignalParams) -> Dict:
+    trades = evaluate_window(params)
+    metrics = calculate_advanced_metrics(trades.pnl, None)
+    row = asdict(params)
+    row.update({key: metrics[key] for key in METRIC_COLUMNS})
+    if _worker['n_bootstrap'] > 0:
+        low, high = metric_intervals(trades.pnl, n_samples=_worker['n_bootstrap'], seed=0, metrics=('sharpe',))['sharpe']
+        row.update(sharpe_low=low, sharpe_high=high)
+    return row
+
+
+def _run_chunk(configs: List[SignalParams]) -> List[Dict]:
+    return [_evaluate(params) for params in configs]
+
+
+def iter_sweep(
+    prices,
+    volumes,
+    configs: Sequence[SignalParams],
+    timeframe: str = 'daily',
+    weights: Optional[Dict] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    min_history: int = 50,
+    bars: Optional[Dict[str, Sequence]] = None,
+    ambiguous: str = 'stop_first',
+    n_bootstrap: int = 0
+) -> Iterator[Dict]:
+    """
+    Backtest every configuration, yielding result rows as chunks finish.
+
+    Each row holds the SignalParams fields plus METRIC_COLUMNS.
+
+    Args:
+        bars: Optional 'open'/'high'/'low' arrays for intrabar SL/TP
+        ambiguous: Rule for bars touching both SL and TP (see backtest_engine)
+        n_bootstrap: If > 0, add 'sharpe_low'/'sharpe_high' (95% bootstrap CI)
+    """
+    if weights is None:
+        weights = load_weights()
+    if not configs:
+        return
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    # Neighbouring configs share MA periods, so keep them in the same chunk
+    ordered = sorted(configs, key=lambda p: p.periods(timeframe))
+    if chunk_size is None:
+        chunk_size = max(1, min(256, len(ordered) // (max_workers * 8)))
+    chunks = [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+
+    with SharedSeries(prices, volumes, bars) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=attach_shared,
+            initargs=(shared.name, shared.shape, shared.columns, timeframe, weights, min_history,
+                      ambiguous, n_bootstrap)
+        ) as pool:
+            futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+
+def run_sweep(
+    prices,
+    volumes,
+    configs: Sequence[SignalParams],
+    timeframe: str = 'daily',
+    weights: Optional[Dict] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    min_history: int = 50,
+    sort_by: Optional[str] = 'sharpe',
+    on_result: Optional[Callable[[Dict], None]] = None,
+    bars: Optional[Dict[str, Sequence]] = None,
+    ambiguous: str = 'stop_first',
+    n_bootstrap: int = 0,
+    min_trades: int = 20
+) -> List[Dict]:
+    """
+    Collect iter_sweep into a results table (list of rows).
+
+    Args:
+        sort_by: Metric to sort by, best first (None keeps completion order).
+            'sharpe' ranks by 'sharpe_low' when n_bootstrap > 0
+        on_result: Called with each row as soon as it arrives
+        min_trades: Rows with fewer trades are sorted after all others, since
+            a handful of trades can give an arbitrarily large Sharpe
+    """
+    rows = []
+    rows_iter = iter_sweep(
+        prices, volumes, configs, timeframe, weights, max_workers, chunk_size, min_history, bars, ambiguous,
+        n_bootstrap
+    )
+    for row in rows_iter:
+        rows.append(row)
+        if on_result is not None:
+            on_result(row)
+    if sort_by is not None:
+        if sort_by == 'sharpe' and n_bootstrap > 0:
+            sort_by = 'sharpe_low'
+        rows.sort(key=lambda row: (row['count'] >= min_trades, row[sort_by]), reverse=True)
+    return rows
+
+
+def format_results_table(rows: List[Dict], top: int = 10, columns: Optional[Sequence[str]] = None) -> str:
+    """Markdown table of the first `top` rows, showing only swept columns by default."""
+    if not rows:
+        return "(no results)"
+    if columns is None:
+        varying = [name for name in PARAM_NAMES if len({row[name] for row in rows}) > 1]
+        columns = varying + list(METRIC_COLUMNS)
+        if 'sharpe_low' in rows[0]:
+            columns += ['sharpe_low', 'sharpe_high']
+
+    def fmt(value):
+        return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + "|".join("---" for _ in columns) + "|"]
+    for row in rows[:top]:
+        lines.append("| " + " | ".join(fmt(row[c]) for c in columns) + " |")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    import time
+
+    np.random.seed(21)
+    n_bars = 20000
+    prices = 60000 * np.cumprod(1 + np.random.normal(0, 0.02, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e10
+
+    configs = grid_space({
+        'short_period': [5, 7, 10, 14],
+        'long_period': [20, 30, 50],
+        'rsi_buy_max': [65, 70, 75],
+        'risk_percent': [0.01, 0.02, 0.03],
+        'entry_confidence': [30, 40, 50],
+        'exit_confidence': [20, 30]
+    }, timeframe='4h')
+    print(f"Sweeping {len(configs)} configurations over {n_bars} bars...")
+    start = time.perf_counter()
+    rows = run_sweep(prices, volumes, configs, timeframe='4h', n_bootstrap=500)
+    elapsed = time.perf_counter() - start
+    print(f"Done in {elapsed:.1f}s ({len(rows) / elapsed:.0f} configs/sec)\n")
+    print("Ranked by the Sharpe lower bound; configs with fewer than 20 trades last\n")
+    print(format_results_table(rows, top=10))
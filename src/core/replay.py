@@ -0,0 +1,244 @@
+"""
+Replay Harness
+Load test for the live signal path without an exchange feed.
+
+A producer task releases historical bars on a simulated clock (bar time
+divided by `speedup`) into a bounded asyncio queue; a consumer task
+appends each bar to a PriceHistoryStore and asks a SignalGenerator (in a
+worker thread) or a SignalService for the multi-timeframe summary, exactly
+as a live feed handler would. Per bar it records the latency from the bar's scheduled
+arrival to its signal, the pure evaluation time and the queue depth, so a
+consumer that falls behind the feed shows up as growing depth and latency.
+"""
+
+import asyncio
+import csv
+import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple, Union
+from .ring_buffer import PriceHistoryStore
+from .signal_integration import SignalGenerator
+from .signal_service import SignalService
+
+PERCENTILES = (50, 90, 99)
+
+
+def load_csv(
+    path: str,
+    time_column: str = 'Date',
+    price_column: str = 'Close',
+    volume_column: str = 'Volume'
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bars from a CSV such as kaggle_data/bitcoin_demo.csv.
+
+    Returns:
+        (timestamps in epoch seconds, prices, volumes); timestamps are bar
+        numbers when the file has no time column
+    """
+    times, prices, volumes = [], [], []
+    with open(path, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        has_time = time_column in (reader.fieldnames or [])
+        for i, row in enumerate(reader):
+            times.append(datetime.fromisoformat(row[time_column]).timestamp() if has_time else float(i))
+            prices.append(float(row[price_column]))
+            volumes.append(float(row[volume_column]))
+    return np.asarray(times), np.asarray(prices), np.asarray(volumes)
+
+
+@dataclass
+class ReplayReport:
+    """Measurements of one replay (times in seconds)."""
+    bars: int
+    elapsed: float
+    latency: np.ndarray       # Scheduled arrival -> signal ready, per bar
+    service_time: np.ndarray  # Evaluation only, per bar
+    queue_depth: np.ndarray   # Bars waiting when each bar was taken
+    producer_lag: np.ndarray  # How late each bar was released vs its schedule
+    signals: Counter = field(default_factory=Counter)
+
+    @property
+    def throughput(self) -> float:
+        """Bars evaluated per wall-clock second."""
+        return self.bars / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        def pct(values):
+            if len(values) == 0:
+                return {f"p{q}": 0.0 for q in PERCENTILES}
+            return {f"p{q}": float(v) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+        return {
+            'bars': self.bars,
+            'elapsed': self.elapsed,
+            'throughput': self.throughput,
+            'latency_ms': {k: v * 1000 for k, v in pct(self.latency).items()},
+            'service_ms': {k: v * 1000 for k, v in pct(self.service_time).items()},
+            'max_latency_ms': float(self.latency.max() * 1000) if self.bars else 0.0,
+            'queue_depth': {
+                'mean': float(self.queue_depth.mean()) if self.bars else 0.0,
+                'max': int(self.queue_depth.max()) if self.bars else 0
+            },
+            'max_producer_lag_ms': float(self.producer_lag.max() * 1000) if len(self.producer_lag) else 0.0,
+            'signals': dict(self.signals)
+        }
+
+    def summary_string(self) -> str:
+        d = self.to_dict()
+        lat, svc = d['latency_ms'], d['service_ms']
+        return (
+            f"Bars: {d['bars']} in {d['elapsed']:.2f}s ({d['throughput']:.0f} bars/sec)\n"
+            f"Latency ms: p50 {lat['p50']:.2f}, p90 {lat['p90']:.2f}, p99 {lat['p99']:.2f}, "
+            f"max {d['max_latency_ms']:.2f}\n"
+            f"Service ms: p50 {svc['p50']:.2f}, p90 {svc['p90']:.2f}, p99 {svc['p99']:.2f}\n"
+            f"Queue depth: mean {d['queue_depth']['mean']:.2f}, max {d['queue_depth']['max']}\n"
+            f"Signals: {d['signals']}"
+        )
+
+
+class ReplayHarness:
+    """
+    Usage:
+        harness = ReplayHarness.from_csv('kaggle_data/bitcoin_demo.csv', speedup=86400)
+        report = harness.run_sync()
+        print(report.summary_string())
+    """
+
+    def __init__(
+        self,
+        timestamps: Sequence[float],
+        prices: Sequence[float],
+        volumes: Sequence[float],
+        target: Optional[Union[SignalGenerator, SignalService]] = None,
+        speedup: Optional[float] = None,
+        warmup: int = 50,
+        queue_size: int = 1024,
+        history: int = 5000,
+        symbol: str = 'REPLAY'
+    ):
+        """
+        Args:
+            timestamps: Bar times in seconds, increasing
+            target: SignalGenerator (evaluated in a worker thread) or
+                SignalService (awaited). Default: a new SignalGenerator
+            speedup: Simulated seconds per wall second; None floods the
+                queue (a throughput test, where latency includes the backlog)
+            warmup: Leading bars loaded as history before the clock starts
+            queue_size: Feed queue bound; a full queue stalls the producer
+            history: Bars of history kept per symbol
+        """
+        self.timestamps = np.asarray(timestamps, dtype=float)
+        self.prices = np.asarray(prices, dtype=float)
+        self.volumes = np.asarray(volumes, dtype=float)
+        if not (len(self.timestamps) == len(self.prices) == len(self.volumes)):
+            raise ValueError("timestamps, prices and volumes must have the same length")
+        if speedup is not None and speedup <= 0:
+            raise ValueError("speedup must be positive")
+        self.target = target if target is not None else SignalGenerator()
+        self.speedup = speedup
+        self.warmup = min(warmup, len(self.prices))
+        self.queue_size = queue_size
+        self.history = history
+        self.symbol = symbol
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> 'ReplayHarness':
+        return cls(*load_csv(path), **kwargs)
+
+    async def run(self) -> ReplayReport:
+        """Replay every bar after the warm-up and measure the signal path."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        store = PriceHistoryStore(capacity=self.history)
+        store.extend(self.symbol, self.prices[:self.warmup], self.volumes[:self.warmup])
+        n = len(self.prices) - self.warmup
+        lag = np.zeros(n)
+        latency = np.zeros(n)
+        service_time = np.zeros(n)
+        depth = np.zeros(n, dtype=np.int64)
+        signals = Counter()
+        executor = ThreadPoolExecutor(max_workers=1) if not isinstance(self.target, SignalService) else None
+
+        async def evaluate(prices, volumes):
+            if executor is None:
+                return await self.target.get_signals(self.symbol, prices, volumes)
+            return await loop.run_in_executor(executor, self.target.generate_signal_summary, prices, volumes)
+
+        async def produce():
+            t0 = loop.time()
+            ts0 = self.timestamps[self.warmup] if n else 0.0
+            for k in range(n):
+                i = self.warmup + k
+                if self.speedup is None:
+                    due = loop.time()
+                else:
+                    due = t0 + (self.timestamps[i] - ts0) / self.speedup
+                    delay = due - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await queue.put((i, due))
+                lag[k] = max(0.0, loop.time() - due)
+            await queue.put(None)
+
+        async def consume():
+            while True:
+                waiting = queue.qsize()
+                item = await queue.get()
+                if item is None:
+                    return
+                i, due = item
+                k = i - self.warmup
+                depth[k] = waiting
+                store.append(self.symbol, self.prices[i], self.volumes[i])
+                prices, volumes = store.history(self.symbol)
+                started = loop.time()
+                summary = await evaluate(prices, volumes)
+                done = loop.time()
+                service_time[k] = done - started
+                latency[k] = done - due
+                signals[summary['primary_signal']] += 1
+
+        start = loop.time()
+        try:
+            await asyncio.gather(produce(), consume())
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        return ReplayReport(
+            bars=n,
+            elapsed=loop.time() - start,
+            latency=latency,
+            service_time=service_time,
+            queue_depth=depth,
+            producer_lag=lag,
+            signals=signals
+        )
+
+    def run_sync(self) -> ReplayReport:
+        return asyncio.run(self.run())
+
+
+if __name__ == '__main__':
+    # Demo CSV of daily bars: one simulated day every 20 ms
+    harness = ReplayHarness.from_csv('kaggle_data/bitcoin_demo.csv', speedup=86400 / 0.02)
+    print("bitcoin_demo.csv at 50 bars/sec (SignalGenerator)")
+    print(harness.run_sync().summary_string())
+
+    # Synthetic minute feed at 1000 bars/sec, then flooded, through the async service
+    np.random.seed(20)
+    n_bars = 3000
+    prices = 60000 * np.cumprod(1 + np.random.normal(0, 0.002, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e8
+
+    async def service_run(speedup):
+        async with SignalService(batch_window=0.0) as service:
+            harness = ReplayHarness(np.arange(n_bars) * 60.0, prices, volumes, target=service, speedup=speedup)
+            return await harness.run()
+
+    for speedup, label in ((60 / 0.001, '1000 bars/sec'), (None, 'flooded')):
+        print(f"\n{n_bars} synthetic minute bars, {label} (SignalService)")
+        print(asyncio.run(service_run(speedup)).summary_string())
@@ -0,0 +1,161 @@
+"""
+Multi-Timeframe OHLCV Resampler
+Aggregates a base stream (ticks or 1-minute bars) into real higher-timeframe
+bars, updated incrementally as each base update arrives.
+
+Each timeframe then runs its indicators on its own, much shorter series
+instead of relabelling MA periods over the raw price list.
+"""
+
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+# Bar length in seconds for each signal timeframe
+TIMEFRAME_SECONDS = {
+    'scalping': 60,
+    '1h': 3600,
+    '4h': 4 * 3600,
+    'daily': 86400,
+    'weekly': 7 * 86400
+}
+
+# The Unix epoch is a Thursday; shift weekly buckets so weeks start on Monday
+_WEEK_OFFSET = 4 * 86400
+
+Timestamp = Union[float, int, datetime]
+
+
+def _to_seconds(timestamp: Timestamp) -> float:
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+def bucket_start(timestamp: Timestamp, timeframe: str) -> float:
+    """Start time (epoch seconds) of the bar containing `timestamp`."""
+    size = TIMEFRAME_SECONDS[timeframe]
+    offset = _WEEK_OFFSET if timeframe == 'weekly' else 0
+    ts = _to_seconds(timestamp)
+    return ((ts - offset) // size) * size + offset
+
+
+@dataclass
+class OHLCVBar:
+    """One aggregated bar."""
+    start: float  # Epoch seconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class OHLCVResampler:
+    """
+    Keeps every configured timeframe's bars up to date from a base stream.
+
+    Usage:
+        resampler = OHLCVResampler()
+        for ts, price, volume in feed:
+            closed = resampler.update(ts, price, volume)
+        closes = resampler.closes('4h')
+    """
+
+    def __init__(self, timeframes: Optional[List[str]] = None, max_bars: int = 1000):
+        """
+        Args:
+            timeframes: Timeframes to maintain. Default: all in TIMEFRAME_SECONDS
+            max_bars: Closed bars retained per timeframe
+        """
+        if timeframes is None:
+            timeframes = list(TIMEFRAME_SECONDS)
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_SECONDS]
+        if unknown:
+            raise ValueError(f"Unknown timeframes: {unknown}")
+        self.timeframes = timeframes
+        self.max_bars = max_bars
+        self.closed = {tf: deque(maxlen=max_bars) for tf in timeframes}
+        self.current: Dict[str, Optional[OHLCVBar]] = {tf: None for tf in timeframes}
+        self.last_timestamp = None
+
+    def update(self, timestamp: Timestamp, price: float, volume: float = 0.0) -> Dict[str, OHLCVBar]:
+        """
+        Feed one tick (a trade price and its size).
+
+        Returns:
+            Bars that closed because this update started a new bucket
+        """
+        return self.update_bar(timestamp, price, price, price, price, volume)
+
+    def update_bar(
+        self,
+        timestamp: Timestamp,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float
+    ) -> Dict[str, OHLCVBar]:
+        """
+        Feed one base bar (e.g. 1-minute OHLCV) starting at `timestamp`.
+
+        Returns:
+            Bars that closed because this update started a new bucket
+        """
+        ts = _to_seconds(timestamp)
+        if self.last_timestamp is not None and ts < self.last_timestamp:
+            raise ValueError(f"Out-of-order update: {ts} < {self.last_timestamp}")
+        self.last_timestamp = ts
+
+        closed = {}
+        for tf in self.timeframes:
+            start = bucket_start(ts, tf)
+            bar = self.current[tf]
+            if bar is None or start != bar.start:
+                if bar is not None:
+                    self.closed[tf].append(bar)
+                    closed[tf] = bar
+                self.current[tf] = OHLCVBar(start, open, high, low, close, volume)
+            else:
+                bar.high = max(bar.high, high)
+                bar.low = min(bar.low, low)
+                bar.close = close
+                bar.volume += volume
+        return closed
+
+    def bars(self, timeframe: str, include_partial: bool = True) -> List[OHLCVBar]:
+        """Closed bars (oldest first), plus the forming bar if requested."""
+        bars = list(self.closed[timeframe])
+        if include_partial and self.current[timeframe] is not None:
+            bars.append(self.current[timeframe])
+        return bars
+
+    def closes(self, timeframe: str, include_partial: bool = True) -> np.ndarray:
+        """Close prices for a timeframe."""
+        return np.array([b.close for b in self.bars(timeframe, include_partial)], dtype=float)
+
+    def volumes(self, timeframe: str, include_partial: bool = True) -> np.ndarray:
+        """Volumes for a timeframe."""
+        return np.array([b.volume for b in self.bars(timeframe, include_partial)], dtype=float)
+
+    def bar_count(self, timeframe: str, include_partial: bool = True) -> int:
+        """Number of bars available for a timeframe."""
+        partial = include_partial and self.current[timeframe] is not None
+        return len(self.closed[timeframe]) + int(partial)
+
+
+if __name__ == '__main__':
+    # Two weeks of synthetic 1-minute bars
+    np.random.seed(1)
+    start = datetime(2026, 1, 5).timestamp()
+    resampler = OHLCVResampler(max_bars=500)
+    price = 60000.0
+    for minute in range(14 * 24 * 60):
+        price *= 1 + np.random.normal(0, 0.0005)
+        resampler.update(start + minute * 60, price, np.random.uniform(1, 10))
+
+    for tf in resampler.timeframes:
+        print(f"{tf:9} bars: {resampler.bar_count(tf):4}, last close: {resampler.closes(tf)[-1]:.2f}")
@@ -0,0 +1,164 @@
+"""
+Ring Buffer Price Store
+Fixed-capacity, NumPy-backed circular buffers for live price/volume history.
+
+Every value is written twice, at i and i + capacity, so the newest `n`
+values are always one contiguous slice. Readers get read-only views that
+pass straight into the indicator functions without copying or list-to-array
+conversion, and memory stays bounded for long-running processes.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class RingBuffer:
+    """Circular float buffer with contiguous, zero-copy views of its tail."""
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._head = 0  # Next write position in [0, capacity)
+        self._count = 0
+        self.total_appended = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float):
+        """Add one value, overwriting the oldest when full."""
+        self._data[self._head] = value
+        self._data[self._head + self.capacity] = value
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.total_appended += 1
+
+    def extend(self, values):
+        """Add many values at once."""
+        values = np.asarray(values, dtype=self._data.dtype)
+        self.total_appended += len(values)
+        if len(values) >= self.capacity:
+            values = values[-self.capacity:]
+            self._data[:self.capacity] = values
+            self._data[self.capacity:] = values
+            self._head = 0
+            self._count = self.capacity
+            return
+        end = self._head + len(values)
+        if end <= self.capacity:
+            self._data[self._head:end] = values
+            self._data[self._head + self.capacity:end + self.capacity] = values
+        else:
+            split = self.capacity - self._head
+            self._data[self._head:self.capacity] = values[:split]
+            self._data[self._head + self.capacity:] = values[:split]
+            self._data[:end - self.capacity] = values[split:]
+            self._data[self.capacity:end] = values[split:]
+        self._head = end % self.capacity
+        self._count = min(self._count + len(values), self.capacity)
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Read-only view of the newest `n` values (all held values by default),
+        oldest first.
+
+        The view aliases the buffer: it stays valid until further appends
+        overwrite those slots. Copy it if it must outlive the next update.
+        """
+        count = self._count if n is None else min(n, self._count)
+        end = self._head + self.capacity
+        out = self._data[end - count:end]
+        out.flags.writeable = False
+        return out
+
+    def last(self) -> float:
+        """Most recent value."""
+        if self._count == 0:
+            raise IndexError("empty RingBuffer")
+        return self._data[self._head + self.capacity - 1]
+
+
+class PriceHistoryStore:
+    """
+    Per-symbol bounded price/volume history.
+
+    Usage:
+        store = PriceHistoryStore(capacity=5000)
+        store.append('BTC', price, volume)
+        prices, volumes = store.history('BTC')
+        signal = generate_signal(prices, volumes, 'daily')
+    """
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self._buffers: Dict[str, Tuple[RingBuffer, RingBuffer]] = {}
+
+    def _get(self, symbol: str) -> Tuple[RingBuffer, RingBuffer]:
+        buffers = self._buffers.get(symbol)
+        if buffers is None:
+            buffers = (RingBuffer(self.capacity), RingBuffer(self.capacity))
+            self._buffers[symbol] = buffers
+        return buffers
+
+    def append(self, symbol: str, price: float, volume: float):
+        """Record one bar for a symbol."""
+        prices, volumes = self._get(symbol)
+        prices.append(price)
+        volumes.append(volume)
+
+    def extend(self, symbol: str, prices, volumes):
+        """Record many bars for a symbol (e.g. a historical backfill)."""
+        if len(prices) != len(volumes):
+            raise ValueError("prices and volumes must have the same length")
+        price_buf, volume_buf = self._get(symbol)
+        price_buf.extend(prices)
+        volume_buf.extend(volumes)
+
+    def history(self, symbol: str, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only (prices, volumes) views of the newest `n` bars."""
+        if symbol not in self._buffers:
+            raise KeyError(symbol)
+        prices, volumes = self._buffers[symbol]
+        return prices.view(n), volumes.view(n)
+
+    def prices(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of a symbol's newest prices."""
+        return self.history(symbol, n)[0]
+
+    def volumes(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of a symbol's newest volumes."""
+        return self.history(symbol, n)[1]
+
+    def symbols(self) -> List[str]:
+        """Symbols with recorded history."""
+        return list(self._buffers)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._buffers
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by all buffers (fixed once a symbol is created)."""
+        return sum(p._data.nbytes + v._data.nbytes for p, v in self._buffers.values())
+
+
+if __name__ == '__main__':
+    from .signals import generate_signal
+
+    store = PriceHistoryStore(capacity=1000)
+    np.random.seed(5)
+    price = 60000.0
+    n_appended = 25000
+    for _ in range(n_appended):
+        price *= 1 + np.random.normal(0, 0.005)
+        store.append('BTC', price, np.random.uniform(800, 1200))
+
+    prices, volumes = store.history('BTC')
+    print(f"Bars held: {len(prices)} of {n_appended} appended")
+    print(f"Memory: {store.memory_bytes() / 1024:.1f} KiB")
+    print(f"Zero-copy view: {not prices.flags.owndata}, read-only: {not prices.flags.writeable}")
+    print(f"Daily signal: {generate_signal(prices, volumes, 'daily')}")
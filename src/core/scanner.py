@@ -0,0 +1,182 @@
+"""
+Universe Scanner
+Evaluates signals, confidence and SL/TP for a whole (symbols x bars) universe
+in one broadcast pass, then ranks the top-N symbols with a partial sort.
+
+Uses the same rules as `generate_signal`, `get_signal_confidence` and
+`calculate_sl_tp`; each row gives the result those functions return for that
+symbol's latest bar.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from .signals import (
+    get_timeframe_periods, load_weights, calculate_rsi, decide_signal_codes,
+    score_confidence_array, calculate_sl_tp_array, SIGNAL_LABELS, SIGNAL_HOLD
+)
+
+
+def _last_mean(values: np.ndarray, period: int) -> np.ndarray:
+    return values[:, -period:].mean(axis=1)
+
+
+def scan_universe(
+    prices,
+    volumes,
+    timeframe: str = 'daily',
+    weights: Optional[Dict] = None,
+    risk_percent: float = 0.02,
+    rsi: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the latest bar of every symbol.
+
+    Args:
+        prices: (symbols x bars) close prices, oldest bar first
+        volumes: (symbols x bars) volumes aligned with prices
+        timeframe: Trading timeframe
+        rsi: Precomputed per-symbol RSI (it does not depend on the timeframe)
+
+    Returns:
+        Dict of per-symbol arrays: 'signal' (int8 codes), 'confidence',
+        'ma_signal', 'rsi_signal', 'volume_signal', 'entry_price',
+        'stop_loss', 'take_profit' (NaN when open-ended), 'momentum', 'rsi'
+    """
+    if weights is None:
+        weights = load_weights()
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    if prices.ndim != 2 or prices.shape != volumes.shape:
+        raise ValueError("prices and volumes must be matching (symbols x bars) arrays")
+
+    n_symbols, n_bars = prices.shape
+    short_period, long_period = get_timeframe_periods(timeframe)
+    last = prices[:, -1]
+
+    if rsi is None:
+        rsi = calculate_rsi(prices)
+    rsi = np.broadcast_to(np.asarray(rsi, dtype=float), (n_symbols,))
+
+    if n_bars >= long_period:
+        ma_short = _last_mean(prices, short_period)
+        ma_long = _last_mean(prices, long_period)
+    else:
+        ma_short = np.full(n_symbols, np.nan)
+        ma_long = np.full(n_symbols, np.nan)
+
+    # Momentum over min(10, short) bars for the rules, 10 bars for TP sizing
+    m = min(10, short_period)
+    momentum = (last - prices[:, -m]) / prices[:, -m] * 100 if n_bars >= m else np.zeros(n_symbols)
+    base = prices[:, max(0, n_bars - 10)]
+    trend_strength = (last - base) / base * 100 if n_bars > 1 else np.zeros(n_symbols)
+
+    avg_volume = _last_mean(volumes, long_period)
+    current_volume = volumes[:, -1]
+
+    signal = decide_signal_codes(ma_short, ma_long, rsi, momentum, current_volume, avg_volume, weights)
+    if n_bars < long_period:
+        signal[:] = SIGNAL_HOLD
+
+    confidence = score_confidence_array(ma_short, ma_long, rsi, current_volume, avg_volume, weights)
+    if n_bars < 50:
+        confidence = {k: np.zeros(n_symbols) for k in confidence}
+
+    sl, tp = calculate_sl_tp_array(last, timeframe, risk_percent, trend_strength)
+
+    return {
+        'signal': signal,
+        'confidence': confidence['overall'],
+        'ma_signal': confidence['ma_signal'],
+        'rsi_signal': confidence['rsi_signal'],
+        'volume_signal': confidence['volume_signal'],
+        'entry_price': last,
+        'stop_loss': sl,
+        'take_profit': tp,
+        'momentum': trend_strength,
+        'rsi': rsi
+    }
+
+
+def rank_top_n(
+    scan: Dict[str, np.ndarray],
+    top_n: int = 10,
+    symbols: Optional[Sequence[str]] = None,
+    signal: Optional[str] = 'Buy',
+    key: str = 'confidence'
+) -> List[Dict]:
+    """
+    Return the `top_n` symbols with the highest `key`, best first.
+
+    A partial sort finds the top_n-th score, so only the selected rows are
+    fully sorted. The result equals a full stable sort: ties keep row order
+    and NaN scores rank last.
+
+    Args:
+        scan: Output of scan_universe
+        symbols: Symbol names aligned with the scan rows (defaults to row index)
+        signal: Only rank symbols with this signal ('Buy', 'Sell', 'Hold'), or None for all
+    """
+    scores = np.asarray(scan[key], dtype=float)
+    candidates = np.arange(len(scores))
+    if signal is not None:
+        code = {label: c for c, label in SIGNAL_LABELS.items()}[signal]
+        candidates = candidates[scan['signal'] == code]
+    if len(candidates) == 0 or top_n <= 0:
+        return []
+
+    candidate_scores = scores[candidates]
+    candidate_scores = np.where(np.isnan(candidate_scores), -np.inf, candidate_scores)
+    if len(candidates) > top_n:
+        # Everything above the top_n-th score, then the earliest rows tied with it
+        kth = -np.partition(-candidate_scores, top_n - 1)[top_n - 1]
+        above = np.flatnonzero(candidate_scores > kth)
+        tied = np.flatnonzero(candidate_scores == kth)[:top_n - len(above)]
+        part = np.concatenate([above, tied])
+    else:
+        part = np.arange(len(candidates))
+    order = part[np.lexsort((part, -candidate_scores[part]))]
+
+    ranked = []
+    for row in candidates[order]:
+        tp = scan['take_profit'][row]
+        ranked.append({
+            'symbol': symbols[row] if symbols is not None else int(row),
+            'signal': SIGNAL_LABELS[int(scan['signal'][row])],
+            'confidence': float(scan['confidence'][row]),
+            'entry_price': float(scan['entry_price'][row]),
+            'stop_loss': float(scan['stop_loss'][row]),
+            'take_profit': None if np.isnan(tp) else float(tp),
+            'momentum': float(scan['momentum'][row]),
+            key: float(scores[row])
+        })
+    return ranked
+
+
+if __name__ == '__main__':
+    import time
+    from .signals import generate_signal, get_signal_confidence, calculate_sl_tp
+
+    np.random.seed(11)
+    n_symbols, n_bars = 5000, 300
+    prices = 100 * np.cumprod(1 + np.random.normal(0, 0.01, (n_symbols, n_bars)), axis=1)
+    volumes = np.random.uniform(800, 1200, (n_symbols, n_bars))
+    weights = load_weights()
+
+    start = time.perf_counter()
+    scan = scan_universe(prices, volumes, '4h', weights)
+    top = rank_top_n(scan, top_n=5, symbols=[f"SYM{i}" for i in range(n_symbols)])
+    elapsed = time.perf_counter() - start
+    print(f"Scanned {n_symbols} symbols x {n_bars} bars in {elapsed * 1000:.1f} ms")
+    for row in top:
+        print(f"  {row['symbol']:8} {row['signal']:4} confidence {row['confidence']:.1f}")
+
+    # Spot-check against the scalar functions
+    mismatches = 0
+    for i in range(200):
+        p, v = list(prices[i]), list(volumes[i])
+        conf = get_signal_confidence(p, v, '4h', weights)['overall']
+        sl, _ = calculate_sl_tp(p[-1], '4h', trend_strength=scan['momentum'][i])
+        if (SIGNAL_LABELS[int(scan['signal'][i])] != generate_signal(p, v, '4h', weights)
+                or abs(conf - scan['confidence'][i]) > 1e-9 or abs(sl - scan['stop_loss'][i]) > 1e-9):
+            mismatches += 1
+    print(f"Scalar spot-check mismatches: {mismatches}/200")
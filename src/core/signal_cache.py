@@ -0,0 +1,260 @@
+"""
+Signal Result Cache
+LRU + TTL cache for SignalGenerator results.
+
+Entries are keyed by a series fingerprint (length, first and last bar and a
+rolling hash of every bar), the requested timeframes and the weights version.
+Each entry keeps the streaming engines that produced it, so a request whose
+series is a cached one plus a few appended bars is answered by feeding just
+those bars instead of recomputing the whole history.
+
+Only an unknown series is hashed in full. A series that matches a cached
+entry's anchor (context, length, first and last bar), or that is such an
+entry plus up to max_append bars, takes that entry's hash and extends it over
+the appended bars, so repeated polls cost O(appended bars), not O(history).
+The anchor is trusted for the bars it covers: callers mixing unrelated series
+that share length, first and last bar must tell them apart via the context.
+"""
+
+import copy
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(z: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer; uint64 array arithmetic wraps modulo 2**64
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def rolling_hash(prices, volumes, start: int, end: int) -> int:
+    """
+    Order-sensitive hash of bars [start, end).
+    Additive modulo 2**64 over adjacent ranges, so the hash of a series plus
+    appended bars is its hash plus rolling_hash of just those bars.
+    """
+    if end <= start:
+        return 0
+    p = np.ascontiguousarray(prices[start:end], dtype=np.float64).view(np.uint64)
+    v = np.ascontiguousarray(volumes[start:end], dtype=np.float64).view(np.uint64)
+    index = np.arange(start, end, dtype=np.uint64)
+    return int(_mix(_mix(p + index * _GOLDEN) ^ v).sum(dtype=np.uint64))
+
+
+def _fingerprint(prices, volumes, end: int, digest: int) -> Tuple:
+    return (
+        end, float(prices[0]), float(volumes[0]),
+        float(prices[end - 1]), float(volumes[end - 1]), digest
+    )
+
+
+def series_fingerprint(prices, volumes, end: Optional[int] = None) -> Tuple:
+    """
+    (length, first price, first volume, last price, last volume, rolling hash)
+    of prices[:end]/volumes[:end]. Hashing is O(length); SignalCache only does
+    it for series it has no anchor for.
+    """
+    if end is None:
+        end = len(prices)
+    if end == 0:
+        return (0, None, None, None, None, 0)
+    return _fingerprint(prices, volumes, end, rolling_hash(prices, volumes, 0, end))
+
+
+class _Entry:
+    __slots__ = ('key', 'result', 'state', 'created')
+
+    def __init__(self, key, result, state, created):
+        self.key = key
+        self.result = result
+        self.state = state
+        self.created = created
+
+
+class SignalCache:
+    """
+    Usage:
+        cache = SignalCache(max_entries=128, ttl=60)
+        result = cache.get_or_compute(prices, volumes, context, compute, extend)
+
+    `compute(prices, volumes)` returns (result, state) for a full series.
+    `extend(state, new_prices, new_volumes)` advances a cached state by the
+    appended bars and returns (result, state).
+
+    The cache can be shared by executor threads. Only lookups and stores take
+    the lock; compute/extend run outside it on a private copy of any cached
+    state, so threads evaluating different series proceed in parallel, while
+    concurrent requests for the same key wait for the one computation.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = 60.0, max_append: int = 64):
+        """
+        Args:
+            max_entries: LRU capacity
+            ttl: Seconds before an entry expires (None disables expiry)
+            max_append: Largest number of appended bars handled incrementally
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_append = max_append
+        self._entries = OrderedDict()  # key -> _Entry
+        self._anchors = {}  # (context, length, first and last bar) -> key
+        self._in_flight = {}  # key -> threading.Event set once its result is stored
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0, 'misses': 0, 'extensions': 0, 'coalesced': 0, 'evictions': 0, 'expirations': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._anchors.clear()
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    @staticmethod
+    def _anchor(key) -> Tuple:
+        context, fingerprint = key
+        return (context,) + fingerprint[:5]
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None and self._anchors.get(self._anchor(key)) == key:
+            del self._anchors[self._anchor(key)]
+        return entry
+
+    def _store(self, key, result, state, now: float):
+        self._entries[key] = _Entry(key, result, state, now)
+        self._entries.move_to_end(key)
+        self._anchors[self._anchor(key)] = key
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats['evictions'] += 1
+
+    def _resolve(self, prices, volumes, context, now: float) -> Tuple[Optional[Tuple], Optional[_Entry]]:
+        """
+        Key the request from a live anchored entry without rehashing its bars.
+
+        Returns (entry key, None) when the series is a cached one,
+        (key, entry) when it is a cached entry's series plus
+        1 <= k <= max_append bars, and (None, None) when no anchor matches.
+        """
+        n = len(prices)
+        if n == 0:
+            return None, None
+        first = (float(prices[0]), float(volumes[0]))
+        for k in range(0, min(self.max_append, n - 1) + 1):
+            end = n - k
+            key = self._anchors.get((context, end) + first + (float(prices[end - 1]), float(volumes[end - 1])))
+            if key is None:
+                continue
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, now):
+                continue
+            if k == 0:
+                return key, None
+            digest = (key[1][5] + rolling_hash(prices, volumes, end, n)) & 0xFFFFFFFFFFFFFFFF
+            return (context, _fingerprint(prices, volumes, n, digest)), entry
+        return None, None
+
+    def get_or_compute(
+        self,
+        prices,
+        volumes,
+        context: Tuple,
+        compute: Callable,
+        extend: Optional[Callable] = None,
+        clone: Callable = copy.deepcopy
+    ):
+        """
+        Return the cached result for (series, context), extending or computing it if needed.
+
+        Args:
+            context: Hashable extras that must match, e.g. (timeframes, weights version)
+            clone: Copies a cached state before `extend` advances it
+        """
+        with self._lock:
+            key, prefix = self._resolve(prices, volumes, context, time.monotonic())
+        if key is None:
+            # Unknown series: hash it in full, outside the lock
+            key = (context, series_fingerprint(prices, volumes))
+        if extend is None:
+            prefix = None
+
+        while True:
+            with self._lock:
+                found, result = self._lookup(key)
+                if found:
+                    return result
+                pending = self._in_flight.get(key)
+                if pending is None:
+                    self._in_flight[key] = threading.Event()
+                    self.stats['misses'] += 1
+                    if prefix is not None and self._entries.get(prefix.key) is prefix:
+                        # The entry stays cached for other callers; extend a copy
+                        start, state = prefix.key[1][0], clone(prefix.state)
+                    else:
+                        prefix = None
+                    break
+                self.stats['coalesced'] += 1
+            # Another thread is computing this key; take its result once stored
+            # (or compute it ourselves if that thread failed)
+            pending.wait()
+
+        try:
+            if prefix is not None:
+                result, state = extend(state, prices[start:], volumes[start:])
+            else:
+                result, state = compute(prices, volumes)
+        except BaseException:
+            with self._lock:
+                self._in_flight.pop(key).set()
+            raise
+
+        with self._lock:
+            if prefix is not None:
+                self.stats['extensions'] += 1
+            self._store(key, result, state, time.monotonic())
+            self._in_flight.pop(key).set()
+        return result
+
+    def _lookup(self, key) -> Tuple[bool, object]:
+        """(True, result) on a live hit; drops an expired entry. Call under the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if self._expired(entry, time.monotonic()):
+            self._remove(key)
+            self.stats['expirations'] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return True, entry.result
+
+    def get_stats(self) -> Dict:
+        """
+        Counters plus current size and hit rate ('extensions' is a subset of
+        'misses'; 'coalesced' counts waits on another thread's computation,
+        which then also count as hits).
+        """
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
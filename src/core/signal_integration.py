@@ -8,17 +8,63 @@ import numpy as np
 import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from .signals import generate_signal, calculate_sl_tp, get_signal_confidence, load_weights
+from .signals import (
+    load_weights, compute_snapshot, IndicatorSnapshot, calculate_rsi, SIGNAL_LABELS, RESAMPLED_PERIODS,
+    signal_from_snapshot, confidence_from_snapshot, calculate_sl_tp_from_snapshot
+)
+from .resampler import OHLCVResampler
+from .scanner import scan_universe
+from .signal_cache import SignalCache
+from .streaming_signals import StreamingSignalEngine, WilderRSI
+from .weights_registry import get_weights_version
 
 class SignalGenerator:
     """Main class for signal generation with caching and batch processing."""
     
-    def __init__(self, weights_path: str = 'data/trained_skill_weights.json'):
-        """Initialize with weights."""
-        self.weights = load_weights(weights_path)
-        self.signal_cache = {}
+    def __init__(
+        self,
+        weights_path: str = 'data/trained_skill_weights.json',
+        cache_size: int = 128,
+        cache_ttl: Optional[float] = 60.0
+    ):
+        """
+        Initialize with weights.
+        
+        Args:
+            cache_size: Max cached multi-timeframe results (0 disables caching)
+            cache_ttl: Seconds a cached result stays valid (None: until evicted)
+        """
+        self.weights_path = weights_path
+        self._weights_override = None
+        self._override_version = 0
+        self.signal_cache = SignalCache(max_entries=cache_size, ttl=cache_ttl) if cache_size > 0 else None
         self.last_update = None
     
+    @property
+    def weights(self) -> Dict:
+        """Current trained weights, served from the process-wide registry."""
+        if self._weights_override is not None:
+            return self._weights_override
+        return load_weights(self.weights_path)
+    
+    @weights.setter
+    def weights(self, value: Dict):
+        # Keep a copy: cached results are keyed by the version bumped here, so
+        # later changes to the caller's dict must go through this setter
+        self._weights_override = dict(value) if value is not None else None
+        self._override_version += 1
+    
+    def _weights_version(self):
+        if self._weights_override is not None:
+            return ('override', self._override_version)
+        return get_weights_version(self.weights_path)
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss/extension/eviction counters of the result cache."""
+        if self.signal_cache is None:
+            return {}
+        return self.signal_cache.get_stats()
+    
     def generate_multi_timeframe_signals(
         self, 
         prices: List[float], 
@@ -49,35 +95,112 @@ class SignalGenerator:
         if timeframes is None:
             timeframes = ['scalping', '1h', '4h', 'daily', 'weekly']
         
+        timeframes = tuple(timeframes)
+        weights = self.weights
+        
+        def compute(prices, volumes):
+            # RSI is timeframe independent, so load its state once for all frames
+            rsi = WilderRSI()
+            rsi.load(prices)
+            engines = {
+                tf: StreamingSignalEngine.from_history(prices, volumes, tf, weights, rsi=rsi)
+                for tf in timeframes
+            }
+            return self._results_from_engines(engines, weights), engines
+        
+        def extend(engines, new_prices, new_volumes):
+            for price, volume in zip(new_prices, new_volumes):
+                for engine in engines.values():
+                    engine.update(price, volume)
+            return self._results_from_engines(engines, weights), engines
+        
+        if self.signal_cache is None:
+            results, _ = compute(prices, volumes)
+        else:
+            context = (timeframes, self._weights_version())
+            results = self.signal_cache.get_or_compute(
+                prices, volumes, context, compute, extend,
+                clone=lambda engines: {tf: engine.copy() for tf, engine in engines.items()}
+            )
+        
+        self.last_update = datetime.now()
+        # Rebuild the nested dicts so callers cannot mutate cached entries, and
+        # stamp every return (a cached result keeps its compute-time timestamp)
+        timestamp = self.last_update.isoformat()
+        return {
+            tf: {**data, 'confidence_details': dict(data['confidence_details']), 'timestamp': timestamp}
+            for tf, data in results.items()
+        }
+    
+    def _results_from_engines(self, engines: Dict[str, StreamingSignalEngine], weights: Dict) -> Dict[str, Dict]:
+        return {tf: self._result_from_snapshot(engine.snapshot(), weights) for tf, engine in engines.items()}
+    
+    def generate_resampled_signals(
+        self,
+        resampler: OHLCVResampler,
+        timeframes: Optional[List[str]] = None,
+        periods: Tuple[int, int] = RESAMPLED_PERIODS
+    ) -> Dict[str, Dict]:
+        """
+        Generate signals where each timeframe runs on its own aggregated bars.
+        
+        The per-timeframe MA periods of generate_multi_timeframe_signals stand
+        in for bar length on a single raw series; here every frame's bars
+        already have their own length, so all frames share one (short, long)
+        pair counted in that frame's bars, and confidence is scored once
+        `long` bars exist. SL/TP sizing stays per timeframe.
+        
+        Args:
+            resampler: OHLCVResampler fed from the base (tick / 1-minute) stream
+            timeframes: Timeframes to analyze. Default: all the resampler keeps
+            periods: (short, long) MA periods in bars, used for every timeframe
+        
+        Returns:
+            Same structure as generate_multi_timeframe_signals, plus 'bars'
+            (number of bars the timeframe's indicators ran on)
+        """
+        if timeframes is None:
+            timeframes = resampler.timeframes
+        
         results = {}
+        weights = self.weights
         
         for tf in timeframes:
-            signal = generate_signal(prices, volumes, tf, self.weights)
-            confidence = get_signal_confidence(prices, volumes, tf, self.weights)
-            
-            # Calculate momentum for trend strength
-            momentum = ((prices[-1] - prices[max(0, len(prices)-10)]) / prices[max(0, len(prices)-10)]) * 100 if len(prices) > 1 else 0
-            
-            sl, tp = calculate_sl_tp(prices[-1], tf, trend_strength=momentum)
-            
-            results[tf] = {
-                'signal': signal,
-                'confidence': confidence['overall'],
-                'confidence_details': {
-                    'ma': confidence['ma_signal'],
-                    'rsi': confidence['rsi_signal'],
-                    'volume': confidence['volume_signal']
-                },
-                'entry_price': float(prices[-1]),
-                'stop_loss': float(sl),
-                'take_profit': float(tp) if tp else None,
-                'momentum': float(momentum),
-                'timestamp': datetime.now().isoformat()
-            }
+            prices = resampler.closes(tf)
+            if len(prices) == 0:
+                continue
+            volumes = resampler.volumes(tf)
+            snapshot = compute_snapshot(prices, volumes, tf, periods=periods)
+            results[tf] = self._result_from_snapshot(snapshot, weights)
+            results[tf]['bars'] = len(prices)
         
         self.last_update = datetime.now()
         return results
     
+    def _result_from_snapshot(self, snapshot: IndicatorSnapshot, weights: Dict) -> Dict:
+        signal = signal_from_snapshot(snapshot, weights)
+        confidence = confidence_from_snapshot(snapshot, weights)
+        
+        # Momentum for trend strength
+        momentum = snapshot.trend_strength
+        
+        sl, tp = calculate_sl_tp_from_snapshot(snapshot)
+        
+        return {
+            'signal': signal,
+            'confidence': confidence['overall'],
+            'confidence_details': {
+                'ma': confidence['ma_signal'],
+                'rsi': confidence['rsi_signal'],
+                'volume': confidence['volume_signal']
+            },
+            'entry_price': float(snapshot.last_price),
+            'stop_loss': float(sl),
+            'take_profit': float(tp) if tp else None,
+            'momentum': float(momentum),
+            'timestamp': datetime.now().isoformat()
+        }
+    
     def generate_signal_summary(
         self,
         prices: List[float],
@@ -95,7 +218,59 @@ class SignalGenerator:
             - all_signals: Detailed signals per timeframe
         """
         signals = self.generate_multi_timeframe_signals(prices, volumes)
+        return self._summarize(signals)
+    
+    def generate_batch_summaries(
+        self,
+        prices,
+        volumes,
+        timeframes: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Signal summaries for many equal-length series in one vectorized pass.
+        
+        Args:
+            prices: (symbols x bars) close prices, oldest bar first
+            volumes: (symbols x bars) volumes aligned with prices
+            timeframes: List of timeframes to analyze. Default: all
+        
+        Returns:
+            One generate_signal_summary-style dict per row
+        """
+        if timeframes is None:
+            timeframes = ['scalping', '1h', '4h', 'daily', 'weekly']
+        
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        weights = self.weights
+        # RSI is timeframe independent, so compute it once for all frames
+        rsi = calculate_rsi(prices)
+        scans = {tf: scan_universe(prices, volumes, tf, weights, rsi=rsi) for tf in timeframes}
         
+        self.last_update = datetime.now()
+        return [
+            self._summarize({tf: self._result_from_scan(scan, row) for tf, scan in scans.items()})
+            for row in range(prices.shape[0])
+        ]
+    
+    def _result_from_scan(self, scan: Dict[str, np.ndarray], row: int) -> Dict:
+        tp = scan['take_profit'][row]
+        return {
+            'signal': SIGNAL_LABELS[int(scan['signal'][row])],
+            'confidence': float(scan['confidence'][row]),
+            'confidence_details': {
+                'ma': float(scan['ma_signal'][row]),
+                'rsi': float(scan['rsi_signal'][row]),
+                'volume': float(scan['volume_signal'][row])
+            },
+            'entry_price': float(scan['entry_price'][row]),
+            'stop_loss': float(scan['stop_loss'][row]),
+            'take_profit': float(tp) if tp and not np.isnan(tp) else None,
+            'momentum': float(scan['momentum'][row]),
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _summarize(self, signals: Dict[str, Dict]) -> Dict:
         # Determine primary signal (highest confidence)
         primary = max(signals.items(), key=lambda x: x[1]['confidence'])
         
@@ -106,7 +281,6 @@ class SignalGenerator:
             signal_counts[sig] = signal_counts.get(sig, 0) + 1
         
         total_signals = len(signals)
-        primary_signal = primary[0]
         agreement = (signal_counts.get(primary[1]['signal'], 0) / total_signals * 100)
         
         return {
@@ -143,24 +317,15 @@ class SignalGenerator:
         returns = np.diff(prices[-20:]) / prices[-20:-1]
         volatility = np.std(returns) * 100
         
-        # Get signal confidence
-        confidence = get_signal_confidence(prices, volumes, timeframe, self.weights)
+        # Indicators shared by confidence, coherence and the signal itself
+        weights = self.weights
+        snapshot = compute_snapshot(prices, volumes, timeframe)
+        confidence = confidence_from_snapshot(snapshot, weights)
         
         # Trend coherence: measure agreement between MA and RSI signals
-        from .signals import calculate_ma, calculate_rsi
-        
-        periods = {
-            'scalping': (3, 10),
-            '1h': (5, 20),
-            '4h': (7, 30),
-            'daily': (10, 50),
-            'weekly': (20, 100)
-        }
-        short_period, long_period = periods.get(timeframe, (7, 30))
-        
-        ma_short = calculate_ma(prices, short_period)
-        ma_long = calculate_ma(prices, long_period)
-        rsi = calculate_rsi(prices)
+        ma_short = snapshot.ma_short
+        ma_long = snapshot.ma_long
+        rsi = snapshot.rsi
         
         # Coherence: 100 if all agree, lower otherwise
         ma_bullish = 1 if ma_short and ma_long and ma_short > ma_long else 0
@@ -170,7 +335,7 @@ class SignalGenerator:
         coherence = (ma_bullish + rsi_bullish + vol_bullish) / 3 * 100
         
         # Recommendation
-        signal = generate_signal(prices, volumes, timeframe, self.weights)
+        signal = signal_from_snapshot(snapshot, weights)
         is_valid = confidence['overall'] > 30
         
         recommendation = 'HOLD'
@@ -197,17 +362,25 @@ class SignalGenerator:
 class BacktestResult:
     """Helper class for backtest result formatting."""
     
-    def __init__(self, metrics: Dict):
-        """Initialize with backtest metrics."""
+    def __init__(self, metrics: Dict, trade_log=None):
+        """
+        Initialize with backtest metrics.
+        
+        Args:
+            trade_log: Optional trade_log.TradeLog holding the run's trades
+        """
         self.metrics = metrics
+        self.trade_log = trade_log
     
     def to_json(self) -> str:
         """Serialize to JSON."""
-        return json.dumps(self.metrics, default=str)
+        return json.dumps(self.to_dict(), default=str)
     
     def to_dict(self) -> Dict:
-        """Return as dictionary."""
-        return self.metrics
+        """Return as dictionary (with the trade log's path, if any)."""
+        if self.trade_log is None:
+            return self.metrics
+        return {**self.metrics, 'trade_log': self.trade_log.path}
     
     def summary_string(self) -> str:
         """Return human-readable summary."""
@@ -223,11 +396,22 @@ Total Trades: {m.get('count', 0)}
 Profit Factor: {m.get('profit_factor', 0):.2f}
 Recovery Factor: {m.get('recovery', 0):.2f}
 Calmar Ratio: {m.get('calmar', 0):.2f}
-"""
+""" + (f"Trade Log: {self.trade_log.path} ({len(self.trade_log)} trades)\n" if self.trade_log is not None else "")
 
 
 # Convenience functions for API integration
 
+_default_generator = None
+
+
+def get_default_generator() -> SignalGenerator:
+    """Process-wide SignalGenerator shared by the convenience functions."""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = SignalGenerator()
+    return _default_generator
+
+
 def get_current_signals(
     prices: List[float],
     volumes: List[float]
@@ -241,7 +425,7 @@ def get_current_signals(
         signals = get_current_signals(price_data, volume_data)
         return Response(json.dumps(signals))
     """
-    generator = SignalGenerator()
+    generator = get_default_generator()
     return generator.generate_signal_summary(prices, volumes)
 
 
@@ -253,7 +437,7 @@ def get_signal_quality_report(
     """
     Get detailed quality analysis for a specific timeframe.
     """
-    generator = SignalGenerator()
+    generator = get_default_generator()
     return generator.analyze_signal_quality(prices, volumes, timeframe)
 
 
@@ -0,0 +1,202 @@
+"""
+Async Signal Service
+asyncio front end for SignalGenerator, for API routes that poll in bursts.
+
+- Coalescing: concurrent requests for the same symbol and the same series
+  share one in-flight computation.
+- Micro-batching: requests for different symbols that arrive within
+  `batch_window` seconds are evaluated together; equal-length series are
+  stacked and scanned in one vectorized pass per timeframe.
+- All numeric work runs in an executor, so the event loop only does
+  bookkeeping.
+"""
+
+import asyncio
+import copy
+import numpy as np
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .signal_cache import series_fingerprint
+from .signal_integration import SignalGenerator
+
+
+class _Request:
+    __slots__ = ('key', 'prices', 'volumes', 'future')
+
+    def __init__(self, key, prices, volumes, future):
+        self.key = key
+        self.prices = prices
+        self.volumes = volumes
+        self.future = future
+
+
+class SignalService:
+    """
+    Usage:
+        service = SignalService()
+        summary = await service.get_signals('BTC', prices, volumes)
+        ...
+        await service.close()
+
+    Each result has the structure of SignalGenerator.generate_signal_summary.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[SignalGenerator] = None,
+        batch_window: float = 0.005,
+        max_batch: int = 256,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            generator: SignalGenerator to evaluate with (default: a new one)
+            batch_window: Seconds to wait for more requests before evaluating
+            max_batch: Pending requests that trigger evaluation immediately
+            executor: Where evaluation runs. Default: one worker thread, so
+                batches are evaluated in arrival order
+        """
+        self.generator = generator if generator is not None else SignalGenerator()
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._pending: List[_Request] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.stats = {'requests': 0, 'coalesced': 0, 'batches': 0, 'vectorized': 0, 'evaluated': 0}
+
+    async def get_signals(self, symbol: str, prices, volumes) -> Dict:
+        """
+        Multi-timeframe signal summary for one symbol.
+
+        Args:
+            symbol: Symbol name (only used to coalesce identical requests)
+            prices: Close prices, oldest first
+            volumes: Volumes aligned with prices
+        """
+        self.stats['requests'] += 1
+        key = (symbol, series_fingerprint(prices, volumes))
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[key] = future
+            # Snapshot the inputs: they may be ring-buffer views that change
+            # before the batch runs
+            request = _Request(key, np.array(prices, dtype=float), np.array(volumes, dtype=float), future)
+            self._enqueue(request, loop)
+
+        # Shield so one cancelled caller does not cancel the shared computation
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result)
+
+    def _enqueue(self, request: _Request, loop: asyncio.AbstractEventLoop):
+        self._pending.append(request)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[_Request]):
+        self.stats['batches'] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self._evaluate, batch)
+        except Exception as exc:
+            for request in batch:
+                self._inflight.pop(request.key, None)
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        for request, result in zip(batch, results):
+            self._inflight.pop(request.key, None)
+            if not request.future.done():
+                request.future.set_result(result)
+
+    def _evaluate(self, batch: List[_Request]) -> List[Dict]:
+        """Runs in the executor: one vectorized pass per group of equal-length series."""
+        groups: Dict[int, List[int]] = {}
+        for i, request in enumerate(batch):
+            groups.setdefault(len(request.prices), []).append(i)
+
+        results: List[Optional[Dict]] = [None] * len(batch)
+        for length, members in groups.items():
+            if len(members) == 1 or length == 0:
+                # Lone series go through the generator so its result cache applies
+                for i in members:
+                    results[i] = self.generator.generate_signal_summary(batch[i].prices, batch[i].volumes)
+                continue
+            prices = np.stack([batch[i].prices for i in members])
+            volumes = np.stack([batch[i].volumes for i in members])
+            for i, summary in zip(members, self.generator.generate_batch_summaries(prices, volumes)):
+                results[i] = summary
+            self.stats['vectorized'] += len(members)
+        self.stats['evaluated'] += len(batch)
+        return results
+
+    async def close(self):
+        """Evaluate anything pending, wait for running batches and release the executor."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+if __name__ == '__main__':
+    import time
+
+    np.random.seed(3)
+    n_symbols, n_bars = 200, 500
+    prices = 100 * np.cumprod(1 + np.random.normal(0, 0.01, (n_symbols, n_bars)), axis=1)
+    volumes = np.random.uniform(800, 1200, (n_symbols, n_bars))
+    symbols = [f"SYM{i}" for i in range(n_symbols)]
+
+    async def burst():
+        async with SignalService() as service:
+            # Every symbol polled by five dashboards at once
+            requests = [
+                service.get_signals(symbols[i], prices[i], volumes[i])
+                for i in range(n_symbols) for _ in range(5)
+            ]
+            start = time.perf_counter()
+            results = await asyncio.gather(*requests)
+            elapsed = time.perf_counter() - start
+            return service, results, elapsed
+
+    service, results, elapsed = asyncio.run(burst())
+    print(f"{len(results)} requests answered in {elapsed * 1000:.1f} ms")
+    print(f"Stats: {service.stats}")
+
+    # Compare against the per-request path
+    generator = SignalGenerator(cache_size=0)
+    mismatches = 0
+    for i in range(0, n_symbols, 10):
+        expected = generator.generate_signal_summary(prices[i], volumes[i])
+        got = results[i * 5]
+        if (got['primary_signal'] != expected['primary_signal']
+                or abs(got['confidence'] - expected['confidence']) > 1e-6):
+            mismatches += 1
+    print(f"Mismatches against generate_signal_summary: {mismatches}/{n_symbols // 10}")
@@ -1,14 +1,76 @@
 import numpy as np
-import json
-import os
+from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional
+from .weights_registry import get_weights
+
+# Timeframe-specific (short, long) periods for MA crossover
+TIMEFRAME_PERIODS = {
+    'scalping': (3, 10),
+    '1h': (5, 20),
+    '4h': (7, 30),
+    'daily': (10, 50),
+    'weekly': (20, 100)
+}
+DEFAULT_PERIODS = (7, 30)
+
+# (short, long) periods, in bars, for series already resampled to their own
+# timeframe: a weekly bar is then one week, so the relabelling table above
+# would demand 100 weeks of history before the long MA exists
+RESAMPLED_PERIODS = (7, 30)
+
+# Bars of history the confidence scores need on the raw (relabelled) path
+CONFIDENCE_MIN_HISTORY = 50
+
+# Timeframe-specific SL distance multipliers; these timeframes have no TP
+SL_TP_FACTORS = {
+    'scalping': 1.0,
+    '1h': 1.5,
+    '4h': 2.0,
+    'daily': 3.0,
+    'weekly': 5.0
+}
+OPEN_ENDED_TIMEFRAMES = ('daily', 'weekly')
+
+def get_timeframe_periods(timeframe: str) -> Tuple[int, int]:
+    """Return the (short, long) MA periods for a timeframe."""
+    return TIMEFRAME_PERIODS.get(timeframe, DEFAULT_PERIODS)
+
+@dataclass(frozen=True)
+class SignalParams:
+    """
+    Tunable thresholds for the signal rules, SL/TP sizing and backtest gates.
+    The defaults reproduce the built-in behavior; periods and SL factor left
+    as None fall back to the timeframe tables above.
+    """
+    short_period: Optional[int] = None
+    long_period: Optional[int] = None
+    rsi_buy_max: float = 70       # Volume-confirmed buys need RSI below this
+    rsi_oversold: float = 50      # Oversold level for the weaker buy rules
+    rsi_sell: float = 60          # Bearish crossovers sell above this RSI
+    rsi_extreme_high: float = 80  # Overbought sell without a crossover
+    rsi_extreme_low: float = 20   # Oversold buy without a crossover
+    risk_percent: float = 0.02
+    sl_factor: Optional[float] = None
+    entry_confidence: float = 40  # Backtest: minimum confidence to enter
+    exit_confidence: float = 30   # Backtest: minimum confidence for a sell exit
+
+    def periods(self, timeframe: str) -> Tuple[int, int]:
+        """(short, long) MA periods for a timeframe."""
+        short_period, long_period = get_timeframe_periods(timeframe)
+        return (
+            self.short_period if self.short_period is not None else short_period,
+            self.long_period if self.long_period is not None else long_period
+        )
+
+    def sl_tp_factor(self, timeframe: str) -> float:
+        """SL distance multiplier for a timeframe."""
+        return self.sl_factor if self.sl_factor is not None else SL_TP_FACTORS.get(timeframe, 1.0)
+
+DEFAULT_PARAMS = SignalParams()
 
 def load_weights(path='data/trained_skill_weights.json'):
-    """Load trained skill weights from JSON."""
-    if os.path.exists(path):
-        with open(path, 'r') as f:
-            return json.load(f).get('weights', {})
-    return {}
+    """Load trained skill weights from JSON (cached until the file changes)."""
+    return get_weights(path)
 
 def calculate_ma(prices: List[float], period: int) -> Optional[float]:
     """Compute moving average."""
@@ -26,32 +88,121 @@ def calculate_ema(prices: List[float], period: int) -> Optional[float]:
         ema = price * multiplier + ema * (1 - multiplier)
     return ema
 
-def calculate_rsi(prices: List[float], period: int = 14) -> float:
-    """Compute Relative Strength Index."""
-    if len(prices) < period + 1:
-        return 50.0  # Neutral
-    deltas = np.diff(prices)
-    seed = deltas[:period+1]
-    up = seed[seed >= 0].sum() / period
-    down = -seed[seed < 0].sum() / period
-    rs = up / down if down != 0 else 100
-    rsi = np.zeros_like(prices)
-    rsi[:period] = 100. - 100. / (1. + rs)
-
-    for i in range(period, len(prices)):
-        delta = deltas[i - 1]
-        if delta > 0:
-            upval = delta
-            downval = 0.
-        else:
-            upval = 0.
-            downval = -delta
-
-        up = (up * (period - 1) + upval) / period
-        down = (down * (period - 1) + downval) / period
-        rs = up / down if down != 0 else 100
-        rsi[i] = 100. - 100. / (1. + rs)
-    return rsi[-1]
+def _wilder_seed(seed: np.ndarray, period: int):
+    """Initial average gain/loss from the seed deltas."""
+    up = np.where(seed >= 0, seed, 0.).sum(axis=-1) / period
+    down = -np.where(seed < 0, seed, 0.).sum(axis=-1) / period
+    return up, down
+
+def _wilder_step(up, down, delta, period: int):
+    """One step of Wilder smoothing."""
+    upval = np.where(delta > 0, delta, 0.)
+    downval = np.where(delta > 0, 0., -delta)
+    up = (up * (period - 1) + upval) / period
+    down = (down * (period - 1) + downval) / period
+    return up, down
+
+def _split_deltas(deltas: np.ndarray):
+    gains = np.where(deltas > 0, deltas, 0.)
+    losses = np.where(deltas > 0, 0., -deltas)
+    return gains, losses
+
+def _wilder_filter(values: np.ndarray, initial, period: int) -> np.ndarray:
+    """
+    Every state of x_t = a*x_{t-1} + u_t/period, a = (period-1)/period, along
+    the last axis without a per-bar Python loop.
+    
+    Within a block x_j = a^(j+1) * (x_0 + sum_{i<=j} u_i a^-(i+1) / period), which is
+    a cumsum. Blocks are sized so a^-k stays below 1e12 to keep precision.
+    """
+    values = np.asarray(values, dtype=float)
+    if period == 1:
+        return values.copy()
+    a = (period - 1) / period
+    block = max(1, int(np.log(1e12) / -np.log(a)))
+    out = np.empty(values.shape)
+    state = np.asarray(initial, dtype=float)
+    for start in range(0, values.shape[-1], block):
+        chunk = values[..., start:start + block]
+        powers = a ** np.arange(1, chunk.shape[-1] + 1)
+        scaled = np.cumsum(chunk / (powers * period), axis=-1)
+        out[..., start:start + block] = powers * (state[..., np.newaxis] + scaled)
+        state = out[..., start + chunk.shape[-1] - 1]
+    return out
+
+def _wilder_last(values: np.ndarray, initial, period: int):
+    """Final state of `_wilder_filter` as a single dot product."""
+    values = np.asarray(values, dtype=float)
+    m = values.shape[-1]
+    a = (period - 1) / period
+    decay = a ** np.arange(m - 1, -1, -1)  # Underflows harmlessly to 0 for old bars
+    return a ** m * np.asarray(initial, dtype=float) + (values * decay).sum(axis=-1) / period
+
+def _rsi_from_averages(up, down):
+    up = np.asarray(up, dtype=float)
+    down = np.asarray(down, dtype=float)
+    safe_down = np.where(down != 0, down, 1.)
+    rs = np.where(down != 0, up / safe_down, 100.)
+    return 100. - 100. / (1. + rs)
+
+def calculate_rsi(prices: List[float], period: int = 14, warmup: Optional[int] = None) -> float:
+    """
+    Compute Relative Strength Index.
+    A 2-D (symbols x bars) array returns one RSI per row.
+    
+    Args:
+        warmup: Tail mode. Only the last `period + 1 + warmup` prices are used,
+                so the cost is O(warmup) instead of O(history). Wilder smoothing
+                forgets the seed at rate ((period-1)/period)^warmup; see
+                `rsi_warmup_report` for the resulting error.
+    """
+    if warmup is not None:
+        tail = period + 1 + warmup
+        prices = prices[..., -tail:] if isinstance(prices, np.ndarray) else prices[-tail:]
+    prices = np.asarray(prices, dtype=float)
+    if prices.shape[-1] < period + 1:
+        return 50.0 if prices.ndim == 1 else np.full(prices.shape[:-1], 50.0)  # Neutral
+    deltas = np.diff(prices, axis=-1)
+    up, down = _wilder_seed(deltas[..., :period + 1], period)
+
+    # Smoothing replays from delta `period - 1`, which the seed already includes
+    gains, losses = _split_deltas(deltas[..., period - 1:])
+    up = _wilder_last(gains, up, period)
+    down = _wilder_last(losses, down, period)
+    rsi = _rsi_from_averages(up, down)
+    return float(rsi) if rsi.ndim == 0 else rsi
+
+def rsi_warmup_report(
+    prices: List[float],
+    period: int = 14,
+    warmups: Tuple[int, ...] = (10, 25, 50, 100, 200, 400),
+    samples: int = 200
+) -> Dict[int, Dict[str, float]]:
+    """
+    Accuracy of tail-mode RSI versus full-history RSI.
+    
+    Evaluates `calculate_rsi(..., warmup=w)` at up to `samples` evenly spaced
+    bars and compares it to `calculate_rsi_series`.
+    
+    Returns:
+        {warmup: {'max_abs_error', 'mean_abs_error', 'decay_bound', 'bars_evaluated'}}
+    """
+    prices = np.asarray(prices, dtype=float)
+    full = calculate_rsi_series(prices, period)
+    report = {}
+    for warmup in warmups:
+        first = period + 1 + warmup  # Shorter prefixes are computed exactly anyway
+        if first >= len(prices):
+            continue
+        idx = np.unique(np.linspace(first, len(prices) - 1, min(samples, len(prices) - first)).astype(int))
+        errors = np.array([abs(calculate_rsi(prices[:i + 1], period, warmup) - full[i]) for i in idx])
+        report[warmup] = {
+            'max_abs_error': float(errors.max()),
+            'mean_abs_error': float(errors.mean()),
+            'decay_bound': float(((period - 1) / period) ** warmup),
+            'bars_evaluated': int(len(idx))
+        }
+    return report
 
 def calculate_momentum(prices: List[float], period: int = 10) -> float:
     """Calculate momentum (price change over period)."""
@@ -59,44 +210,128 @@ def calculate_momentum(prices: List[float], period: int = 10) -> float:
         return 0.0
     return ((prices[-1] - prices[-period]) / prices[-period]) * 100
 
-def generate_signal(prices: List[float], volumes: List[float], timeframe: str, weights: Optional[Dict] = None) -> str:
+@dataclass
+class IndicatorSnapshot:
+    """Indicator values for one (series, timeframe), computed once and shared."""
+    timeframe: str
+    short_period: int
+    long_period: int
+    n_prices: int
+    n_volumes: int
+    last_price: Optional[float]
+    ma_short: Optional[float]
+    ma_long: Optional[float]
+    rsi: float
+    momentum: float  # Over min(10, short_period) bars, used by the signal rules
+    trend_strength: float  # 10-bar momentum, used for TP sizing
+    avg_volume: float
+    current_volume: float
+    min_history: int = CONFIDENCE_MIN_HISTORY  # Bars needed before confidence is scored
+
+def compute_snapshot(
+    prices: List[float],
+    volumes: List[float],
+    timeframe: str,
+    rsi: Optional[float] = None,
+    periods: Optional[Tuple[int, int]] = None
+) -> IndicatorSnapshot:
+    """
+    Compute every indicator the signal, confidence and SL/TP functions need.
+    
+    Args:
+        rsi: Precomputed RSI; it does not depend on the timeframe, so callers
+             evaluating several timeframes can compute it once and pass it in
+        periods: (short, long) bar counts overriding the timeframe table, for
+             series resampled to the timeframe; confidence then needs only
+             `long` bars of history
+    """
+    if periods is None:
+        short_period, long_period = get_timeframe_periods(timeframe)
+        min_history = CONFIDENCE_MIN_HISTORY
+    else:
+        short_period, long_period = periods
+        min_history = long_period
+    n = len(prices)
+    if rsi is None:
+        rsi = calculate_rsi(prices)
+
+    # Momentum over the last 10 bars (or the whole history if shorter)
+    if n > 1:
+        base = prices[max(0, n - 10)]
+        trend_strength = ((prices[-1] - base) / base) * 100
+    else:
+        trend_strength = 0
+
+    return IndicatorSnapshot(
+        timeframe=timeframe,
+        short_period=short_period,
+        long_period=long_period,
+        n_prices=n,
+        n_volumes=len(volumes),
+        last_price=prices[-1] if n else None,
+        ma_short=calculate_ma(prices, short_period),
+        ma_long=calculate_ma(prices, long_period),
+        rsi=rsi,
+        momentum=calculate_momentum(prices, min(10, short_period)),
+        trend_strength=trend_strength,
+        avg_volume=np.mean(volumes[-long_period:]) if len(volumes) else 0.0,
+        current_volume=volumes[-1] if len(volumes) else 0.0,
+        min_history=min_history
+    )
+
+def generate_signal(
+    prices: List[float],
+    volumes: List[float],
+    timeframe: str,
+    weights: Optional[Dict] = None,
+    snapshot: Optional[IndicatorSnapshot] = None
+) -> str:
     """
     Enhanced signal calculation using momentum crossover with weighted filters.
     timeframe: 'scalping', '1h', '4h', 'daily', 'weekly'
+    snapshot: Precomputed indicators for (prices, volumes, timeframe)
     
     Returns: 'Buy', 'Sell', or 'Hold'
     """
     if weights is None:
         weights = load_weights()
 
-    # Timeframe-specific periods for MA crossover
-    periods = {
-        'scalping': (3, 10),
-        '1h': (5, 20),
-        '4h': (7, 30),
-        'daily': (10, 50),
-        'weekly': (20, 100)
-    }
-    short_period, long_period = periods.get(timeframe, (7, 30))
+    short_period, long_period = get_timeframe_periods(timeframe)
 
     # Validate data length
     if len(prices) < long_period or len(volumes) < long_period:
         return 'Hold'
 
-    # Calculate technical indicators
-    ma_short = calculate_ma(prices, short_period)
-    ma_long = calculate_ma(prices, long_period)
-    rsi = calculate_rsi(prices)
-    momentum = calculate_momentum(prices, min(10, short_period))
+    if snapshot is None:
+        snapshot = compute_snapshot(prices, volumes, timeframe)
 
-    # Volume analysis
-    avg_volume = np.mean(volumes[-long_period:])
-    current_volume = volumes[-1]
-    
+    return signal_from_snapshot(snapshot, weights)
+
+def signal_from_snapshot(snapshot: IndicatorSnapshot, weights: Dict) -> str:
+    """Buy/Sell/Hold for a snapshot, with the same history checks as `generate_signal`."""
+    if snapshot.n_prices < snapshot.long_period or snapshot.n_volumes < snapshot.long_period:
+        return 'Hold'
+    return decide_signal(
+        snapshot.ma_short, snapshot.ma_long, snapshot.rsi, snapshot.momentum,
+        snapshot.current_volume, snapshot.avg_volume, weights
+    )
+
+def decide_signal(
+    ma_short: Optional[float],
+    ma_long: Optional[float],
+    rsi: float,
+    momentum: float,
+    current_volume: float,
+    avg_volume: float,
+    weights: Dict,
+    params: SignalParams = DEFAULT_PARAMS
+) -> str:
+    """
+    Apply the Buy/Sell/Hold rules to precomputed indicator values.
+    Shared by `generate_signal` and the streaming engine so both paths agree.
+    """
     # Extract weights with fallbacks
     w_V = weights.get('w_V', 0.086)  # Volume weight
-    w_C = weights.get('w_C', 0.213)  # Creativity (adaptation)
-    w_S = weights.get('w_S', 0.185)  # Synthesis
     
     volume_threshold = avg_volume * (1 - w_V)
     
@@ -106,23 +341,23 @@ def generate_signal(prices: List[float], volumes: List[float], timeframe: str, w
     
     # Buy Signal: MA crossover + RSI filter + volume confirmation
     if ma_short > ma_long:
-        if rsi < 70 and current_volume > volume_threshold:
+        if rsi < params.rsi_buy_max and current_volume > volume_threshold:
             # Additional momentum filter for higher confidence
-            if momentum > 0 or (rsi < 50 and momentum > -2):
+            if momentum > 0 or (rsi < params.rsi_oversold and momentum > -2):
                 return 'Buy'
-        elif rsi < 50:  # Moderate signal if volume low but RSI oversold
+        elif rsi < params.rsi_oversold:  # Moderate signal if volume low but RSI oversold
             return 'Buy'
     
     # Sell Signal: MA bearish crossover or RSI overbought
     if ma_short < ma_long:
-        if rsi > 60 or momentum < -1:
+        if rsi > params.rsi_sell or momentum < -1:
             return 'Sell'
         return 'Hold'
     
     # Overbought/Oversold signals
-    if rsi > 80:
+    if rsi > params.rsi_extreme_high:
         return 'Sell'
-    elif rsi < 20:
+    elif rsi < params.rsi_extreme_low:
         return 'Buy'
     
     return 'Hold'
@@ -140,20 +375,13 @@ def calculate_sl_tp(entry: float, timeframe: str, risk_percent: float = 0.02, tr
     Returns:
         (stop_loss, take_profit)
     """
-    factors = {
-        'scalping': 1.0,
-        '1h': 1.5,
-        '4h': 2.0,
-        'daily': 3.0,
-        'weekly': 5.0
-    }
-    factor = factors.get(timeframe, 1.0)
+    factor = SL_TP_FACTORS.get(timeframe, 1.0)
     
     # Base SL from risk percentage
     sl = entry * (1 - risk_percent * factor)
     
     # Adaptive TP based on trend strength
-    if timeframe in ['daily', 'weekly']:
+    if timeframe in OPEN_ENDED_TIMEFRAMES:
         tp = None  # Open-ended for longer trends
     else:
         # Adjust TP multiplier based on trend strength
@@ -162,9 +390,49 @@ def calculate_sl_tp(entry: float, timeframe: str, risk_percent: float = 0.02, tr
     
     return sl, tp
 
-def get_signal_confidence(prices: List[float], volumes: List[float], timeframe: str, weights: Optional[Dict] = None) -> Dict[str, float]:
+def calculate_sl_tp_array(
+    entry,
+    timeframe: str,
+    risk_percent: float = 0.02,
+    trend_strength=0.0,
+    factor: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized `calculate_sl_tp` over arrays of entries and trend strengths.
+    factor: SL distance multiplier (default: the timeframe's SL_TP_FACTORS entry)
+    
+    Returns:
+        (stop_loss, take_profit) arrays; take_profit is NaN when open-ended
+    """
+    entry = np.asarray(entry, dtype=float)
+    trend_strength = np.asarray(trend_strength, dtype=float)
+    if factor is None:
+        factor = SL_TP_FACTORS.get(timeframe, 1.0)
+    sl = entry * (1 - risk_percent * factor)
+    if timeframe in OPEN_ENDED_TIMEFRAMES:
+        tp = np.full(np.broadcast(entry, trend_strength).shape, np.nan)
+    else:
+        tp_multiplier = 1.5 + (trend_strength / 100) * 0.5
+        tp = entry * (1 + tp_multiplier * risk_percent * factor)
+    return sl, tp
+
+def calculate_sl_tp_from_snapshot(snapshot: IndicatorSnapshot, risk_percent: float = 0.02) -> Tuple[float, Optional[float]]:
+    """Stop loss and take profit for entering at the snapshot's last price."""
+    return calculate_sl_tp(
+        snapshot.last_price, snapshot.timeframe,
+        risk_percent=risk_percent, trend_strength=snapshot.trend_strength
+    )
+
+def get_signal_confidence(
+    prices: List[float],
+    volumes: List[float],
+    timeframe: str,
+    weights: Optional[Dict] = None,
+    snapshot: Optional[IndicatorSnapshot] = None
+) -> Dict[str, float]:
     """
     Calculate confidence scores for signals across indicators.
+    snapshot: Precomputed indicators for (prices, volumes, timeframe)
     
     Returns:
         dict with 'ma_signal', 'rsi_signal', 'volume_signal', 'overall' (0-100)
@@ -175,18 +443,33 @@ def get_signal_confidence(prices: List[float], volumes: List[float], timeframe:
     if weights is None:
         weights = load_weights()
     
-    periods = {
-        'scalping': (3, 10),
-        '1h': (5, 20),
-        '4h': (7, 30),
-        'daily': (10, 50),
-        'weekly': (20, 100)
-    }
-    short_period, long_period = periods.get(timeframe, (7, 30))
+    if snapshot is None:
+        snapshot = compute_snapshot(prices, volumes, timeframe)
     
+    return confidence_from_snapshot(snapshot, weights)
+
+def confidence_from_snapshot(snapshot: IndicatorSnapshot, weights: Dict) -> Dict[str, float]:
+    """Confidence scores for a snapshot, with the same history check as `get_signal_confidence`."""
+    if snapshot.n_prices < snapshot.min_history:
+        return {'ma_signal': 0, 'rsi_signal': 0, 'volume_signal': 0, 'overall': 0}
+    return score_confidence(
+        snapshot.ma_short, snapshot.ma_long, snapshot.rsi,
+        snapshot.current_volume, snapshot.avg_volume, weights
+    )
+
+def score_confidence(
+    ma_short: Optional[float],
+    ma_long: Optional[float],
+    rsi: float,
+    current_volume: float,
+    avg_volume: float,
+    weights: Dict
+) -> Dict[str, float]:
+    """
+    Turn precomputed indicator values into the confidence dict
+    returned by `get_signal_confidence`.
+    """
     # MA signal confidence
-    ma_short = calculate_ma(prices, short_period)
-    ma_long = calculate_ma(prices, long_period)
     if ma_short and ma_long:
         ma_diff_pct = abs(ma_short - ma_long) / ma_long * 100
         ma_signal = min(100, ma_diff_pct * 10)  # Cap at 100
@@ -194,15 +477,12 @@ def get_signal_confidence(prices: List[float], volumes: List[float], timeframe:
         ma_signal = 0
     
     # RSI signal confidence
-    rsi = calculate_rsi(prices)
     if rsi > 70 or rsi < 30:
         rsi_signal = min(100, (100 - abs(rsi - 50)) / 50 * 100)
     else:
         rsi_signal = 0
     
     # Volume confidence
-    avg_volume = np.mean(volumes[-long_period:])
-    current_volume = volumes[-1]
     volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
     volume_signal = min(100, (volume_ratio - 1) * 100) if volume_ratio > 1 else 0
     
@@ -221,9 +501,248 @@ def get_signal_confidence(prices: List[float], volumes: List[float], timeframe:
         'overall': float(overall)
     }
 
+# ============================================================================
+# WHOLE-SERIES VARIANTS
+# Array-in/array-out versions of the functions above. Element i equals what the
+# scalar function returns for the prefix prices[:i+1], so a backtest can get
+# every bar's signal in one O(n) pass instead of replaying growing prefixes.
+# All functions operate along the last axis.
+# ============================================================================
+
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_LABELS = {SIGNAL_HOLD: 'Hold', SIGNAL_BUY: 'Buy', SIGNAL_SELL: 'Sell'}
+
+def _shifted_cumsum(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative sum of `values - values[0]` (keeps precision on large prices) and the base."""
+    base = values[..., :1]
+    return np.cumsum(values - base, axis=-1), base
+
+def _window_sum(csum: np.ndarray, base: np.ndarray, period: int) -> np.ndarray:
+    """Trailing sums from a `_shifted_cumsum`, NaN where the window is incomplete."""
+    out = np.full(csum.shape, np.nan)
+    if csum.shape[-1] >= period:
+        out[..., period - 1] = csum[..., period - 1]
+        out[..., period:] = csum[..., period:] - csum[..., :-period]
+        out[..., period - 1:] += base * period
+    return out
+
+def _window_partial_mean(csum: np.ndarray, base: np.ndarray, period: int) -> np.ndarray:
+    """Trailing means from a `_shifted_cumsum`, over fewer values early on."""
+    counts = np.minimum(np.arange(1, csum.shape[-1] + 1), period)
+    window = csum.copy()
+    window[..., period:] -= csum[..., :-period]
+    return window / counts + base
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Trailing sum over `period` values, NaN where the window is incomplete."""
+    return _window_sum(*_shifted_cumsum(values), period)
+
+def calculate_ma_series(prices, period: int) -> np.ndarray:
+    """Moving average for every bar (NaN until `period` bars exist)."""
+    prices = np.asarray(prices, dtype=float)
+    return _rolling_sum(prices, period) / period
+
+def calculate_partial_mean_series(values, period: int) -> np.ndarray:
+    """Mean of `values[-period:]` for every prefix, using fewer bars early on."""
+    values = np.asarray(values, dtype=float)
+    return _window_partial_mean(*_shifted_cumsum(values), period)
+
+def calculate_rsi_series(prices, period: int = 14) -> np.ndarray:
+    """RSI for every bar, matching `calculate_rsi` on each prefix."""
+    prices = np.asarray(prices, dtype=float)
+    n = prices.shape[-1]
+    rsi = np.full(prices.shape, 50.0)  # Neutral until enough history
+    if n < period + 1:
+        return rsi
+    deltas = np.diff(prices, axis=-1)
+
+    # Exactly period + 1 prices: the seed only has `period` deltas
+    up, down = _wilder_seed(deltas[..., :period], period)
+    up, down = _wilder_step(up, down, deltas[..., period - 1], period)
+    rsi[..., period] = _rsi_from_averages(up, down)
+
+    # Longer prefixes all share the period + 1 delta seed, then smooth from
+    # delta `period - 1`; the first smoothed state belongs to the case above
+    if n >= period + 2:
+        up, down = _wilder_seed(deltas[..., :period + 1], period)
+        gains, losses = _split_deltas(deltas[..., period - 1:])
+        ups = _wilder_filter(gains, up, period)
+        downs = _wilder_filter(losses, down, period)
+        rsi[..., period + 1:] = _rsi_from_averages(ups[..., 1:], downs[..., 1:])
+    return rsi
+
+def calculate_momentum_series(prices, period: int = 10) -> np.ndarray:
+    """Momentum for every bar (0.0 until `period` bars exist)."""
+    prices = np.asarray(prices, dtype=float)
+    momentum = np.zeros(prices.shape)
+    if prices.shape[-1] >= period:
+        base = prices[..., :prices.shape[-1] - period + 1]
+        momentum[..., period - 1:] = (prices[..., period - 1:] - base) / base * 100
+    return momentum
+
+def decide_signal_codes(
+    ma_short: np.ndarray,
+    ma_long: np.ndarray,
+    rsi: np.ndarray,
+    momentum: np.ndarray,
+    current_volume: np.ndarray,
+    avg_volume: np.ndarray,
+    weights: Dict,
+    params: SignalParams = DEFAULT_PARAMS
+) -> np.ndarray:
+    """Vectorized `decide_signal`; NaN moving averages yield Hold."""
+    w_V = weights.get('w_V', 0.086)
+    volume_threshold = avg_volume * (1 - w_V)
+    valid = ~(np.isnan(ma_short) | np.isnan(ma_long))
+
+    bullish = valid & (ma_short > ma_long)
+    bearish = valid & (ma_short < ma_long)
+    oversold = rsi < params.rsi_oversold
+    confirmed = (rsi < params.rsi_buy_max) & (current_volume > volume_threshold)
+    buy = bullish & (
+        (confirmed & ((momentum > 0) | (oversold & (momentum > -2))))
+        | (~confirmed & oversold)
+    )
+    sell = bearish & ((rsi > params.rsi_sell) | (momentum < -1))
+
+    # Bullish bars without a buy fall through to the overbought/oversold checks,
+    # bearish bars without a sell are held
+    return np.select(
+        [buy, sell, bearish, valid & (rsi > params.rsi_extreme_high), valid & (rsi < params.rsi_extreme_low)],
+        [SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD, SIGNAL_SELL, SIGNAL_BUY],
+        SIGNAL_HOLD
+    ).astype(np.int8)
+
+def compute_indicator_series(prices, volumes, timeframe: str, params: SignalParams = DEFAULT_PARAMS) -> Dict[str, np.ndarray]:
+    """
+    Per-bar inputs of the signal and confidence rules.
+    
+    Returns:
+        dict with 'ma_short', 'ma_long', 'rsi', 'momentum', 'current_volume', 'avg_volume'
+    """
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    short_period, long_period = params.periods(timeframe)
+    return {
+        'ma_short': calculate_ma_series(prices, short_period),
+        'ma_long': calculate_ma_series(prices, long_period),
+        'rsi': calculate_rsi_series(prices),
+        'momentum': calculate_momentum_series(prices, min(10, short_period)),
+        'current_volume': volumes,
+        'avg_volume': calculate_partial_mean_series(volumes, long_period)
+    }
+
+def generate_signal_series(
+    prices,
+    volumes,
+    timeframe: str,
+    weights: Optional[Dict] = None,
+    params: SignalParams = DEFAULT_PARAMS,
+    series: Optional[Dict[str, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Signal code for every bar (see SIGNAL_LABELS), equivalent to calling
+    `generate_signal` on each prefix.
+    series: Precomputed `compute_indicator_series` output for the same inputs
+    
+    Returns: int8 array of SIGNAL_BUY / SIGNAL_SELL / SIGNAL_HOLD
+    """
+    if weights is None:
+        weights = load_weights()
+    if series is None:
+        series = compute_indicator_series(prices, volumes, timeframe, params)
+    return decide_signal_codes(
+        series['ma_short'], series['ma_long'], series['rsi'], series['momentum'],
+        series['current_volume'], series['avg_volume'], weights, params
+    )
+
+def score_confidence_array(
+    ma_short: np.ndarray,
+    ma_long: np.ndarray,
+    rsi: np.ndarray,
+    current_volume: np.ndarray,
+    avg_volume: np.ndarray,
+    weights: Dict
+) -> Dict[str, np.ndarray]:
+    """Vectorized `score_confidence` in float64."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        has_ma = ~(np.isnan(ma_short) | np.isnan(ma_long)) & (ma_short != 0) & (ma_long != 0)
+        ma_diff_pct = np.abs(ma_short - ma_long) / ma_long * 100
+        ma_signal = np.where(has_ma, np.minimum(100, ma_diff_pct * 10), 0.)
+
+        extreme = (rsi > 70) | (rsi < 30)
+        rsi_signal = np.where(extreme, np.minimum(100, (100 - np.abs(rsi - 50)) / 50 * 100), 0.)
+
+        volume_ratio = np.where(avg_volume > 0, current_volume / avg_volume, 0.)
+        volume_signal = np.where(volume_ratio > 1, np.minimum(100, (volume_ratio - 1) * 100), 0.)
+
+    w_ma = weights.get('w_C', 0.213)
+    w_rsi = weights.get('w_S', 0.185)
+    w_vol = weights.get('w_V', 0.086)
+    total_weight = w_ma + w_rsi + w_vol
+    if total_weight > 0:
+        overall = (ma_signal * w_ma + rsi_signal * w_rsi + volume_signal * w_vol) / total_weight
+    else:
+        overall = np.zeros(np.shape(ma_signal))
+
+    return {
+        'ma_signal': ma_signal,
+        'rsi_signal': rsi_signal,
+        'volume_signal': volume_signal,
+        'overall': overall
+    }
+
+def _confidence_series(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    timeframe: str,
+    weights: Dict,
+    params: SignalParams = DEFAULT_PARAMS,
+    series: Optional[Dict[str, np.ndarray]] = None
+) -> Dict[str, np.ndarray]:
+    if series is None:
+        series = compute_indicator_series(prices, volumes, timeframe, params)
+    components = score_confidence_array(
+        series['ma_short'], series['ma_long'], series['rsi'],
+        series['current_volume'], series['avg_volume'], weights
+    )
+    # Fewer than 50 bars reports zero confidence
+    too_short = np.arange(prices.shape[-1]) < 49
+    for values in components.values():
+        values[..., too_short] = 0.
+    return components
+
+def get_signal_confidence_series(prices, volumes, timeframe: str, weights: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Confidence scores for every bar, equivalent to calling
+    `get_signal_confidence` on each prefix.
+    
+    Returns:
+        dict with 'ma_signal', 'rsi_signal', 'volume_signal', 'overall' float32 arrays
+    """
+    if weights is None:
+        weights = load_weights()
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    components = _confidence_series(prices, volumes, timeframe, weights)
+    return {key: values.astype(np.float32) for key, values in components.items()}
+
+
 if __name__ == '__main__':
     # Test with dummy data
     p = [60000 + i*100 for i in range(100)]
     v = [1000 + (i%5)*100 for i in range(100)]
     print(f"Daily Signal: {generate_signal(p, v, 'daily')}")
     print(f"Signal Confidence: {get_signal_confidence(p, v, 'daily')}")
+    codes = generate_signal_series(p, v, 'daily')
+    print(f"Daily Signal Series (last 5): {[SIGNAL_LABELS[c] for c in codes[-5:]]}")
+
+    # Tail-mode RSI accuracy on a random walk
+    np.random.seed(0)
+    walk = 60000 * np.cumprod(1 + np.random.normal(0, 0.01, 5000))
+    print("\nRSI warm-up accuracy (tail mode vs full history):")
+    print("| Warm-up | Max abs error | Mean abs error | Decay bound |")
+    for warmup, stats in rsi_warmup_report(walk).items():
+        print(f"| {warmup:7} | {stats['max_abs_error']:13.2e} | {stats['mean_abs_error']:14.2e} | {stats['decay_bound']:11.2e} |")
@@ -9,16 +9,21 @@ Calculates and optimizes all weights in the Multi-Dimensional Skill Framework:
 - Emergence coefficients
 - Synthesis weights
 
-Uses gradient descent with momentum and adaptive learning rates.
+Uses gradient descent with momentum and adaptive learning rates, with
+closed-form gradients of the MSE + L2 loss over an (N, 8) skill matrix, or
+fits the dimension weights directly by simplex-constrained least squares.
 
 Author: Auto-generated from Mathematical Framework (Feb 2026)
 Version: 1.0.0
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Sequence, Union
 import json
+import os
 import pickle
+import queue
+import threading
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
@@ -59,6 +64,170 @@ class TrainingExample:
     context: str = ""
 
 
+class SkillBank:
+    """
+    Structure-of-arrays store for large skill sets
+    
+    One contiguous (N, 8) float matrix in G..T column order, a target column,
+    context codes into a small label table and optional names. Saved banks
+    are directories of .npy files that can be opened memory-mapped, so tens
+    of millions of skills fit on one node. Rows are materialized as
+    SkillVector / TrainingExample objects only on request.
+    """
+    
+    DIMENSIONS = ('G', 'C', 'S', 'A', 'H', 'V', 'P', 'T')
+    
+    def __init__(
+        self,
+        skills: np.ndarray,
+        targets: Optional[np.ndarray] = None,
+        context_codes: Optional[np.ndarray] = None,
+        context_labels: Optional[List[str]] = None,
+        names: Optional[np.ndarray] = None
+    ):
+        if skills.ndim != 2 or skills.shape[1] != 8:
+            raise ValueError("skills must be an (N, 8) matrix")
+        n = len(skills)
+        self.skills = skills
+        self.targets = targets if targets is not None else np.full(n, np.nan)
+        self.context_codes = context_codes if context_codes is not None else np.zeros(n, dtype=np.int32)
+        self.context_labels = list(context_labels) if context_labels else [""]
+        self.names = names  # Fixed-width UTF-8 bytes (see encode_names); None means "skill_<row>"
+    
+    @classmethod
+    def allocate(cls, n: int, path: Optional[str] = None, dtype=np.float64) -> 'SkillBank':
+        """
+        Empty bank of n rows to fill in chunks; memory-mapped files under
+        `path` when given, else in memory
+        """
+        if path is None:
+            return cls(np.zeros((n, 8), dtype=dtype), np.zeros(n), np.zeros(n, dtype=np.int32))
+        os.makedirs(path, exist_ok=True)
+        skills = np.lib.format.open_memmap(os.path.join(path, 'skills.npy'), 'w+', dtype, (n, 8))
+        targets = np.lib.format.open_memmap(os.path.join(path, 'targets.npy'), 'w+', np.float64, (n,))
+        codes = np.lib.format.open_memmap(os.path.join(path, 'context_codes.npy'), 'w+', np.int32, (n,))
+        bank = cls(skills, targets, codes)
+        bank.save_meta(path)
+        return bank
+    
+    @classmethod
+    def from_examples(cls, examples: Sequence[TrainingExample]) -> 'SkillBank':
+        """Pack a list of TrainingExample objects"""
+        labels = {}
+        codes = np.array([labels.setdefault(ex.context, len(labels)) for ex in examples], dtype=np.int32)
+        return cls(
+            skills=np.array([ex.skill.to_array() for ex in examples], dtype=float).reshape(-1, 8),
+            targets=np.array([ex.target_q for ex in examples], dtype=float),
+            context_codes=codes,
+            context_labels=list(labels),
+            names=cls.encode_names([ex.skill.name for ex in examples])
+        )
+    
+    @classmethod
+    def from_skills(cls, skills: Sequence[SkillVector]) -> 'SkillBank':
+        """Pack SkillVector objects (no targets)"""
+        return cls(
+            skills=np.array([s.to_array() for s in skills], dtype=float).reshape(-1, 8),
+            names=cls.encode_names([s.name for s in skills])
+        )
+    
+    @staticmethod
+    def encode_names(names: Sequence[str]) -> np.ndarray:
+        """Names as a fixed-width bytes column, UTF-8 encoded so any name fits"""
+        return np.array([n.encode('utf-8') for n in names], dtype=np.bytes_)
+    
+    def __len__(self) -> int:
+        return len(self.skills)
+    
+    def __getitem__(self, index) -> Union[TrainingExample, 'SkillBank']:
+        """A row as a TrainingExample, or a slice/mask/index array as a SkillBank (views for slices)"""
+        if isinstance(index, (int, np.integer)):
+            return self.example(int(index))
+        return SkillBank(
+            self.skills[index],
+            self.targets[index],
+            self.context_codes[index],
+            self.context_labels,
+            self.names[index] if self.names is not None else None
+        )
+    
+    def __iter__(self) -> Iterator[TrainingExample]:
+        for i in range(len(self)):
+            yield self.example(i)
+    
+    def name(self, i: int) -> str:
+        """Stored name, or skill_<row> (row within this bank) for unnamed banks"""
+        if self.names is None:
+            return f"skill_{i}"
+        return self.names[i].decode('utf-8')
+    
+    def skill(self, i: int) -> SkillVector:
+        """Row i as a SkillVector"""
+        row = self.skills[i]
+        return SkillVector(self.name(i), *(float(v) for v in row))
+    
+    def example(self, i: int) -> TrainingExample:
+        """Row i as a TrainingExample"""
+        return TrainingExample(
+            skill=self.skill(i),
+            target_q=float(self.targets[i]),
+            context=self.context_labels[self.context_codes[i]]
+        )
+    
+    def contexts(self) -> np.ndarray:
+        """Context label per row"""
+        return np.asarray(self.context_labels, dtype=object)[self.context_codes]
+    
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(skills, targets) for SkillWeightTrainer and SkillEvaluator"""
+        return self.skills, self.targets
+    
+    def memory_bytes(self) -> int:
+        """Bytes held in memory (memory-mapped columns count as zero)"""
+        columns = [self.skills, self.targets, self.context_codes] + ([self.names] if self.names is not None else [])
+        return sum(c.nbytes for c in columns if not isinstance(c, np.memmap))
+    
+    def save(self, path: str):
+        """Write the bank as .npy columns plus meta.json"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'skills.npy'), self.skills)
+        np.save(os.path.join(path, 'targets.npy'), self.targets)
+        np.save(os.path.join(path, 'context_codes.npy'), self.context_codes)
+        names_path = os.path.join(path, 'names.npy')
+        if self.names is not None:
+            np.save(names_path, self.names)
+        elif os.path.exists(names_path):
+            os.remove(names_path)
+        self.save_meta(path)
+    
+    def save_meta(self, path: str):
+        """Flush mapped columns and write meta.json (row count, context labels) for a bank at path"""
+        for column in (self.skills, self.targets, self.context_codes):
+            if isinstance(column, np.memmap):
+                column.flush()
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'rows': len(self), 'context_labels': self.context_labels}, f, indent=2)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'SkillBank':
+        """Open a saved bank, memory-mapped (read-only) unless mmap is False"""
+        mode = 'r' if mmap else None
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        names_path = os.path.join(path, 'names.npy')
+        return cls(
+            skills=np.load(os.path.join(path, 'skills.npy'), mmap_mode=mode),
+            targets=np.load(os.path.join(path, 'targets.npy'), mmap_mode=mode),
+            context_codes=np.load(os.path.join(path, 'context_codes.npy'), mmap_mode=mode),
+            context_labels=meta['context_labels'],
+            names=np.load(names_path, mmap_mode=mode) if os.path.exists(names_path) else None
+        )
+
+
+# Training data as examples, a SkillBank or a (skills, targets) array pair
+ExampleData = Union[List[TrainingExample], SkillBank, Tuple[np.ndarray, np.ndarray]]
+
+
 @dataclass
 class WeightConfig:
     """All trainable weights in the system"""
@@ -97,6 +266,13 @@ class WeightConfig:
             self.delta_min, self.delta_max
         ])
     
+    def q_weights(self) -> np.ndarray:
+        """Q-score dimension weights packed in G..T order"""
+        return np.array([
+            self.w_G, self.w_C, self.w_S, self.w_A,
+            self.w_H, self.w_V, self.w_P, self.w_T
+        ], dtype=float)
+    
     def from_array(self, arr: np.ndarray):
         """Update from numpy array"""
         self.w_G, self.w_C, self.w_S, self.w_A = arr[0], arr[1], arr[2], arr[3]
@@ -131,14 +307,30 @@ class SkillMath:
         Calculate Q-score: Q(s) = Σᵢ wᵢ · cᵢ
         """
         s = skill.to_array()
-        w = np.array([
-            weights.w_G, weights.w_C, weights.w_S, weights.w_A,
-            weights.w_H, weights.w_V, weights.w_P, weights.w_T
-        ])
+        w = weights.q_weights()
         
         q_score = np.dot(w, s)
         return float(np.clip(q_score, 0.0, 1.0))
     
+    @staticmethod
+    def compute_q_scores(
+        skills: np.ndarray,
+        weight_vector: np.ndarray,
+        clip: bool = True
+    ) -> np.ndarray:
+        """
+        Batched Q-scores: one matrix-vector product over an (N, 8) skill matrix
+        
+        Args:
+            skills: (N, 8) matrix in G..T column order
+            weight_vector: Packed dimension weights (WeightConfig.q_weights())
+            clip: Clip to [0, 1] like compute_q_score
+        """
+        q_scores = np.asarray(skills, dtype=float) @ np.asarray(weight_vector, dtype=float)
+        if clip:
+            np.clip(q_scores, 0.0, 1.0, out=q_scores)
+        return q_scores
+    
     @staticmethod
     def compute_interaction_tensor(
         skill_a: SkillVector,
@@ -250,10 +442,263 @@ class SkillMath:
         return delta
 
 
+# ============================================================================
+# DATA LOADING
+# ============================================================================
+
+def as_skill_bank(data: ExampleData) -> SkillBank:
+    """Any ExampleData as a SkillBank (arrays are wrapped, not copied)"""
+    if isinstance(data, SkillBank):
+        return data
+    if isinstance(data, tuple):
+        return SkillBank(data[0], data[1])
+    return SkillBank.from_examples(data)
+
+
+def write_shards(data: ExampleData, directory: str, shard_size: int = 1_000_000) -> List[str]:
+    """
+    Split training data into SkillBank shards of at most shard_size rows
+    
+    Memory-mapped banks are copied one shard at a time, so the source can be
+    larger than RAM. Returns the shard directories in order.
+    """
+    bank = as_skill_bank(data)
+    paths = []
+    for i, start in enumerate(range(0, len(bank), shard_size)):
+        path = os.path.join(directory, f"shard_{i:05d}")
+        bank[start:start + shard_size].save(path)
+        paths.append(path)
+    return paths
+
+
+class ShardedLoader:
+    """
+    Mini-batches of (skills, targets) streamed from SkillBank shards
+    
+    Each pass (epoch) visits the shards in random order and each shard's rows
+    in a random permutation. Shards are opened memory-mapped and only the
+    current batch is copied out; a background thread keeps up to `prefetch`
+    batches ready, so memory stays bounded by about (prefetch + 1) batches.
+    """
+    
+    def __init__(
+        self,
+        shards: Sequence[Union[str, SkillBank]],
+        batch_size: int = 4096,
+        shuffle: bool = True,
+        prefetch: int = 4,
+        seed: Optional[int] = None,
+        drop_last: bool = False
+    ):
+        """
+        Args:
+            shards: Shard directories (see write_shards) or in-memory banks
+            shuffle: Shuffle shard order and rows every epoch
+            prefetch: Batches prepared ahead of the consumer
+            drop_last: Skip each shard's final partial batch
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.shards = list(shards)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.prefetch = max(1, prefetch)
+        self.drop_last = drop_last
+        self.rng = np.random.default_rng(seed)
+        self.shard_sizes = [len(self._open(shard)) for shard in self.shards]
+    
+    @classmethod
+    def from_directory(cls, directory: str, **kwargs) -> 'ShardedLoader':
+        """Loader over every shard_* directory written by write_shards"""
+        names = sorted(n for n in os.listdir(directory) if n.startswith('shard_'))
+        return cls([os.path.join(directory, n) for n in names], **kwargs)
+    
+    @staticmethod
+    def _open(shard: Union[str, SkillBank]) -> SkillBank:
+        return SkillBank.load(shard) if isinstance(shard, str) else shard
+    
+    @property
+    def n_examples(self) -> int:
+        return sum(self.shard_sizes)
+    
+    def __len__(self) -> int:
+        """Batches per epoch"""
+        if self.drop_last:
+            return sum(n // self.batch_size for n in self.shard_sizes)
+        return sum(-(-n // self.batch_size) for n in self.shard_sizes)
+    
+    def _batches(self, order: np.ndarray, seeds: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for shard_index, seed in zip(order, seeds):
+            bank = self._open(self.shards[shard_index])
+            n = len(bank)
+            stop = n - n % self.batch_size if self.drop_last else n
+            if self.shuffle:
+                rows = np.random.default_rng(seed).permutation(n)
+                for start in range(0, stop, self.batch_size):
+                    # Sorted indices read the mapped file front to back
+                    index = np.sort(rows[start:start + self.batch_size])
+                    yield np.asarray(bank.skills[index], dtype=float), np.asarray(bank.targets[index], dtype=float)
+            else:
+                for start in range(0, stop, self.batch_size):
+                    end = start + self.batch_size
+                    yield np.array(bank.skills[start:end], dtype=float), np.array(bank.targets[start:end], dtype=float)
+    
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """One epoch of batches, prepared in a background thread"""
+        order = self.rng.permutation(len(self.shards)) if self.shuffle else np.arange(len(self.shards))
+        seeds = self.rng.integers(0, 2**63 - 1, size=len(self.shards))
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop_event = threading.Event()
+        done = object()
+        
+        def produce():
+            try:
+                for batch in self._batches(order, seeds):
+                    while not stop_event.is_set():
+                        try:
+                            batches.put(batch, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop_event.is_set():
+                        return
+                batches.put(done)
+            except BaseException as exc:  # Re-raised in the consumer
+                batches.put(exc)
+        
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Consumer stopped early (break/exception): release the producer
+            stop_event.set()
+            while worker.is_alive():
+                try:
+                    batches.get_nowait()
+                except queue.Empty:
+                    worker.join(timeout=0.1)
+
+
 # ============================================================================
 # TRAINING SYSTEM
 # ============================================================================
 
+@dataclass
+class NormalEquations:
+    """
+    Sufficient statistics of the least-squares Q-score fit, accumulated in
+    one streaming pass: XᵀX, Xᵀy, yᵀy and the row count
+    """
+    xtx: np.ndarray = None
+    xty: np.ndarray = None
+    yty: float = 0.0
+    n: int = 0
+    
+    def __post_init__(self):
+        if self.xtx is None:
+            self.xtx = np.zeros((8, 8))
+        if self.xty is None:
+            self.xty = np.zeros(8)
+    
+    def update(self, skills: np.ndarray, targets: np.ndarray):
+        """Add a batch of rows"""
+        skills = np.asarray(skills, dtype=float)
+        targets = np.asarray(targets, dtype=float)
+        self.xtx += skills.T @ skills
+        self.xty += skills.T @ targets
+        self.yty += float(targets @ targets)
+        self.n += len(targets)
+    
+    @classmethod
+    def from_data(cls, data: Union[ExampleData, 'ShardedLoader'], chunk_size: int = 1_000_000) -> 'NormalEquations':
+        """Accumulate over in-memory data (in chunks) or a loader's batches"""
+        stats = cls()
+        if isinstance(data, ShardedLoader):
+            for skills, targets in data:
+                stats.update(skills, targets)
+            return stats
+        skills, targets = SkillWeightTrainer.example_arrays(data)
+        for start in range(0, len(targets), chunk_size):
+            stats.update(skills[start:start + chunk_size], targets[start:start + chunk_size])
+        return stats
+    
+    def mse(self, w: np.ndarray) -> float:
+        """Mean squared error of unclipped predictions X·w"""
+        if self.n == 0:
+            return 0.0
+        return float((w @ self.xtx @ w - 2 * w @ self.xty + self.yty) / self.n)
+
+
+def solve_simplex_least_squares(
+    xtx: np.ndarray,
+    xty: np.ndarray,
+    n: int,
+    ridge: float = 0.0,
+    tol: float = 1e-12,
+    max_iter: int = 100
+) -> Tuple[np.ndarray, Dict]:
+    """
+    min_w  ||Xw - y||² / n + ridge·||w||²   s.t.  w ≥ 0, Σw = 1
+    
+    Primal active-set QP: each iteration solves the KKT system of the
+    equality-constrained problem on the free weights, steps as far as
+    feasibility allows (pinning weights that hit zero), and frees the pinned
+    weight with the most negative multiplier once the free solution is
+    feasible. The exact optimum is reached in a handful of 9x9 solves.
+    
+    Returns:
+        (weights, info) with info holding 'iterations' and the 'active' (zero) set
+    """
+    if n <= 0:
+        raise ValueError("no data to fit")
+    k = len(xty)
+    Q = xtx / n + ridge * np.eye(k)
+    c = xty / n
+    w = np.full(k, 1.0 / k)          # Feasible start
+    active = np.zeros(k, dtype=bool)  # Weights pinned at zero
+    
+    for iteration in range(1, max_iter + 1):
+        free = np.flatnonzero(~active)
+        m = len(free)
+        # KKT of  min ½wQw - cw  s.t. Σw_F = 1:  [Q_FF 1; 1ᵀ 0] [w_F; μ] = [c_F; 1]
+        kkt = np.zeros((m + 1, m + 1))
+        kkt[:m, :m] = Q[np.ix_(free, free)]
+        kkt[:m, m] = 1.0
+        kkt[m, :m] = 1.0
+        rhs = np.append(c[free], 1.0)
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+        target = np.zeros(k)
+        target[free] = solution[:m]
+        
+        if np.all(target[free] >= -tol):
+            w = np.maximum(target, 0.0)
+            # Multipliers of the pinned bounds: λ = Qw - c + μ must be ≥ 0
+            multipliers = Q @ w - c + solution[m]
+            pinned = np.flatnonzero(active)
+            if len(pinned) == 0 or multipliers[pinned].min() >= -tol:
+                break
+            active[pinned[np.argmin(multipliers[pinned])]] = False
+        else:
+            # Step towards the free solution until the first weight reaches zero
+            direction = target - w
+            blocking = free[(target[free] < -tol) & (direction[free] < 0)]
+            steps = w[blocking] / -direction[blocking]
+            alpha = min(1.0, float(steps.min()))
+            w = w + alpha * direction
+            hit = blocking[steps <= alpha + tol]
+            active[hit] = True
+            w[active] = 0.0
+    w = w / w.sum()
+    return w, {'iterations': iteration, 'active': np.flatnonzero(w == 0.0).tolist()}
+
+
 class SkillWeightTrainer:
     """Trains all weights using gradient descent"""
     
@@ -271,6 +716,7 @@ class SkillWeightTrainer:
         self.velocity = np.zeros(13)  # Momentum terms
         
         self.training_history = []
+        self.fit_info = {}  # Solver details of the last fit_least_squares
     
     def compute_loss(
         self,
@@ -286,24 +732,69 @@ class SkillWeightTrainer:
         
         return mse + l2_reg
     
+    @staticmethod
+    def example_arrays(
+        training_data: ExampleData
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (N, 8) skill matrix and (N,) targets; SkillBank columns and
+        (matrix, targets) pairs pass through without copying
+        """
+        if isinstance(training_data, tuple):
+            return training_data
+        if isinstance(training_data, SkillBank):
+            return training_data.arrays()
+        skills = np.array([ex.skill.to_array() for ex in training_data], dtype=float).reshape(-1, 8)
+        targets = np.array([ex.target_q for ex in training_data], dtype=float)
+        return skills, targets
+    
     def compute_gradients(
         self,
-        training_data: List[TrainingExample],
+        training_data: ExampleData,
         weights_array: np.ndarray
     ) -> np.ndarray:
         """
-        Compute gradients using finite differences
+        Closed-form gradient of compute_loss w.r.t. the 13 raw parameters
+        
+        Predictions are clip(X·w, 0, 1) with w = θ[:8] / S, S = Σθ[:8], so for
+        the dimension weights, with c = 2·(pred - y)·[0 < X·w < 1] / N and
+        g = Xᵀc:
+        
+            dL/dθⱼ = (gⱼ - g·w) / S + 2λθⱼ
+        
+        The other five parameters do not enter the predictions, so only the
+        L2 term contributes to theirs.
+        """
+        skills, targets = self.example_arrays(training_data)
+        theta_q = weights_array[:8]
+        total = theta_q.sum()
+        w = theta_q / total
+        
+        raw = SkillMath.compute_q_scores(skills, w, clip=False)
+        predictions = np.clip(raw, 0.0, 1.0)
+        active = (raw > 0.0) & (raw < 1.0)  # Clipped predictions have zero slope
+        coeff = np.where(active, 2.0 * (predictions - targets), 0.0) / len(targets)
+        g = skills.T @ coeff
+        
+        gradients = 2.0 * self.weight_decay * weights_array
+        gradients[:8] += (g - g @ w) / total
+        return gradients
+    
+    def compute_numeric_gradients(
+        self,
+        training_data: ExampleData,
+        weights_array: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute gradients using finite differences (reference for compute_gradients)
         """
         epsilon = 1e-5
         gradients = np.zeros_like(weights_array)
+        skills, baseline_targets = self.example_arrays(training_data)
         
         # Baseline loss
         self.weights.from_array(weights_array)
-        baseline_predictions = np.array([
-            SkillMath.compute_q_score(ex.skill, self.weights)
-            for ex in training_data
-        ])
-        baseline_targets = np.array([ex.target_q for ex in training_data])
+        baseline_predictions = SkillMath.compute_q_scores(skills, self.weights.q_weights())
         baseline_loss = self.compute_loss(
             baseline_predictions, baseline_targets, weights_array
         )
@@ -316,10 +807,7 @@ class SkillWeightTrainer:
             
             # Compute perturbed loss
             self.weights.from_array(perturbed)
-            perturbed_predictions = np.array([
-                SkillMath.compute_q_score(ex.skill, self.weights)
-                for ex in training_data
-            ])
+            perturbed_predictions = SkillMath.compute_q_scores(skills, self.weights.q_weights())
             perturbed_loss = self.compute_loss(
                 perturbed_predictions, baseline_targets, perturbed
             )
@@ -329,18 +817,36 @@ class SkillWeightTrainer:
         
         return gradients
     
+    def check_gradients(
+        self,
+        training_data: List[TrainingExample],
+        weights_array: Optional[np.ndarray] = None
+    ) -> float:
+        """
+        Max absolute difference between analytic and finite-difference gradients
+        """
+        if weights_array is None:
+            weights_array = self.weights.to_array()
+        saved = self.weights.to_array()
+        analytic = self.compute_gradients(training_data, weights_array)
+        numeric = self.compute_numeric_gradients(training_data, weights_array)
+        self.weights.from_array(saved)
+        return float(np.max(np.abs(analytic - numeric)))
+    
     def train_step(
         self,
-        training_data: List[TrainingExample]
+        training_data: ExampleData
     ) -> Dict[str, float]:
         """
         Single training step
         """
+        skills, targets = self.example_arrays(training_data)
+        
         # Get current weights
         weights_array = self.weights.to_array()
         
         # Compute gradients
-        gradients = self.compute_gradients(training_data, weights_array)
+        gradients = self.compute_gradients((skills, targets), weights_array)
         
         # Update with momentum
         self.velocity = self.momentum * self.velocity - self.learning_rate * gradients
@@ -350,11 +856,7 @@ class SkillWeightTrainer:
         self.weights.from_array(weights_array)
         
         # Compute current loss
-        predictions = np.array([
-            SkillMath.compute_q_score(ex.skill, self.weights)
-            for ex in training_data
-        ])
-        targets = np.array([ex.target_q for ex in training_data])
+        predictions = SkillMath.compute_q_scores(skills, self.weights.q_weights())
         loss = self.compute_loss(predictions, targets, weights_array)
         
         # Compute metrics
@@ -369,18 +871,41 @@ class SkillWeightTrainer:
     
     def train(
         self,
-        training_data: List[TrainingExample],
-        validation_data: Optional[List[TrainingExample]] = None,
+        training_data: ExampleData,
+        validation_data: Optional[ExampleData] = None,
         epochs: int = 100,
         early_stopping_patience: int = 10,
-        verbose: bool = True
+        verbose: bool = True,
+        batch_size: Optional[int] = None,
+        solver: str = 'sgd'
     ) -> Dict[str, List]:
         """
         Full training loop
+        
+        One full-batch step per epoch; with a batch_size or a ShardedLoader as
+        training_data, runs train_minibatch instead. validation_data may be a
+        ShardedLoader on either path. solver='least_squares' fits the
+        dimension weights directly with fit_least_squares.
         """
+        if solver == 'least_squares':
+            return self.fit_least_squares(training_data, validation_data, verbose=verbose)
+        if solver != 'sgd':
+            raise ValueError("solver must be 'sgd' or 'least_squares'")
+        if batch_size is not None or isinstance(training_data, ShardedLoader):
+            return self.train_minibatch(
+                training_data, validation_data, epochs, batch_size or 4096,
+                early_stopping_patience, verbose
+            )
+        
         best_val_loss = float('inf')
         patience_counter = 0
         
+        # Pack the examples once; every epoch is then a few matrix-vector products.
+        # A validation loader stays a held-out stream, scored batch by batch
+        train_arrays = self.example_arrays(training_data)
+        if validation_data and not isinstance(validation_data, ShardedLoader):
+            validation_data = self.example_arrays(validation_data)
+        
         history = {
             'train_loss': [],
             'train_mae': [],
@@ -390,22 +915,15 @@ class SkillWeightTrainer:
         
         for epoch in range(epochs):
             # Training step
-            train_metrics = self.train_step(training_data)
+            train_metrics = self.train_step(train_arrays)
             history['train_loss'].append(train_metrics['loss'])
             history['train_mae'].append(train_metrics['mae'])
             
             # Validation
             if validation_data:
-                val_predictions = np.array([
-                    SkillMath.compute_q_score(ex.skill, self.weights)
-                    for ex in validation_data
-                ])
-                val_targets = np.array([ex.target_q for ex in validation_data])
-                val_loss = np.mean((val_predictions - val_targets) ** 2)
-                val_mae = np.mean(np.abs(val_predictions - val_targets))
-                
-                history['val_loss'].append(float(val_loss))
-                history['val_mae'].append(float(val_mae))
+                val_loss, val_mae = self.stream_metrics(validation_data)
+                history['val_loss'].append(val_loss)
+                history['val_mae'].append(val_mae)
                 
                 # Early stopping
                 if val_loss < best_val_loss:
@@ -430,6 +948,168 @@ class SkillWeightTrainer:
         self.training_history = history
         return history
     
+    def train_batch(self, skills: np.ndarray, targets: np.ndarray) -> Tuple[float, float]:
+        """
+        One momentum update on a mini-batch; returns the batch loss and MAE
+        before the update
+        """
+        weights_array = self.weights.to_array()
+        predictions = SkillMath.compute_q_scores(skills, self.weights.q_weights())
+        loss = self.compute_loss(predictions, targets, weights_array)
+        mae = np.mean(np.abs(predictions - targets))
+        
+        gradients = self.compute_gradients((skills, targets), weights_array)
+        self.velocity = self.momentum * self.velocity - self.learning_rate * gradients
+        weights_array += self.velocity
+        self.weights.from_array(weights_array)
+        return float(loss), float(mae)
+    
+    def stream_metrics(self, data: Union[ExampleData, 'ShardedLoader']) -> Tuple[float, float]:
+        """
+        MSE and MAE of the current weights, batch by batch for loaders
+        """
+        batches = data if isinstance(data, ShardedLoader) else [self.example_arrays(data)]
+        w = self.weights.q_weights()
+        squared = absolute = 0.0
+        count = 0
+        for skills, targets in batches:
+            errors = SkillMath.compute_q_scores(skills, w) - targets
+            squared += float(errors @ errors)
+            absolute += float(np.abs(errors).sum())
+            count += len(errors)
+        if count == 0:
+            return 0.0, 0.0
+        return squared / count, absolute / count
+    
+    def train_minibatch(
+        self,
+        training_data: Union[ExampleData, 'ShardedLoader'],
+        validation_data: Optional[Union[ExampleData, 'ShardedLoader']] = None,
+        epochs: int = 10,
+        batch_size: int = 4096,
+        early_stopping_patience: int = 10,
+        verbose: bool = True,
+        seed: Optional[int] = None
+    ) -> Dict[str, List]:
+        """
+        Mini-batch training loop
+        
+        training_data may be a ShardedLoader streaming on-disk shards (its own
+        batch size applies) or in-memory data, which is batched here.
+        validation_data may also be a loader; early stopping then runs on
+        that held-out stream. History entries are per epoch, with train
+        metrics averaged over the epoch's batches.
+        """
+        if isinstance(training_data, ShardedLoader):
+            loader = training_data
+        else:
+            loader = ShardedLoader([as_skill_bank(training_data)], batch_size=batch_size, seed=seed)
+        if validation_data is not None and not isinstance(validation_data, ShardedLoader):
+            validation_data = self.example_arrays(validation_data)
+        
+        best_val_loss = float('inf')
+        patience_counter = 0
+        
+        history = {
+            'train_loss': [],
+            'train_mae': [],
+            'val_loss': [],
+            'val_mae': []
+        }
+        
+        for epoch in range(epochs):
+            loss_sum = mae_sum = 0.0
+            seen = 0
+            for skills, targets in loader:
+                loss, mae = self.train_batch(skills, targets)
+                loss_sum += loss * len(targets)
+                mae_sum += mae * len(targets)
+                seen += len(targets)
+            train_loss = loss_sum / seen if seen else 0.0
+            train_mae = mae_sum / seen if seen else 0.0
+            history['train_loss'].append(train_loss)
+            history['train_mae'].append(train_mae)
+            
+            if validation_data is not None:
+                val_loss, val_mae = self.stream_metrics(validation_data)
+                history['val_loss'].append(val_loss)
+                history['val_mae'].append(val_mae)
+                
+                # Early stopping
+                if val_loss < best_val_loss:
+                    best_val_loss = val_loss
+                    patience_counter = 0
+                else:
+                    patience_counter += 1
+                
+                if patience_counter >= early_stopping_patience:
+                    if verbose:
+                        print(f"Early stopping at epoch {epoch + 1}")
+                    break
+            
+            if verbose:
+                print(f"Epoch {epoch + 1}/{epochs} ({len(loader)} batches)")
+                print(f"  Train Loss: {train_loss:.6f}, MAE: {train_mae:.6f}")
+                if validation_data is not None:
+                    print(f"  Val Loss: {val_loss:.6f}, MAE: {val_mae:.6f}")
+                print()
+        
+        self.training_history = history
+        return history
+    
+    def fit_least_squares(
+        self,
+        training_data: Union[ExampleData, 'ShardedLoader'],
+        validation_data: Optional[Union[ExampleData, 'ShardedLoader']] = None,
+        ridge: Optional[float] = None,
+        verbose: bool = True
+    ) -> Dict[str, List]:
+        """
+        Fit the eight dimension weights in one shot
+        
+        With skills in [0, 1] and weights on the simplex every Q-score lies in
+        [0, 1], so the clip never binds and the fit is exactly a
+        simplex-constrained least-squares problem. XᵀX and Xᵀy are
+        accumulated in one pass (streamed for loaders) and solved with
+        solve_simplex_least_squares. The other parameters are left as they
+        are. ridge defaults to weight_decay.
+        
+        The history has one entry per metric; a second pass over the training
+        data gives the train MAE. Solver details (iterations, zero weights)
+        go to self.fit_info.
+        """
+        stats = NormalEquations.from_data(training_data)
+        ridge = self.weight_decay if ridge is None else ridge
+        w, info = solve_simplex_least_squares(stats.xtx, stats.xty, stats.n, ridge)
+        
+        weights_array = self.weights.to_array()
+        weights_array[:8] = w
+        self.weights.from_array(weights_array)
+        self.velocity = np.zeros(13)
+        
+        train_loss = stats.mse(w) + self.weight_decay * float(np.sum(weights_array ** 2))
+        _, train_mae = self.stream_metrics(training_data)
+        history = {
+            'train_loss': [train_loss],
+            'train_mae': [train_mae],
+            'val_loss': [],
+            'val_mae': []
+        }
+        self.fit_info = {'solver': 'least_squares', 'examples': stats.n, 'ridge': ridge, **info}
+        if validation_data is not None:
+            val_loss, val_mae = self.stream_metrics(validation_data)
+            history['val_loss'].append(val_loss)
+            history['val_mae'].append(val_mae)
+        if verbose:
+            print(f"Least squares: {stats.n} examples, {info['iterations']} active-set iterations, "
+                  f"zero weights: {info['active']}")
+            print(f"  Train Loss: {train_loss:.6f}, MAE: {train_mae:.6f}")
+            if validation_data is not None:
+                print(f"  Val Loss: {history['val_loss'][0]:.6f}, MAE: {history['val_mae'][0]:.6f}")
+        
+        self.training_history = history
+        return history
+    
     def save_weights(self, filepath: str):
         """Save trained weights"""
         data = {
@@ -524,6 +1204,39 @@ class SyntheticDataGenerator:
         
         return examples
     
+    @staticmethod
+    def generate_training_bank(
+        n_examples: int = 100,
+        noise_level: float = 0.05,
+        path: Optional[str] = None,
+        chunk_size: int = 1_000_000
+    ) -> SkillBank:
+        """
+        generate_training_set drawn straight into a SkillBank, chunk by chunk
+        (memory-mapped under `path` when given)
+        """
+        true_weights = WeightConfig().q_weights()
+        qualities = ['high', 'medium', 'low']
+        base = np.array([0.8, 0.6, 0.4])
+        variance = np.array([0.15, 0.2, 0.2])
+        
+        bank = SkillBank.allocate(n_examples, path)
+        bank.context_labels = [f"synthetic_{q}" for q in qualities]
+        for start in range(0, n_examples, chunk_size):
+            stop = min(start + chunk_size, n_examples)
+            quality = np.random.choice(3, size=stop - start, p=[0.2, 0.6, 0.2])
+            low = (base - variance)[quality, None]
+            high = (base + variance)[quality, None]
+            skills = np.clip(np.random.uniform(low, high, (stop - start, 8)), 0.0, 1.0)
+            true_q = SkillMath.compute_q_scores(skills, true_weights)
+            noisy_q = np.clip(true_q + np.random.normal(0, noise_level, stop - start), 0.0, 1.0)
+            bank.skills[start:stop] = skills
+            bank.targets[start:stop] = noisy_q
+            bank.context_codes[start:stop] = quality
+        if path is not None:
+            bank.save_meta(path)
+        return bank
+    
     @staticmethod
     def generate_emergence_examples(
         n_examples: int = 50
@@ -560,16 +1273,13 @@ class SkillEvaluator:
     @staticmethod
     def evaluate(
         trainer: SkillWeightTrainer,
-        test_data: List[TrainingExample]
+        test_data: ExampleData
     ) -> Dict[str, float]:
         """
         Evaluate on test set
         """
-        predictions = np.array([
-            SkillMath.compute_q_score(ex.skill, trainer.weights)
-            for ex in test_data
-        ])
-        targets = np.array([ex.target_q for ex in test_data])
+        skills, targets = SkillWeightTrainer.example_arrays(test_data)
+        predictions = SkillMath.compute_q_scores(skills, trainer.weights.q_weights())
         
         mse = np.mean((predictions - targets) ** 2)
         mae = np.mean(np.abs(predictions - targets))
@@ -585,7 +1295,7 @@ class SkillEvaluator:
             'mae': float(mae),
             'rmse': float(rmse),
             'r2': float(r2),
-            'n_samples': len(test_data)
+            'n_samples': len(targets)
         }
     
     @staticmethod
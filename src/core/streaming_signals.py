@@ -0,0 +1,334 @@
+"""
+Streaming Signal Engine
+Stateful indicators that consume one bar at a time and update in O(1),
+so the live feed no longer re-scans the full price history on every tick.
+
+Each indicator mirrors its batch counterpart in `signals.py` and returns the
+same value the batch function would return for the history seen so far.
+"""
+
+import copy
+import numpy as np
+from collections import deque
+from typing import Dict, Optional
+from .signals import (
+    IndicatorSnapshot, signal_from_snapshot, confidence_from_snapshot,
+    get_timeframe_periods, load_weights,
+    _wilder_seed, _wilder_last, _split_deltas, _rsi_from_averages
+)
+
+
+class RollingMA:
+    """Simple moving average over the last `period` values (see `calculate_ma`)."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self._since_resync = 0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+
+        # Re-sum the window once per period to stop floating point drift
+        self._since_resync += 1
+        if self._since_resync >= self.period:
+            self.total = float(np.sum(self.window))
+            self._since_resync = 0
+        return self.value
+
+    def load(self, values):
+        """Initialise from a history in bulk instead of bar by bar."""
+        self.window = deque(values[-self.period:], maxlen=self.period)
+        self.total = float(np.sum(self.window)) if self.window else 0.0
+        self._since_resync = 0
+
+    def copy(self) -> 'RollingMA':
+        clone = copy.copy(self)
+        clone.window = deque(self.window, maxlen=self.period)
+        return clone
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self.window) < self.period:
+            return None
+        return self.total / self.period
+
+    @property
+    def partial_mean(self) -> Optional[float]:
+        """Mean of the values seen so far, even before the window is full."""
+        if not self.window:
+            return None
+        return self.total / len(self.window)
+
+
+class StreamingEMA:
+    """Exponential moving average seeded with the first SMA (see `calculate_ema`)."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.seed = []
+        self.ema = None
+
+    def update(self, value: float) -> Optional[float]:
+        if self.ema is None:
+            self.seed.append(value)
+            if len(self.seed) == self.period:
+                self.ema = np.mean(self.seed)
+                self.seed = []
+        else:
+            self.ema = value * self.multiplier + self.ema * (1 - self.multiplier)
+        return self.ema
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.ema
+
+
+class WilderRSI:
+    """
+    Wilder RSI following the same seeding and smoothing as `calculate_rsi`.
+
+    The batch version seeds its averages from the first `period + 1` deltas
+    (only `period` are available when exactly `period + 1` prices exist) and then
+    replays smoothing from delta `period - 1` onwards. The first deltas are
+    buffered until that seed is fixed; afterwards each bar costs O(1).
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_price = None
+        self.seed_deltas = []
+        self.up = None
+        self.down = None
+        self._value = 50.0  # Neutral until enough history
+
+    def _smooth(self, up: float, down: float, delta: float):
+        if delta > 0:
+            upval = delta
+            downval = 0.
+        else:
+            upval = 0.
+            downval = -delta
+        up = (up * (self.period - 1) + upval) / self.period
+        down = (down * (self.period - 1) + downval) / self.period
+        return up, down
+
+    def _seed(self, deltas):
+        seed = np.array(deltas)
+        up = seed[seed >= 0].sum() / self.period
+        down = -seed[seed < 0].sum() / self.period
+        return up, down
+
+    @staticmethod
+    def _to_rsi(up: float, down: float) -> float:
+        rs = up / down if down != 0 else 100
+        return 100. - 100. / (1. + rs)
+
+    def update(self, price: float) -> float:
+        if self.prev_price is None:
+            self.prev_price = price
+            return self._value
+        delta = price - self.prev_price
+        self.prev_price = price
+        period = self.period
+
+        if self.up is not None:
+            self.up, self.down = self._smooth(self.up, self.down, delta)
+            self._value = self._to_rsi(self.up, self.down)
+            return self._value
+
+        self.seed_deltas.append(delta)
+        n_deltas = len(self.seed_deltas)
+        if n_deltas == period:
+            # Exactly period + 1 prices: seed from the `period` deltas available
+            up, down = self._seed(self.seed_deltas)
+            up, down = self._smooth(up, down, self.seed_deltas[period - 1])
+            self._value = self._to_rsi(up, down)
+        elif n_deltas == period + 1:
+            up, down = self._seed(self.seed_deltas)
+            for d in self.seed_deltas[period - 1:]:
+                up, down = self._smooth(up, down, d)
+            self.up, self.down = up, down
+            self.seed_deltas = []
+            self._value = self._to_rsi(up, down)
+        return self._value
+
+    def load(self, prices):
+        """Initialise from a history in bulk; the smoothing is one vectorized pass."""
+        prices = np.asarray(prices, dtype=float)
+        period = self.period
+        if len(prices) < period + 2:
+            for price in prices:
+                self.update(price)
+            return
+        deltas = np.diff(prices)
+        up, down = _wilder_seed(deltas[:period + 1], period)
+        gains, losses = _split_deltas(deltas[period - 1:])
+        self.up = float(_wilder_last(gains, up, period))
+        self.down = float(_wilder_last(losses, down, period))
+        self.prev_price = float(prices[-1])
+        self.seed_deltas = []
+        self._value = float(_rsi_from_averages(self.up, self.down))
+
+    def copy(self) -> 'WilderRSI':
+        clone = copy.copy(self)
+        clone.seed_deltas = list(self.seed_deltas)
+        return clone
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class StreamingMomentum:
+    """Percent change versus the price `period - 1` bars back (see `calculate_momentum`)."""
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self.window = deque(maxlen=period)
+
+    def update(self, price: float) -> float:
+        self.window.append(price)
+        return self.value
+
+    def load(self, prices):
+        """Initialise from a history in bulk."""
+        self.window = deque(prices[-self.period:], maxlen=self.period)
+
+    def copy(self) -> 'StreamingMomentum':
+        clone = copy.copy(self)
+        clone.window = deque(self.window, maxlen=self.period)
+        return clone
+
+    @property
+    def value(self) -> float:
+        if len(self.window) < self.period:
+            return 0.0
+        base = self.window[0]
+        return ((self.window[-1] - base) / base) * 100
+
+
+class StreamingSignalEngine:
+    """
+    Incremental equivalent of `generate_signal` / `get_signal_confidence`
+    for a single timeframe.
+
+    Usage:
+        engine = StreamingSignalEngine('daily')
+        for price, volume in feed:
+            signal = engine.update(price, volume)
+    """
+
+    def __init__(self, timeframe: str, weights: Optional[Dict] = None, rsi_period: int = 14):
+        if weights is None:
+            weights = load_weights()
+        self.timeframe = timeframe
+        self.weights = weights
+        self.short_period, self.long_period = get_timeframe_periods(timeframe)
+
+        self.ma_short = RollingMA(self.short_period)
+        self.ma_long = RollingMA(self.long_period)
+        self.rsi = WilderRSI(rsi_period)
+        self.momentum = StreamingMomentum(min(10, self.short_period))
+        # Batch code averages `volumes[-long_period:]`, i.e. whatever is available
+        self.volume_mean = RollingMA(self.long_period)
+
+        # Last 10 prices (or all, if fewer) for the SL/TP trend strength
+        self.trend_window = deque(maxlen=10)
+
+        self.n_bars = 0
+        self.last_price = None
+        self.last_volume = None
+
+    @classmethod
+    def from_history(
+        cls,
+        prices,
+        volumes,
+        timeframe: str,
+        weights: Optional[Dict] = None,
+        rsi: Optional[WilderRSI] = None
+    ) -> 'StreamingSignalEngine':
+        """
+        Build an engine already positioned at the end of an existing history.
+        Costs one vectorized pass instead of replaying every bar.
+
+        Args:
+            rsi: RSI state loaded from the same prices; it does not depend on
+                 the timeframe, so several engines can share one load
+        """
+        engine = cls(timeframe, weights)
+        if rsi is None:
+            engine.rsi.load(prices)
+        else:
+            engine.rsi = copy.deepcopy(rsi)
+        engine.ma_short.load(prices)
+        engine.ma_long.load(prices)
+        engine.momentum.load(prices)
+        engine.volume_mean.load(volumes)
+        engine.trend_window = deque(prices[-10:], maxlen=10)
+        engine.n_bars = len(prices)
+        if engine.n_bars:
+            engine.last_price = prices[-1]
+            engine.last_volume = volumes[-1]
+        return engine
+
+    def copy(self) -> 'StreamingSignalEngine':
+        """Independent copy of the indicator state (the weights dict is shared)."""
+        clone = copy.copy(self)
+        clone.ma_short = self.ma_short.copy()
+        clone.ma_long = self.ma_long.copy()
+        clone.rsi = self.rsi.copy()
+        clone.momentum = self.momentum.copy()
+        clone.volume_mean = self.volume_mean.copy()
+        clone.trend_window = deque(self.trend_window, maxlen=10)
+        return clone
+
+    def update(self, price: float, volume: float) -> str:
+        """Consume one bar and return the current Buy/Sell/Hold signal."""
+        self.ma_short.update(price)
+        self.ma_long.update(price)
+        self.rsi.update(price)
+        self.momentum.update(price)
+        self.volume_mean.update(volume)
+        self.trend_window.append(price)
+        self.n_bars += 1
+        self.last_price = price
+        self.last_volume = volume
+        return self.signal()
+
+    def snapshot(self) -> IndicatorSnapshot:
+        """Current indicator values in the form `compute_snapshot` returns."""
+        if len(self.trend_window) > 1:
+            base = self.trend_window[0]
+            trend_strength = ((self.trend_window[-1] - base) / base) * 100
+        else:
+            trend_strength = 0
+        return IndicatorSnapshot(
+            timeframe=self.timeframe,
+            short_period=self.short_period,
+            long_period=self.long_period,
+            n_prices=self.n_bars,
+            n_volumes=self.n_bars,
+            last_price=self.last_price,
+            ma_short=self.ma_short.value,
+            ma_long=self.ma_long.value,
+            rsi=self.rsi.value,
+            momentum=self.momentum.value,
+            trend_strength=trend_strength,
+            avg_volume=self.volume_mean.partial_mean or 0.0,
+            current_volume=self.last_volume if self.last_volume is not None else 0.0
+        )
+
+    def signal(self) -> str:
+        """Signal for the bars consumed so far (matches `generate_signal`)."""
+        return signal_from_snapshot(self.snapshot(), self.weights)
+
+    def confidence(self) -> Dict[str, float]:
+        """Confidence for the bars consumed so far (matches `get_signal_confidence`)."""
+        return confidence_from_snapshot(self.snapshot(), self.weights)
@@ -0,0 +1,294 @@
+"""
+Columnar Trade Log
+Stores a run's closed trades column by column on disk: one raw binary file
+per column plus a meta.json, in a directory per run.
+
+Appending writes to the end of each column file and then bumps the trade
+count in meta.json, so a crash mid-append leaves the log at its previous
+length. Reading maps the files with np.memmap, so filters and aggregates
+touch only the columns (and pages) they need and large logs are never
+loaded as a whole.
+"""
+
+import json
+import os
+import numpy as np
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+from .backtest_engine import TradeColumns, ExitReason
+from .metrics import MetricsAccumulator
+
+# Column name -> on-disk dtype (little-endian, fixed width)
+SCHEMA = {
+    'entry_idx': '<i8',
+    'exit_idx': '<i8',
+    'entry_price': '<f8',
+    'exit_price': '<f8',
+    'pnl': '<f8',
+    'reason': '<i1',      # ExitReason codes
+    'confidence': '<f4',  # Overall confidence at entry
+    'symbol': '<i4'       # Symbol index (0 for single-asset runs)
+}
+
+META_FILE = 'meta.json'
+
+# Rows per chunk when streaming aggregates over the whole log
+_CHUNK_ROWS = 1 << 20
+
+
+class TradeLog:
+    """Append-only, memory-mapped trade store for one backtest run."""
+
+    def __init__(self, path: str):
+        """Open an existing log (see TradeLog.create for a new one)."""
+        self.path = path
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No trade log at {path}")
+        with open(meta_path, 'r') as f:
+            self.meta = json.load(f)
+        if self.meta.get('schema') != SCHEMA:
+            raise ValueError(f"Trade log at {path} has an incompatible schema")
+        self._maps: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def create(cls, path: str, info: Optional[Dict] = None, overwrite: bool = False) -> 'TradeLog':
+        """
+        Create an empty log.
+
+        Args:
+            info: JSON-serializable run details kept in meta.json (timeframe,
+                params, symbols, ...)
+            overwrite: Replace an existing log at `path`
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, META_FILE)) and not overwrite:
+            raise FileExistsError(f"Trade log already exists at {path}")
+        for name in SCHEMA:
+            open(os.path.join(path, f"{name}.bin"), 'wb').close()
+        meta = {
+            'schema': SCHEMA,
+            'count': 0,
+            'created': datetime.now().isoformat(),
+            'info': info or {}
+        }
+        _write_meta(path, meta)
+        return cls(path)
+
+    @classmethod
+    def from_trades(
+        cls,
+        path: str,
+        trades: TradeColumns,
+        info: Optional[Dict] = None,
+        overwrite: bool = False
+    ) -> 'TradeLog':
+        """Create a log holding `trades`."""
+        log = cls.create(path, info, overwrite)
+        log.append(trades)
+        return log
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    @property
+    def info(self) -> Dict:
+        return self.meta['info']
+
+    def append(self, trades: TradeColumns, symbol: Optional[int] = None):
+        """
+        Add closed trades at the end of the log.
+
+        Args:
+            trades: TradeColumns (or PortfolioTrades, whose symbol column is kept)
+            symbol: Symbol index for every trade when `trades` has no symbol column
+        """
+        n = len(trades)
+        if n == 0:
+            return
+        self._maps.clear()  # Release the mappings before the files grow
+        if hasattr(trades, 'symbol'):
+            symbols = trades.symbol
+        else:
+            symbols = np.full(n, 0 if symbol is None else symbol)
+        columns = {name: getattr(trades, name) for name in SCHEMA if name != 'symbol'}
+        columns['symbol'] = symbols
+
+        for name, dtype in SCHEMA.items():
+            values = np.ascontiguousarray(columns[name], dtype=dtype)
+            if len(values) != n:
+                raise ValueError(f"Column {name} has {len(values)} rows, expected {n}")
+            file_path = self._file(name)
+            with open(file_path, 'r+b') as f:
+                # Drop bytes left past `count` by an interrupted append
+                f.truncate(len(self) * np.dtype(dtype).itemsize)
+                f.seek(0, os.SEEK_END)
+                values.tofile(f)
+
+        self.meta['count'] += n
+        _write_meta(self.path, self.meta)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memory-mapped view of one column."""
+        if name not in SCHEMA:
+            raise KeyError(f"Unknown column: {name}")
+        mapped = self._maps.get(name)
+        if mapped is None:
+            if len(self) == 0:
+                mapped = np.zeros(0, dtype=SCHEMA[name])
+            else:
+                mapped = np.memmap(self._file(name), dtype=SCHEMA[name], mode='r', shape=(len(self),))
+            self._maps[name] = mapped
+        return mapped
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def mask(
+        self,
+        reason: Optional[Sequence[ExitReason]] = None,
+        symbol: Optional[Sequence[int]] = None,
+        entry_from: Optional[int] = None,
+        entry_to: Optional[int] = None,
+        min_pnl: Optional[float] = None,
+        max_pnl: Optional[float] = None,
+        min_confidence: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Boolean row mask for the given conditions (all must hold).
+
+        Args:
+            reason: Exit reasons to keep
+            symbol: Symbol indices to keep
+            entry_from, entry_to: Entry bar range [entry_from, entry_to)
+            min_pnl, max_pnl: Inclusive P&L bounds
+            min_confidence: Entry confidence at least this
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if reason is not None:
+            keep &= np.isin(self.column('reason'), np.asarray(reason, dtype=np.int8))
+        if symbol is not None:
+            keep &= np.isin(self.column('symbol'), np.asarray(symbol))
+        if entry_from is not None:
+            keep &= self.column('entry_idx') >= entry_from
+        if entry_to is not None:
+            keep &= self.column('entry_idx') < entry_to
+        if min_pnl is not None:
+            keep &= self.column('pnl') >= min_pnl
+        if max_pnl is not None:
+            keep &= self.column('pnl') <= max_pnl
+        if min_confidence is not None:
+            keep &= self.column('confidence') >= min_confidence
+        return keep
+
+    def select(self, mask: Optional[np.ndarray] = None, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Rows of the chosen columns as in-memory arrays."""
+        columns = list(SCHEMA) if columns is None else columns
+        if mask is None:
+            return {name: np.array(self.column(name)) for name in columns}
+        return {name: self.column(name)[mask] for name in columns}
+
+    def to_trades(self, mask: Optional[np.ndarray] = None) -> TradeColumns:
+        """Rows as TradeColumns, e.g. to feed simulate() consumers or to_records()."""
+        rows = self.select(mask, [name for name in SCHEMA if name != 'symbol'])
+        rows['reason'] = rows['reason'].astype(np.int8)
+        rows['confidence'] = rows['confidence'].astype(float)
+        return TradeColumns(**rows)
+
+    def metrics(self, mask: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """
+        calculate_advanced_metrics over the (masked) trades in log order,
+        streamed through the P&L column in chunks.
+        """
+        pnl = self.column('pnl')
+        acc = MetricsAccumulator()
+        for start in range(0, len(pnl), _CHUNK_ROWS):
+            chunk = pnl[start:start + _CHUNK_ROWS]
+            if mask is not None:
+                chunk = chunk[mask[start:start + _CHUNK_ROWS]]
+            acc.update_many(np.asarray(chunk, dtype=float))
+        return acc.to_dict()
+
+    def aggregate(self, by: str = 'reason', mask: Optional[np.ndarray] = None) -> Dict:
+        """
+        Count, total/mean P&L and win rate per group.
+
+        Args:
+            by: 'reason' (keys are ExitReason labels) or 'symbol' (symbol
+                indices, or names when meta info has 'symbols')
+        """
+        if by not in ('reason', 'symbol'):
+            raise ValueError("by must be 'reason' or 'symbol'")
+        keys = np.asarray(self.column(by), dtype=np.int64)
+        pnl = np.asarray(self.column('pnl'))
+        if mask is not None:
+            keys, pnl = keys[mask], pnl[mask]
+        if len(keys) == 0:
+            return {}
+        counts = np.bincount(keys)
+        totals = np.bincount(keys, weights=pnl)
+        wins = np.bincount(keys, weights=pnl > 0)
+
+        names = self.info.get('symbols')
+        groups = {}
+        for key in np.flatnonzero(counts):
+            if by == 'reason':
+                label = ExitReason(int(key)).label
+            else:
+                label = names[key] if names else int(key)
+            groups[label] = {
+                'count': int(counts[key]),
+                'total_pnl': float(totals[key]),
+                'mean_pnl': float(totals[key] / counts[key]),
+                'win_rate': float(wins[key] / counts[key] * 100)
+            }
+        return groups
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+
+def _write_meta(path: str, meta: Dict):
+    # Replace atomically so readers never see a half-written count
+    tmp_path = os.path.join(path, META_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, META_FILE))
+
+
+if __name__ == '__main__':
+    import tempfile
+    import time
+    from .backtest_engine import precompute_arrays, simulate
+    from .metrics import calculate_advanced_metrics
+
+    np.random.seed(18)
+    n_bars = 200000
+    prices = 60000 * np.cumprod(1 + np.random.normal(0, 0.02, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e10
+    arrays = precompute_arrays(prices, volumes, 'scalping')
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'run-scalping')
+        log = TradeLog.create(path, info={'timeframe': 'scalping'})
+        # Append in four slices, as a live run would
+        start = time.perf_counter()
+        for lo in range(50, n_bars, n_bars // 4):
+            log.append(simulate(arrays, lo, lo + n_bars // 4))
+        write_ms = (time.perf_counter() - start) * 1000
+
+        reopened = TradeLog(path)
+        start = time.perf_counter()
+        stops = reopened.mask(reason=[ExitReason.STOP_LOSS], min_confidence=50)
+        by_reason = reopened.aggregate('reason')
+        metrics = reopened.metrics()
+        read_ms = (time.perf_counter() - start) * 1000
+
+        direct = calculate_advanced_metrics(reopened.select(columns=['pnl'])['pnl'], None)
+        print(f"{len(reopened)} trades: append {write_ms:.1f} ms, filter+aggregate {read_ms:.1f} ms")
+        print(f"Stop-loss exits with confidence >= 50: {int(stops.sum())}")
+        for label, group in by_reason.items():
+            print(f"  {label:13} {group['count']:6d} trades, mean {group['mean_pnl'] * 100:+.3f}%, "
+                  f"win rate {group['win_rate']:.1f}%")
+        same = abs(metrics['sharpe'] - direct['sharpe']) < 1e-9 and metrics['count'] == direct['count']
+        print(f"Streamed metrics match: {'OK' if same else 'MISMATCH'}")
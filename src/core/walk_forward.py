@@ -0,0 +1,206 @@
+"""
+Walk-Forward Optimization
+Tunes SignalParams on each train window and scores the chosen configuration
+on the test window that follows it, over rolling or anchored windows.
+
+All indicators are causal (bar i only sees bars <= i), so each
+configuration's arrays are computed once on the full series and every
+window just simulates its own [start, stop) slice; bars before a window
+serve as indicator warm-up. Configurations are spread over a process pool
+attached to one shared-memory copy of the data, and each worker evaluates
+all windows for its configurations in one go, returning a
+MetricsAccumulator per test window rather than its trades.
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from .signals import load_weights, SignalParams
+from .metrics import calculate_advanced_metrics, MetricsAccumulator
+from .param_sweep import SharedSeries, attach_shared, worker_arrays, evaluate_window
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Bar ranges [start, stop) of one train/test pair."""
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+
+def build_windows(
+    n_bars: int,
+    train_size: int,
+    test_size: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+    start: int = 50
+) -> List[WalkForwardWindow]:
+    """
+    Consecutive train/test windows.
+
+    Args:
+        n_bars: Series length
+        train_size: Bars in each train window (the first one when anchored)
+        test_size: Bars in each test window
+        step: Bars between windows (default: test_size, so tests tile the data)
+        anchored: Every train window starts at `start` and grows
+        start: First tradable bar (earlier bars are indicator warm-up)
+    """
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("train_size and test_size must be positive")
+    step = step or test_size
+    windows = []
+    offset = start
+    while offset + train_size + test_size <= n_bars:
+        train_stop = offset + train_size
+        windows.append(WalkForwardWindow(
+            train_start=start if anchored else offset,
+            train_stop=train_stop,
+            test_start=train_stop,
+            test_stop=train_stop + test_size
+        ))
+        offset += step
+    return windows
+
+
+def _score(pnl: np.ndarray, objective: str, min_trades: int) -> float:
+    if len(pnl) < min_trades:
+        return -np.inf
+    return calculate_advanced_metrics(pnl, None)[objective]
+
+
+def _run_windows_chunk(
+    configs: List[Tuple[int, SignalParams]],
+    windows: List[WalkForwardWindow],
+    objective: str,
+    min_trades: int
+) -> List[Dict]:
+    """Train scores and test accumulators of every window for each config."""
+    results = []
+    for index, params in configs:
+        arrays = worker_arrays(params)
+        train_scores, test_metrics = [], []
+        for window in windows:
+            train = evaluate_window(params, window.train_start, window.train_stop, arrays)
+            test = evaluate_window(params, window.test_start, window.test_stop, arrays)
+            train_scores.append(_score(train.pnl, objective, min_trades))
+            test_metrics.append(MetricsAccumulator.from_trades(test.pnl))
+        results.append({'index': index, 'params': params, 'train_scores': train_scores, 'test': test_metrics})
+    return results
+
+
+def run_walk_forward(
+    prices,
+    volumes,
+    configs: Sequence[SignalParams],
+    windows: Sequence[WalkForwardWindow],
+    timeframe: str = 'daily',
+    weights: Optional[Dict] = None,
+    objective: str = 'sharpe',
+    min_trades: int = 5,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    bars: Optional[Dict[str, Sequence]] = None,
+    ambiguous: str = 'stop_first'
+) -> Dict:
+    """
+    Walk-forward optimization over the given windows.
+
+    Args:
+        configs: Candidate configurations (e.g. from param_sweep.grid_space)
+        objective: calculate_advanced_metrics key maximized on each train window
+        min_trades: Train windows with fewer trades never select a config
+        bars: Optional 'open'/'high'/'low' arrays for intrabar SL/TP
+        ambiguous: Rule for bars touching both SL and TP (see backtest_engine)
+
+    Returns:
+        Dict with:
+        - windows: per window, its bounds, the chosen params, train score
+          and test metrics
+        - out_of_sample: metrics over all test trades chained together
+    """
+    if weights is None:
+        weights = load_weights()
+    configs = list(configs)
+    windows = list(windows)
+    if not configs or not windows:
+        raise ValueError("need at least one configuration and one window")
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    ordered = sorted(enumerate(configs), key=lambda item: item[1].periods(timeframe))
+    if chunk_size is None:
+        chunk_size = max(1, min(64, len(ordered) // (max_workers * 4)))
+    chunks = [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+
+    evaluated = []
+    with SharedSeries(prices, volumes, bars) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=attach_shared,
+            initargs=(shared.name, shared.shape, shared.columns, timeframe, weights, 50, ambiguous)
+        ) as pool:
+            futures = [pool.submit(_run_windows_chunk, chunk, windows, objective, min_trades) for chunk in chunks]
+            for future in as_completed(futures):
+                evaluated.extend(future.result())
+
+    # Back to the caller's config order so ties resolve deterministically
+    evaluated.sort(key=lambda r: r['index'])
+    train_scores = np.array([r['train_scores'] for r in evaluated])  # (configs x windows)
+
+    window_rows = []
+    out_of_sample = MetricsAccumulator()
+    for w, window in enumerate(windows):
+        best = int(np.argmax(train_scores[:, w]))
+        if not np.isfinite(train_scores[best, w]):
+            window_rows.append({'window': window, 'params': None, 'train_score': None,
+                                'test': calculate_advanced_metrics([], None)})
+            continue
+        test = evaluated[best]['test'][w]
+        out_of_sample = out_of_sample.merge(test)
+        window_rows.append({
+            'window': window,
+            'params': evaluated[best]['params'],
+            'train_score': float(train_scores[best, w]),
+            'test': test.to_dict()
+        })
+
+    return {
+        'windows': window_rows,
+        'out_of_sample': out_of_sample.to_dict(),
+        'configs': len(configs)
+    }
+
+
+if __name__ == '__main__':
+    import time
+    from .param_sweep import grid_space
+
+    np.random.seed(13)
+    n_bars = 50000
+    prices = 60000 * np.cumprod(1 + np.random.normal(0, 0.02, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e10
+
+    configs = grid_space({
+        'short_period': [5, 7, 10],
+        'long_period': [20, 30, 50],
+        'entry_confidence': [30, 40, 50],
+        'risk_percent': [0.01, 0.02]
+    }, timeframe='4h')
+    for anchored in (False, True):
+        windows = build_windows(n_bars, train_size=10000, test_size=5000, anchored=anchored)
+        start = time.perf_counter()
+        report = run_walk_forward(prices, volumes, configs, windows, timeframe='4h')
+        elapsed = time.perf_counter() - start
+        kind = 'anchored' if anchored else 'rolling'
+        oos = report['out_of_sample']
+        print(f"{kind}: {len(windows)} windows x {len(configs)} configs in {elapsed:.2f}s, "
+              f"OOS Sharpe {oos['sharpe']:.2f}, ROI {oos['roi']:.1f}%, trades {oos['count']}")
+        for row in report['windows']:
+            w, p = row['window'], row['params']
+            chosen = f"MA {p.short_period}/{p.long_period}, entry>{p.entry_confidence}" if p else 'none'
+            print(f"  train [{w.train_start}, {w.train_stop}) test [{w.test_start}, {w.test_stop}): "
+                  f"{chosen}, test Sharpe {row['test']['sharpe']:.2f}")
@@ -0,0 +1,121 @@
+"""
+Trained Weights Registry
+Process-wide cache for data/trained_skill_weights.json.
+
+The weights file also carries the full training history, so parsing it on
+every signal request is expensive. The registry parses each file once, keeps
+only the 'weights' section and re-reads only when the file's mtime or size
+changes.
+"""
+
+import copy
+import itertools
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+DEFAULT_WEIGHTS_PATH = 'data/trained_skill_weights.json'
+
+# `save_weights` writes the 'weights' section first, so it can usually be
+# decoded from the head of the file without touching the training history
+_WEIGHTS_KEY = re.compile(r'\s*\{\s*"weights"\s*:\s*')
+_HEAD_BYTES = 64 * 1024
+_decoder = json.JSONDecoder()
+
+# Versions come from one process-wide counter that never goes back, so a
+# version is never reused, not even after invalidate() or across paths
+_versions = itertools.count(1)
+
+
+def _read_weights_section(path: str) -> Dict:
+    """Parse only the 'weights' object, falling back to a full parse."""
+    with open(path, 'r') as f:
+        text = f.read(_HEAD_BYTES)
+        match = _WEIGHTS_KEY.match(text)
+        if match:
+            try:
+                weights, _ = _decoder.raw_decode(text, match.end())
+                if isinstance(weights, dict):
+                    return weights
+            except ValueError:
+                pass  # Section spills past the head; read the rest below
+        text += f.read()
+
+    match = _WEIGHTS_KEY.match(text)
+    if match:
+        try:
+            weights, _ = _decoder.raw_decode(text, match.end())
+            if isinstance(weights, dict):
+                return weights
+        except ValueError:
+            pass
+    return json.loads(text).get('weights', {})
+
+
+class WeightsRegistry:
+    """Caches the weights section per file, invalidated on mtime/size change."""
+
+    def __init__(self):
+        self._entries = {}  # abspath -> (stamp, weights, version)
+        self._lock = threading.Lock()
+        self.parse_count = 0
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self, path: str):
+        key = os.path.abspath(path)
+        stamp = self._stamp(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                return entry
+            if stamp is None:
+                weights = {}  # Missing file: same as the original loader
+            else:
+                weights = _read_weights_section(key)
+                self.parse_count += 1
+            entry = (stamp, weights, next(_versions))
+            self._entries[key] = entry
+        return entry
+
+    def get(self, path: str = DEFAULT_WEIGHTS_PATH) -> Dict:
+        """Return a deep copy of the weights section for `path` ({} if missing)."""
+        return copy.deepcopy(self._refresh(path)[1])
+
+    def version(self, path: str = DEFAULT_WEIGHTS_PATH) -> int:
+        """Version of the cached content; a new, larger value on every reload."""
+        return self._refresh(path)[2]
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop cached entries (all of them if no path is given)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+_registry = WeightsRegistry()
+
+
+def get_registry() -> WeightsRegistry:
+    """Return the process-wide registry."""
+    return _registry
+
+
+def get_weights(path: str = DEFAULT_WEIGHTS_PATH) -> Dict:
+    """Cached equivalent of reading json.load(path)['weights']."""
+    return _registry.get(path)
+
+
+def get_weights_version(path: str = DEFAULT_WEIGHTS_PATH) -> int:
+    """Version of the cached weights for `path`."""
+    return _registry.version(path)
@@ -0,0 +1,319 @@
+"""
+Backtest engine tests: parity with the original per-bar loop and the
+intrabar SL/TP rules on hand-built bars.
+Run with pytest or directly: python tests/test_backtest_engine.py
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.signals import (
+    generate_signal, calculate_sl_tp, load_weights, get_signal_confidence, SIGNAL_BUY, SIGNAL_HOLD, SIGNAL_SELL
+)
+from src.core.metrics import calculate_advanced_metrics
+from src.core.backtest_engine import (
+    precompute_arrays, simulate, run_backtest_arrays, BacktestArrays, AMBIGUOUS_RULES, ExitReason
+)
+
+TIMEFRAMES = ['scalping', '1h', '4h', 'daily', 'weekly']
+DEMO_DATA = os.path.join(os.path.dirname(__file__), '..', 'kaggle_data', 'bitcoin_demo.csv')
+
+
+def reference_backtest(
+    df: pd.DataFrame,
+    timeframe: str,
+    min_history: int = 50,
+    intrabar: bool = False,
+    ambiguous: str = 'stop_first'
+) -> Dict:
+    """
+    Original per-bar backtest loop, kept as the parity reference.
+
+    Args:
+        df: DataFrame with 'Close' and 'Volume' columns ('High', 'Low' and
+            optionally 'Open' when intrabar is set)
+        timeframe: Trading timeframe
+        min_history: Minimum bars needed before first trade
+        intrabar: Decide SL/TP hits from each bar's High/Low instead of its close
+        ambiguous: Outcome of a bar touching both SL and TP (see AMBIGUOUS_RULES)
+
+    Returns:
+        Dictionary with backtest results and metrics; 'trade_details' lists
+        every trade with its entry/exit bar
+    """
+    prices = df['Close'].tolist()
+    volumes = df['Volume'].tolist()
+    highs = df['High'].tolist() if intrabar else prices
+    lows = df['Low'].tolist() if intrabar else prices
+    opens = df['Open'].tolist() if intrabar and 'Open' in df else None
+    weights = load_weights()
+
+    trades = []
+    equity_curve = [1.0]  # Starting equity normalized to 1
+    current_position = None
+    trade_details = []
+    signal_scores = []
+
+    def close_position(i, exit_price, reason):
+        pnl = (exit_price - current_position['entry']) / current_position['entry']
+        trades.append(pnl)
+        trade_details.append({
+            'entry_idx': current_position['entry_idx'],
+            'exit_idx': i,
+            'entry': current_position['entry'],
+            'exit': exit_price,
+            'pnl': pnl,
+            'reason': reason
+        })
+        equity_curve.append(equity_curve[-1] * (1 + pnl))
+
+    # Start trading after sufficient history
+    start_idx = max(min_history, 50)
+
+    for i in range(start_idx, len(df)):
+        current_price = prices[i]
+        hist_prices = prices[:i+1]
+        hist_volumes = volumes[:i+1]
+
+        # Get signal confidence
+        confidence = get_signal_confidence(hist_prices, hist_volumes, timeframe, weights)
+        signal_scores.append(confidence['overall'])
+
+        # Check existing position
+        if current_position:
+            sl, tp = current_position['sl'], current_position['tp']
+            stop_hit = lows[i] <= sl
+            target_hit = bool(tp) and highs[i] >= tp
+            if stop_hit and target_hit:
+                if ambiguous == 'target_first':
+                    stop_hit = False
+                elif ambiguous == 'open_nearest' and opens is not None:
+                    stop_hit = opens[i] - sl <= tp - opens[i]
+
+            # Check SL hit (a gap through the stop fills at the open)
+            if stop_hit:
+                close_position(i, min(sl, opens[i]) if opens is not None else sl, 'stop_loss')
+                current_position = None
+            # Check TP hit
+            elif target_hit:
+                close_position(i, max(tp, opens[i]) if opens is not None else tp, 'take_profit')
+                current_position = None
+            # Check exit signal
+            else:
+                sig = generate_signal(hist_prices, hist_volumes, timeframe, weights)
+                if sig == 'Sell' and confidence['overall'] > 30:  # Exit on strong sell signal
+                    close_position(i, current_price, 'signal_exit')
+                    current_position = None
+
+        # Look for entry (only if not in position and confidence high enough)
+        if not current_position and confidence['overall'] > 40:
+            sig = generate_signal(hist_prices, hist_volumes, timeframe, weights)
+            if sig == 'Buy':
+                momentum = ((prices[i] - prices[max(0, i-10)]) / prices[max(0, i-10)]) * 100
+                sl, tp = calculate_sl_tp(current_price, timeframe, trend_strength=momentum)
+                current_position = {
+                    'entry': current_price,
+                    'sl': sl,
+                    'tp': tp,
+                    'entry_idx': i,
+                    'confidence': confidence['overall']
+                }
+
+    # Close open position at end
+    if current_position:
+        close_position(len(df) - 1, prices[-1], 'end_of_period')
+
+    # Calculate metrics
+    metrics = calculate_advanced_metrics(trades, equity_curve)
+    metrics['avg_signal_confidence'] = float(np.mean(signal_scores)) if signal_scores else 0
+    metrics['trade_details'] = trade_details
+
+    return metrics
+
+
+def trade_mismatches(ref_trades, trades) -> int:
+    """Trades of simulate() (TradeColumns) that differ from the reference's details."""
+    if len(ref_trades) != len(trades):
+        return abs(len(ref_trades) - len(trades)) + 1
+    bad = 0
+    for ref, i in zip(ref_trades, range(len(trades))):
+        same = (
+            ref['entry_idx'] == trades.entry_idx[i]
+            and ref['exit_idx'] == trades.exit_idx[i]
+            and ref['reason'] == ExitReason(int(trades.reason[i])).label
+            and np.isclose(ref['entry'], trades.entry_price[i], rtol=1e-12, atol=0)
+            and np.isclose(ref['exit'], trades.exit_price[i], rtol=1e-12, atol=0)
+            and abs(ref['pnl'] - trades.pnl[i]) <= 1e-12
+        )
+        bad += not same
+    return bad
+
+
+def bar_arrays(df: pd.DataFrame, intrabar: bool = False) -> Dict[str, np.ndarray]:
+    """precompute_arrays keyword arguments for df's Open/High/Low (none when close-only)."""
+    if not intrabar:
+        return {}
+    columns = {'high': df['High'].to_numpy(), 'low': df['Low'].to_numpy()}
+    if 'Open' in df:
+        columns['open'] = df['Open'].to_numpy()
+    return columns
+
+
+def engine_roi(trades) -> float:
+    """ROI of simulate()'s trades, computed the way the reference does."""
+    equity_curve = np.concatenate(([1.0], np.cumprod(1 + trades.pnl)))
+    return calculate_advanced_metrics(trades.pnl, equity_curve)['roi']
+
+
+def random_walk(n_bars: int, seed: int, vol: float = 0.02) -> pd.DataFrame:
+    """Synthetic OHLCV bars from a log-normal random walk."""
+    rng = np.random.default_rng(seed)
+    close = 60000 * np.cumprod(1 + rng.normal(0, vol, n_bars))
+    open_ = np.concatenate(([close[0]], close[:-1])) * rng.uniform(1 - vol / 4, 1 + vol / 4, n_bars)
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * rng.uniform(1.0, 1 + 1.5 * vol, n_bars),
+        'Low': np.minimum(open_, close) * rng.uniform(1 - 1.5 * vol, 1.0, n_bars),
+        'Close': close,
+        'Volume': rng.lognormal(0, 0.6, n_bars) * 2e10
+    })
+
+
+def _assert_parity(df: pd.DataFrame, intrabar: bool = False, rules=('stop_first',)):
+    for tf in TIMEFRAMES:
+        arrays = precompute_arrays(df['Close'].to_numpy(), df['Volume'].to_numpy(), tf, **bar_arrays(df, intrabar))
+        for rule in rules:
+            ref = reference_backtest(df, tf, intrabar=intrabar, ambiguous=rule)
+            trades = simulate(arrays, 50, ambiguous=rule)
+            assert trade_mismatches(ref['trade_details'], trades) == 0, (tf, rule)
+            assert abs(engine_roi(trades) - ref['roi']) <= 1e-9, (tf, rule)
+
+
+def test_demo_data_matches_reference():
+    _assert_parity(pd.read_csv(DEMO_DATA))
+
+
+def test_random_walks_match_reference_close_only():
+    for seed in (11, 12):
+        _assert_parity(random_walk(1500, seed))
+
+
+def test_random_walks_match_reference_intrabar():
+    for seed in (11, 12):
+        _assert_parity(random_walk(1500, seed), intrabar=True, rules=AMBIGUOUS_RULES)
+
+
+def test_random_walks_match_reference_high_low_only():
+    for seed in (11, 12):
+        df = random_walk(1500, seed).drop(columns=['Open'])
+        _assert_parity(df, intrabar=True, rules=('open_nearest',))
+
+
+def test_zero_range_bars_reproduce_close_only():
+    df = random_walk(5000, 17)
+    close, volumes = df['Close'].to_numpy(), df['Volume'].to_numpy()
+    close_only = run_backtest_arrays(close, volumes, 'scalping')
+    degenerate = run_backtest_arrays(close, volumes, 'scalping', high=close, low=close)
+    assert close_only['count'] == degenerate['count'] > 0
+    assert abs(close_only['roi'] - degenerate['roi']) <= 1e-12
+
+
+def _one_trade(bar, tp: float = 110.0, with_open: bool = True, signal: int = SIGNAL_HOLD):
+    """
+    Enter at 100 on bar 0 (SL 95, TP `tp`), then bar 1 = (open, high, low, close)
+    and a flat bar 2. Returns simulate's fill price and reason per ambiguity rule.
+    """
+    bar_open, high, low, close = bar
+    arrays = BacktestArrays(
+        prices=np.array([100.0, close, close]),
+        signal=np.array([SIGNAL_BUY, signal, SIGNAL_HOLD], dtype=np.int8),
+        confidence=np.array([50.0, 50.0, 50.0]),
+        momentum=np.zeros(3),
+        stop_loss=np.array([95.0, 0.0, 0.0]),
+        take_profit=np.array([tp, np.nan, np.nan]),
+        high=np.array([100.0, high, close]),
+        low=np.array([100.0, low, close]),
+        open=np.array([100.0, bar_open, close]) if with_open else None
+    )
+    outcomes = {}
+    for rule in AMBIGUOUS_RULES:
+        trades = simulate(arrays, 0, ambiguous=rule)
+        assert len(trades) == 1 and trades.entry_idx[0] == 0 and trades.entry_price[0] == 100.0
+        outcomes[rule] = (float(trades.exit_price[0]), ExitReason(int(trades.reason[0])), int(trades.exit_idx[0]))
+    return outcomes
+
+
+def _same_for_every_rule(outcomes, expected):
+    assert all(outcome == expected for outcome in outcomes.values()), outcomes
+
+
+def test_intrabar_stop_or_target_fills_at_the_level():
+    _same_for_every_rule(_one_trade((99, 101, 94, 100)), (95.0, ExitReason.STOP_LOSS, 1))
+    _same_for_every_rule(_one_trade((100, 111, 99, 105)), (110.0, ExitReason.TAKE_PROFIT, 1))
+    # The close alone would not have reached either level
+    _same_for_every_rule(_one_trade((100, 112, 99, 101)), (110.0, ExitReason.TAKE_PROFIT, 1))
+
+
+def test_intrabar_gaps_fill_at_the_open():
+    _same_for_every_rule(_one_trade((90, 92, 88, 91)), (90.0, ExitReason.STOP_LOSS, 1))
+    _same_for_every_rule(_one_trade((115, 116, 114, 115)), (115.0, ExitReason.TAKE_PROFIT, 1))
+
+
+def test_ambiguous_bar_rules():
+    # Open nearer the stop (5 vs 10 away)
+    outcomes = _one_trade((100, 111, 94, 100))
+    assert outcomes['stop_first'] == (95.0, ExitReason.STOP_LOSS, 1)
+    assert outcomes['target_first'] == (110.0, ExitReason.TAKE_PROFIT, 1)
+    assert outcomes['open_nearest'] == (95.0, ExitReason.STOP_LOSS, 1)
+    # Open nearer the target (13 vs 2 away)
+    outcomes = _one_trade((108, 111, 94, 100))
+    assert outcomes['stop_first'] == (95.0, ExitReason.STOP_LOSS, 1)
+    assert outcomes['target_first'] == (110.0, ExitReason.TAKE_PROFIT, 1)
+    assert outcomes['open_nearest'] == (110.0, ExitReason.TAKE_PROFIT, 1)
+
+
+def test_high_low_without_open():
+    # open_nearest falls back to stop_first, and gaps fill at the level
+    outcomes = _one_trade((108, 111, 94, 100), with_open=False)
+    assert outcomes['stop_first'] == outcomes['open_nearest'] == (95.0, ExitReason.STOP_LOSS, 1)
+    assert outcomes['target_first'] == (110.0, ExitReason.TAKE_PROFIT, 1)
+    _same_for_every_rule(_one_trade((90, 92, 88, 91), with_open=False), (95.0, ExitReason.STOP_LOSS, 1))
+    _same_for_every_rule(_one_trade((115, 116, 114, 115), with_open=False), (110.0, ExitReason.TAKE_PROFIT, 1))
+
+
+def test_signal_exit_open_ended_target_and_end_of_period():
+    # Inside the range, a confident Sell exits at the close
+    _same_for_every_rule(_one_trade((100, 104, 96, 102), signal=SIGNAL_SELL), (102.0, ExitReason.SIGNAL_EXIT, 1))
+    # No target (open-ended timeframes): a spike does not exit, the period end does
+    _same_for_every_rule(_one_trade((100, 150, 99, 120), tp=np.nan), (120.0, ExitReason.END_OF_PERIOD, 2))
+
+
+def test_high_or_low_alone_is_close_only():
+    df = random_walk(1500, 11)
+    close, volumes = df['Close'].to_numpy(), df['Volume'].to_numpy()
+    close_only = simulate(precompute_arrays(close, volumes, 'scalping'))
+    for columns in ({'high': df['High'].to_numpy()}, {'low': df['Low'].to_numpy(), 'open': df['Open'].to_numpy()}):
+        arrays = precompute_arrays(close, volumes, 'scalping', **columns)
+        assert arrays.high is None and arrays.low is None
+        trades = simulate(arrays, ambiguous='stop_first')
+        assert np.array_equal(trades.exit_idx, close_only.exit_idx)
+        assert np.array_equal(trades.reason, close_only.reason)
+    try:
+        simulate(precompute_arrays(close, volumes, 'scalping'), ambiguous='random')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for an unknown ambiguity rule")
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,88 @@
+"""
+Bootstrap confidence interval tests: resample shapes, block wrap-around,
+seeded determinism and probabilities on a known distribution.
+Run with pytest or directly: python tests/test_bootstrap.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.bootstrap import (
+    resample_indices, metrics_matrix, bootstrap_metrics, metric_intervals, probability_above, METRICS
+)
+from src.core.metrics import calculate_advanced_metrics
+
+
+def _trades(n: int = 150, seed: int = 4):
+    return np.random.default_rng(seed).normal(0.004, 0.03, n)
+
+
+def test_resample_indices_shapes_and_range():
+    rng = np.random.default_rng(0)
+    for n_trades in (1, 7, 100):
+        for block_size in (None, 1, 3, 7, 250):
+            idx = resample_indices(n_trades, 40, block_size, rng)
+            assert idx.shape == (40, n_trades), (n_trades, block_size)
+            assert idx.min() >= 0 and idx.max() < n_trades
+
+
+def test_blocks_are_consecutive_and_wrap_around():
+    n_trades, block_size = 10, 4
+    idx = resample_indices(n_trades, 500, block_size, np.random.default_rng(1))
+    # Rows are blocks of 4, 4 and a truncated 2, each a circular run
+    for start in (0, 4, 8):
+        block = idx[:, start:start + block_size]
+        assert (np.diff(block, axis=1) % n_trades == 1).all()
+    wrapped = (np.diff(idx[:, :block_size], axis=1) == 1 - n_trades).any(axis=1)
+    assert wrapped.any()  # Blocks starting near the end continue from trade 0
+
+
+def test_metrics_matrix_matches_advanced_metrics():
+    trades = _trades()
+    rng = np.random.default_rng(2)
+    pnl = trades[resample_indices(len(trades), 25, 5, rng)]
+    pnl[0] = np.abs(pnl[0])  # No losses and no drawdown
+    matrix = metrics_matrix(pnl)
+    for row in range(len(pnl)):
+        expected = calculate_advanced_metrics(pnl[row], None)
+        for name in METRICS:
+            assert np.isclose(matrix[name][row], expected[name], rtol=1e-9, atol=1e-9), (row, name)
+
+
+def test_intervals_are_deterministic_under_seed():
+    trades = _trades()
+    for block_size in (None, 8):
+        first = metric_intervals(trades, n_samples=500, block_size=block_size, seed=3)
+        assert first == metric_intervals(trades, n_samples=500, block_size=block_size, seed=3)
+        assert first != metric_intervals(trades, n_samples=500, block_size=block_size, seed=4)
+        for name in METRICS:
+            low, high = first[name]
+            assert low <= high, name
+    # Chunked draws still return every sample
+    samples = bootstrap_metrics(trades, n_samples=1234, seed=3)
+    assert all(len(values) == 1234 for values in samples.values())
+    assert metric_intervals([], seed=3) == {name: (0.0, 0.0) for name in METRICS}
+
+
+def test_probability_above_known_distribution():
+    # Two trades, one win: resampled win rate is 0, 50 or 100 with p = 1/4, 1/2, 1/4
+    trades = [0.01, -0.01]
+    assert abs(probability_above(trades, 60, 'win_rate', n_samples=20000, seed=5) - 0.25) < 0.02
+    assert abs(probability_above(trades, 25, 'win_rate', n_samples=20000, seed=5) - 0.75) < 0.02
+
+    # Identical trades resample to the same ROI every time
+    flat = [0.02] * 10
+    assert probability_above(flat, 19.9, 'roi', n_samples=200, seed=5) == 1.0
+    assert probability_above(flat, 20.1, 'roi', n_samples=200, seed=5) == 0.0
+    assert probability_above([], 0.0) == 0.0
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,99 @@
+"""
+IndicatorBank tests.
+Run with pytest or directly: python tests/test_indicator_bank.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.indicator_bank import IndicatorBank
+from src.core.signals import compute_indicator_series, SignalParams, DEFAULT_PARAMS
+
+TIMEFRAMES = ['scalping', '1h', '4h', 'daily', 'weekly']
+
+
+def _market(n_bars: int = 3000, seed: int = 19):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    volumes = rng.lognormal(0, 0.6, n_bars) * 2e10
+    return prices, volumes
+
+
+def _assert_same_series(got, expected):
+    assert set(got) == set(expected)
+    for key in expected:
+        assert np.array_equal(got[key], expected[key], equal_nan=True), key
+
+
+def test_series_match_direct_computation():
+    prices, volumes = _market()
+    bank = IndicatorBank(prices, volumes)
+    configs = [DEFAULT_PARAMS] + [SignalParams(short_period=s, long_period=l) for s, l in ((3, 20), (7, 50), (14, 30))]
+    for params in configs:
+        for tf in TIMEFRAMES:
+            _assert_same_series(bank.series(tf, params), compute_indicator_series(prices, volumes, tf, params))
+
+
+def test_batched_rows_match_per_symbol():
+    prices = np.stack([_market(500, seed)[0] for seed in range(3)])
+    volumes = np.stack([_market(500, seed)[1] for seed in range(3)])
+    bank = IndicatorBank(prices, volumes)
+    for tf in ('1h', 'daily'):
+        batched = bank.series(tf)
+        for row in range(3):
+            single = compute_indicator_series(prices[row], volumes[row], tf)
+            for key in single:
+                assert np.allclose(batched[key][row], single[key], equal_nan=True), key
+
+
+def test_cached_series_are_shared_and_read_only():
+    prices, volumes = _market(500)
+    bank = IndicatorBank(prices, volumes)
+    first = bank.ma(20)
+    assert bank.ma(20) is first
+    assert not first.flags.writeable
+
+
+def test_lru_eviction_bounds_the_cache():
+    prices, volumes = _market(500)
+    bank = IndicatorBank(prices, volumes, max_entries=3)
+    a, b, c = bank.ma(5), bank.ma(10), bank.ma(20)
+    assert bank.ma(5) is a  # Refreshes 5, so 10 is now the oldest
+    bank.ma(30)
+    assert len(bank._cache) == 3
+    assert bank.evictions == 1
+    assert bank.ma(5) is a and bank.ma(20) is c
+    rebuilt = bank.ma(10)
+    assert rebuilt is not b and np.array_equal(rebuilt, b, equal_nan=True)
+
+    bounded = IndicatorBank(prices, volumes, max_entries=4)
+    for params in [SignalParams(short_period=s, long_period=40) for s in range(3, 20)]:
+        _assert_same_series(bounded.series('daily', params), compute_indicator_series(prices, volumes, 'daily', params))
+        assert len(bounded._cache) <= 4
+
+
+def test_rejects_bad_arguments():
+    prices, volumes = _market(100)
+    try:
+        IndicatorBank(prices, volumes, max_entries=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for max_entries=0")
+    try:
+        IndicatorBank(prices, volumes[:-1])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for mismatched shapes")
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,78 @@
+"""
+MetricsAccumulator tests against calculate_advanced_metrics.
+Run with pytest or directly: python tests/test_metrics.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.metrics import calculate_advanced_metrics, MetricsAccumulator
+
+
+def _pnl(n: int, seed: int = 16) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.normal(0.002, 0.03, n)
+
+
+def _assert_same(got, expected):
+    assert set(got) == set(expected)
+    for key in expected:
+        assert np.isclose(got[key], expected[key], rtol=1e-9, atol=1e-9), key
+
+
+def test_update_matches_batch_metrics():
+    pnl = _pnl(500)
+    acc = MetricsAccumulator()
+    for value in pnl:
+        acc.update(value)
+    _assert_same(acc.to_dict(), calculate_advanced_metrics(pnl, None))
+    _assert_same(MetricsAccumulator.from_trades(pnl).to_dict(), calculate_advanced_metrics(pnl, None))
+
+
+def test_merge_in_order_matches_whole_sequence():
+    pnl = _pnl(1000)
+    expected = calculate_advanced_metrics(pnl, None)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        cuts = np.sort(rng.choice(np.arange(1, len(pnl)), size=rng.integers(1, 8), replace=False))
+        shards = [MetricsAccumulator.from_trades(part) for part in np.split(pnl, cuts)]
+        _assert_same(MetricsAccumulator.merge_all(shards).to_dict(), expected)
+
+
+def test_merge_drawdown_spans_shards():
+    # The peak is in the first shard, the trough in the second
+    first = MetricsAccumulator.from_trades([0.1, 0.2])
+    second = MetricsAccumulator.from_trades([-0.25, 0.05, -0.2])
+    merged = first.merge(second).to_dict()
+    assert np.isclose(merged['drawdown'], -40.0)
+    _assert_same(merged, calculate_advanced_metrics([0.1, 0.2, -0.25, 0.05, -0.2], None))
+
+
+def test_merge_with_empty_and_inplace():
+    pnl = _pnl(50)
+    acc = MetricsAccumulator.from_trades(pnl)
+    _assert_same(acc.merge(MetricsAccumulator()).to_dict(), acc.to_dict())
+    _assert_same(MetricsAccumulator().merge(acc).to_dict(), acc.to_dict())
+
+    inplace = MetricsAccumulator()
+    inplace.update_many(pnl[:20])
+    inplace.update_many([])
+    inplace.update_many(pnl[20:])
+    _assert_same(inplace.to_dict(), acc.to_dict())
+
+
+def test_empty_and_edge_cases():
+    _assert_same(MetricsAccumulator().to_dict(), calculate_advanced_metrics([], None))
+    for pnl in ([0.05], [0.01, 0.02], [-0.01, -0.03], [0.0, 0.0]):
+        _assert_same(MetricsAccumulator.from_trades(pnl).to_dict(), calculate_advanced_metrics(pnl, None))
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,93 @@
+"""
+Parameter sweep tests.
+Run with pytest or directly: python tests/test_param_sweep.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.backtest_engine import run_backtest_arrays
+from src.core.param_sweep import grid_space, random_space, run_sweep, PARAM_NAMES
+from src.core.signals import SignalParams
+
+
+def _market(n_bars: int = 1500, seed: int = 12):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    volumes = rng.lognormal(0, 0.6, n_bars) * 2e10
+    return prices, volumes
+
+
+CONFIGS = grid_space({
+    'short_period': [5, 10],
+    'long_period': [20, 50],
+    'entry_confidence': [30, 40, 60],
+    'risk_percent': [0.01, 0.03]
+}, timeframe='4h')
+
+
+def _assert_ranked(rows, key, min_trades):
+    flags = [row['count'] >= min_trades for row in rows]
+    assert flags == sorted(flags, reverse=True)  # Every qualifying row first
+    for group in (True, False):
+        values = [row[key] for row, ok in zip(rows, flags) if ok == group]
+        assert values == sorted(values, reverse=True)
+
+
+def test_spaces_validate_against_timeframe_periods():
+    # daily defaults to (10, 50) and weekly to (20, 100)
+    daily = grid_space({'short_period': [5, 60]}, timeframe='daily')
+    assert [c.short_period for c in daily] == [5]
+    weekly = grid_space({'short_period': [5, 60]}, timeframe='weekly')
+    assert [c.short_period for c in weekly] == [5, 60]
+    assert [c.long_period for c in grid_space({'long_period': [5, 40]}, timeframe='daily')] == [40]
+    assert grid_space({'short_period': [0, -3]}) == []
+
+    sampled = random_space({'short_period': (1, 80)}, 50, seed=1, timeframe='daily')
+    assert len(sampled) == 50
+    assert all(0 < c.short_period < 50 for c in sampled)
+
+
+def test_explicit_zero_period_is_not_replaced_by_default():
+    assert SignalParams(short_period=0).periods('daily') == (0, 50)
+    assert SignalParams(long_period=0).periods('4h') == (7, 0)
+    assert SignalParams().periods('weekly') == (20, 100)
+
+
+def test_rows_match_single_backtests():
+    prices, volumes = _market()
+    rows = run_sweep(prices, volumes, CONFIGS, timeframe='4h', max_workers=2, sort_by=None)
+    assert len(rows) == len(CONFIGS)
+    for row in rows[:4]:
+        params = SignalParams(**{name: row[name] for name in PARAM_NAMES})
+        expected = run_backtest_arrays(prices, volumes, '4h', params=params)
+        assert row['count'] == expected['count']
+        assert np.isclose(row['sharpe'], expected['sharpe'])
+        assert np.isclose(row['roi'], expected['roi'])
+
+
+def test_configs_with_few_trades_ranked_last():
+    prices, volumes = _market()
+    rows = run_sweep(prices, volumes, CONFIGS, timeframe='4h', max_workers=2, min_trades=10)
+    counts = [row['count'] for row in rows]
+    assert min(counts) < 10 <= max(counts)  # Both groups present
+    _assert_ranked(rows, 'sharpe', 10)
+
+
+def test_bootstrap_ranks_by_sharpe_lower_bound():
+    prices, volumes = _market()
+    rows = run_sweep(prices, volumes, CONFIGS[:8], timeframe='4h', max_workers=2, n_bootstrap=200, min_trades=5)
+    # A percentile interval need not contain the point estimate, only be ordered
+    assert all(row['sharpe_low'] <= row['sharpe_high'] for row in rows if row['count'] > 1)
+    _assert_ranked(rows, 'sharpe_low', 5)
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,124 @@
+"""
+Portfolio backtester tests: single-asset parity with the engine, position
+slots and cash limits.
+Run with pytest or directly: python tests/test_portfolio_backtest.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.backtest_engine import precompute_arrays, simulate, run_backtest_arrays, AMBIGUOUS_RULES
+from src.core.portfolio_backtest import run_portfolio_backtest
+
+
+def _universe(n_bars: int = 3000, n_symbols: int = 20, seed: int = 9):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, (n_bars, n_symbols)), axis=0)
+    volumes = rng.lognormal(0, 0.6, (n_bars, n_symbols)) * 1e6
+    open_ = np.vstack([prices[:1], prices[:-1]]) * rng.uniform(0.995, 1.005, prices.shape)
+    high = np.maximum(open_, prices) * rng.uniform(1.0, 1.03, prices.shape)
+    low = np.minimum(open_, prices) * rng.uniform(0.97, 1.0, prices.shape)
+    return prices, volumes, open_, high, low
+
+
+def _assert_same_trades(got, expected):
+    assert len(got) == len(expected) > 0
+    assert np.array_equal(got.entry_idx, expected.entry_idx)
+    assert np.array_equal(got.exit_idx, expected.exit_idx)
+    assert np.array_equal(got.reason, expected.reason)
+    assert np.allclose(got.pnl, expected.pnl, rtol=0, atol=1e-12)
+
+
+def test_single_asset_all_in_matches_engine():
+    prices, volumes, open_, high, low = _universe(n_symbols=3)
+    for s in range(3):
+        solo = run_portfolio_backtest(prices[:, s:s + 1], volumes[:, s:s + 1], '4h', max_positions=1, position_fraction=1.0)
+        expected = simulate(precompute_arrays(prices[:, s], volumes[:, s], '4h'))
+        _assert_same_trades(solo.trades, expected)
+
+        single = run_backtest_arrays(prices[:, s], volumes[:, s], '4h')
+        assert solo.metrics['count'] == single['count']
+        assert np.isclose(solo.metrics['sum_trade_pnl'], single['roi'], rtol=0, atol=1e-9)
+        assert 'roi' not in solo.metrics
+        # All-in sizing compounds every trade
+        assert np.isclose(solo.metrics['total_return'], (np.prod(1 + expected.pnl) - 1) * 100)
+        assert np.isclose(solo.equity[-1], np.prod(1 + expected.pnl))
+
+
+def test_single_asset_intrabar_matches_engine():
+    prices, volumes, open_, high, low = _universe(n_symbols=1)
+    for rule in AMBIGUOUS_RULES:
+        solo = run_portfolio_backtest(
+            prices, volumes, 'scalping', max_positions=1, position_fraction=1.0,
+            high=high, low=low, open=open_, ambiguous=rule
+        )
+        arrays = precompute_arrays(prices[:, 0], volumes[:, 0], 'scalping', high=high[:, 0], low=low[:, 0], open=open_[:, 0])
+        _assert_same_trades(solo.trades, simulate(arrays, ambiguous=rule))
+
+
+def test_max_positions_limits_open_trades():
+    prices, volumes = _universe()[:2]
+    for max_positions in (1, 3, 8):
+        result = run_portfolio_backtest(prices, volumes, '4h', max_positions=max_positions, position_fraction=0.1)
+        assert result.positions.max() == result.metrics['max_concurrent'] == max_positions
+        trades = result.trades
+        # Replaying the closed trades never has more than max_positions open
+        # at once, nor the same symbol twice
+        for t in range(len(prices)):
+            open_now = (trades.entry_idx <= t) & (trades.exit_idx > t)
+            assert open_now.sum() <= max_positions
+            assert len(np.unique(trades.symbol[open_now])) == open_now.sum()
+
+
+def test_entries_never_exceed_cash():
+    prices, volumes = _universe()[:2]
+    result = run_portfolio_backtest(prices, volumes, '4h', max_positions=5, position_fraction=0.4)
+    trades = result.trades
+    assert (result.cash >= -1e-12).all()
+    assert (trades.capital > 0).all()
+    # Cash plus the capital in open positions is the starting capital plus
+    # realised P&L, so entries only ever spend cash that is there
+    dollar_pnl = trades.capital * trades.pnl
+    for t in np.unique(np.concatenate([trades.entry_idx, trades.exit_idx])):
+        committed = trades.capital[(trades.entry_idx <= t) & (trades.exit_idx > t)].sum()
+        realised = dollar_pnl[trades.exit_idx <= t].sum()
+        assert np.isclose(result.cash[t] + committed, 1.0 + realised, rtol=0, atol=1e-9), t
+    # Once 0.4 of equity is in two positions, a third only gets the remaining cash
+    assert np.any(trades.capital < 0.4 * result.equity[trades.entry_idx] - 1e-9)
+    # Final equity is the starting capital plus every trade's dollar P&L
+    assert np.isclose(result.equity[-1], 1.0 + dollar_pnl.sum())
+    assert np.isclose(sum(result.metrics['pnl_by_symbol'].values()), dollar_pnl.sum())
+
+
+def test_per_symbol_fractions_and_validation():
+    prices, volumes = _universe(n_symbols=4)[:2]
+    fractions = [0.0, 0.5, 0.0, 0.5]  # Symbols 0 and 2 are never funded
+    result = run_portfolio_backtest(prices, volumes, '4h', position_fraction=fractions, symbols=list('ABCD'))
+    assert set(np.unique(result.trades.symbol)) <= {1, 3}
+    assert set(result.metrics['pnl_by_symbol']) <= {'B', 'D'}
+
+    bad = prices.copy()
+    bad[5, 1] = np.nan
+    for kwargs in (
+        {'prices': prices[:, 0], 'volumes': volumes[:, 0]},
+        {'prices': prices, 'volumes': volumes[:, :3]},
+        {'prices': bad, 'volumes': volumes},
+        {'prices': prices, 'volumes': volumes, 'ambiguous': 'random'}
+    ):
+        try:
+            run_portfolio_backtest(**kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"expected ValueError for {sorted(kwargs)}")
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,114 @@
+"""
+Replay harness tests.
+Run with pytest or directly: python tests/test_replay.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.replay import ReplayHarness, load_csv
+from src.core.signal_integration import SignalGenerator
+from src.core.signal_service import SignalService
+
+
+def _feed(n_bars: int = 300, seed: int = 20):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.002, n_bars))
+    volumes = rng.lognormal(0, 0.6, n_bars) * 2e8
+    return np.arange(n_bars) * 60.0, prices, volumes
+
+
+def _check_report(report, n_bars: int, warmup: int):
+    assert report.bars == n_bars - warmup
+    assert sum(report.signals.values()) == report.bars
+    for values in (report.latency, report.service_time, report.queue_depth, report.producer_lag):
+        assert len(values) == report.bars
+    assert (report.latency >= report.service_time - 1e-9).all()  # Latency includes evaluation
+    assert (report.service_time > 0).all()
+    d = report.to_dict()
+    assert d['bars'] == report.bars
+    assert d['latency_ms']['p50'] <= d['latency_ms']['p90'] <= d['latency_ms']['p99'] <= d['max_latency_ms'] + 1e-9
+    assert d['throughput'] > 0
+
+
+def test_generator_replay_signals_match_direct_evaluation():
+    times, prices, volumes = _feed()
+    harness = ReplayHarness(times, prices, volumes, speedup=60 / 0.0005, warmup=50, history=1000)
+    report = harness.run_sync()
+    _check_report(report, len(prices), 50)
+
+    generator = SignalGenerator(cache_size=0)
+    expected = {}
+    for end in range(51, len(prices) + 1):
+        signal = generator.generate_signal_summary(prices[:end], volumes[:end])['primary_signal']
+        expected[signal] = expected.get(signal, 0) + 1
+    assert dict(report.signals) == expected
+
+
+def test_history_window_is_bounded():
+    times, prices, volumes = _feed(200)
+    generator = SignalGenerator(cache_size=0)
+    seen = []
+
+    class Recording(SignalGenerator):
+        def generate_signal_summary(self, prices, volumes):
+            seen.append(len(prices))
+            return generator.generate_signal_summary(prices, volumes)
+
+    ReplayHarness(times, prices, volumes, target=Recording(), warmup=50, history=80).run_sync()
+    assert seen[0] == 51 and max(seen) == 80
+
+
+def test_service_replay_flooded():
+    times, prices, volumes = _feed()
+
+    async def run():
+        async with SignalService(batch_window=0.0) as service:
+            return await ReplayHarness(times, prices, volumes, target=service, warmup=50).run()
+
+    report = asyncio.run(run())
+    _check_report(report, len(prices), 50)
+    assert report.queue_depth.max() > 0  # Flooding builds a backlog
+
+
+def test_load_csv_and_validation():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bars.csv')
+        with open(path, 'w') as f:
+            f.write("Date,Close,Volume\n2025-01-01 00:00:00,100.5,10\n2025-01-02 00:00:00,101.0,12\n")
+        times, prices, volumes = load_csv(path)
+        assert np.allclose(np.diff(times), 86400.0)
+        assert np.allclose(prices, [100.5, 101.0]) and np.allclose(volumes, [10, 12])
+
+    for kwargs in ({'speedup': 0}, {'speedup': -1.0}):
+        try:
+            ReplayHarness([0.0, 1.0], [1.0, 2.0], [1.0, 1.0], **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"expected ValueError for {kwargs}")
+    try:
+        ReplayHarness([0.0], [1.0, 2.0], [1.0, 1.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for mismatched lengths")
+
+
+def test_empty_replay():
+    report = ReplayHarness([0.0, 1.0], [1.0, 2.0], [1.0, 1.0], warmup=50).run_sync()
+    assert report.bars == 0
+    assert report.to_dict()['max_latency_ms'] == 0.0
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,130 @@
+"""
+OHLCV resampler tests.
+Run with pytest or directly: python tests/test_resampler.py
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.resampler import OHLCVResampler, bucket_start, TIMEFRAME_SECONDS
+from src.core.signal_integration import SignalGenerator
+from src.core.signals import compute_snapshot, RESAMPLED_PERIODS
+
+
+def _minute_bars(n: int, seed: int = 6):
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()  # A Monday
+    close = 60000 * np.cumprod(1 + rng.normal(0, 0.0005, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.0005, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.0005, n))
+    volume = rng.uniform(1, 10, n)
+    return start + np.arange(n) * 60.0, open_, high, low, close, volume
+
+
+def _reference_bars(times, open_, high, low, close, volume, timeframe):
+    """Group base bars by bucket with plain Python, one dict per bar"""
+    bars = {}
+    for i, ts in enumerate(times):
+        key = bucket_start(ts, timeframe)
+        bar = bars.get(key)
+        if bar is None:
+            bars[key] = [open_[i], high[i], low[i], close[i], volume[i]]
+        else:
+            bar[1] = max(bar[1], high[i])
+            bar[2] = min(bar[2], low[i])
+            bar[3] = close[i]
+            bar[4] += volume[i]
+    return [(key, *values) for key, values in sorted(bars.items())]
+
+
+def test_bars_match_grouped_base_bars():
+    data = _minute_bars(3 * 24 * 60 + 37)
+    resampler = OHLCVResampler(['scalping', '1h', '4h', 'daily'], max_bars=10000)
+    for row in zip(*data):
+        resampler.update_bar(*row)
+    for tf in resampler.timeframes:
+        expected = _reference_bars(*data, tf)
+        got = [(b.start, b.open, b.high, b.low, b.close, b.volume) for b in resampler.bars(tf)]
+        assert len(got) == len(expected), tf
+        assert np.allclose(np.array(got), np.array(expected)), tf
+        assert np.allclose(resampler.closes(tf), [bar[4] for bar in expected])
+        assert resampler.bar_count(tf, include_partial=False) == len(expected) - 1
+
+
+def test_closed_bars_reported_on_bucket_change():
+    resampler = OHLCVResampler(['1h'])
+    base = 1_800_000_000 - 1_800_000_000 % 3600
+    assert resampler.update(base, 100.0, 1.0) == {}
+    assert resampler.update(base + 1800, 105.0, 2.0) == {}
+    closed = resampler.update(base + 3600, 101.0, 1.0)
+    bar = closed['1h']
+    assert (bar.start, bar.open, bar.high, bar.low, bar.close, bar.volume) == (base, 100.0, 105.0, 100.0, 105.0, 3.0)
+    assert resampler.bar_count('1h') == 2
+
+
+def test_weekly_buckets_start_on_monday():
+    monday = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    sunday_night = datetime(2026, 1, 11, 23, 59, tzinfo=timezone.utc)
+    assert bucket_start(monday, 'weekly') == monday.timestamp()
+    assert bucket_start(sunday_night, 'weekly') == monday.timestamp()
+    assert bucket_start(monday.timestamp() - 1, 'weekly') == monday.timestamp() - TIMEFRAME_SECONDS['weekly']
+
+
+def test_resampled_signals_use_bar_count_periods():
+    # 40 weeks of hourly bars: far short of the 100-bar weekly relabel period
+    n = 40 * 7 * 24
+    rng = np.random.default_rng(7)
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()
+    prices = 60000 * np.cumprod(1 + rng.normal(0.0002, 0.004, n))
+    resampler = OHLCVResampler(['daily', 'weekly'], max_bars=1000)
+    for i in range(n):
+        resampler.update(start + i * 3600.0, prices[i], 1.0 + i % 5)
+
+    generator = SignalGenerator(cache_size=0)
+    results = generator.generate_resampled_signals(resampler)
+    assert results['weekly']['bars'] == 40
+    for tf, result in results.items():
+        snapshot = compute_snapshot(resampler.closes(tf), resampler.volumes(tf), tf, periods=RESAMPLED_PERIODS)
+        assert (snapshot.short_period, snapshot.long_period) == RESAMPLED_PERIODS
+        assert snapshot.ma_long is not None
+        assert result['confidence'] > 0
+        assert result['confidence_details']['ma'] > 0
+
+    # Custom periods apply to every frame; too few bars falls back to Hold
+    results = generator.generate_resampled_signals(resampler, periods=(5, 60))
+    assert results['weekly']['signal'] == 'Hold' and results['weekly']['confidence'] == 0
+    assert results['daily']['confidence'] > 0
+
+
+def test_max_bars_and_validation():
+    resampler = OHLCVResampler(['scalping'], max_bars=5)
+    for minute in range(20):
+        resampler.update(minute * 60.0, 100.0 + minute)
+    assert len(resampler.bars('scalping', include_partial=False)) == 5
+    assert resampler.closes('scalping')[-1] == 119.0
+
+    try:
+        resampler.update(0.0, 1.0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for an out-of-order update")
+    try:
+        OHLCVResampler(['2h'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for an unknown timeframe")
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,104 @@
+"""
+Ring buffer price store tests.
+Run with pytest or directly: python tests/test_ring_buffer.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.ring_buffer import RingBuffer, PriceHistoryStore
+
+
+def test_append_keeps_newest_values_in_order():
+    buffer = RingBuffer(5)
+    history = []
+    for value in range(17):
+        buffer.append(value)
+        history.append(value)
+        assert np.array_equal(buffer.view(), history[-5:])
+        assert buffer.last() == value
+    assert len(buffer) == 5
+    assert buffer.total_appended == 17
+    assert np.array_equal(buffer.view(3), [14, 15, 16])
+    assert np.array_equal(buffer.view(50), history[-5:])
+
+
+def test_extend_matches_appends_at_any_offset():
+    rng = np.random.default_rng(9)
+    for capacity in (1, 4, 7):
+        appended, extended = RingBuffer(capacity), RingBuffer(capacity)
+        for _ in range(30):
+            values = rng.normal(size=int(rng.integers(0, 2 * capacity + 2)))
+            for value in values:
+                appended.append(value)
+            extended.extend(values)
+            assert np.array_equal(extended.view(), appended.view())
+            assert len(extended) == len(appended)
+            assert extended.total_appended == appended.total_appended
+
+
+def test_views_are_zero_copy_and_read_only():
+    buffer = RingBuffer(4)
+    buffer.extend([1.0, 2.0, 3.0])
+    view = buffer.view()
+    assert not view.flags.owndata
+    assert view.flags.c_contiguous
+    try:
+        view[0] = 10.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("view should be read-only")
+
+
+def test_empty_and_invalid():
+    buffer = RingBuffer(3)
+    assert len(buffer.view()) == 0
+    try:
+        buffer.last()
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("expected IndexError on an empty buffer")
+    try:
+        RingBuffer(0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for capacity 0")
+
+
+def test_price_history_store():
+    store = PriceHistoryStore(capacity=100)
+    store.extend('BTC', np.arange(150.0), np.arange(150.0) * 2)
+    store.append('ETH', 3000.0, 5.0)
+    prices, volumes = store.history('BTC')
+    assert np.array_equal(prices, np.arange(50.0, 150.0))
+    assert np.array_equal(volumes, np.arange(50.0, 150.0) * 2)
+    assert np.array_equal(store.prices('BTC', 2), [148.0, 149.0])
+    assert np.array_equal(store.volumes('ETH'), [5.0])
+    assert sorted(store.symbols()) == ['BTC', 'ETH'] and 'BTC' in store and len(store) == 2
+    assert store.memory_bytes() == 2 * 2 * (2 * 100 * 8)
+    try:
+        store.history('SOL')
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected KeyError for an unknown symbol")
+    try:
+        store.extend('BTC', [1.0, 2.0], [1.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for mismatched lengths")
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
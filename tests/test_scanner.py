@@ -0,0 +1,119 @@
+"""
+Universe scanner tests against the scalar signal functions and a full sort.
+Run with pytest or directly: python tests/test_scanner.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.scanner import scan_universe, rank_top_n
+from src.core.signals import (
+    generate_signal, get_signal_confidence, calculate_sl_tp, load_weights, SIGNAL_LABELS, SIGNAL_BUY
+)
+
+
+def _universe(n_symbols: int = 300, n_bars: int = 120, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    drift = rng.normal(0, 0.003, (n_symbols, 1))
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (n_symbols, n_bars)) + drift, axis=1)
+    volumes = rng.uniform(800, 1200, (n_symbols, n_bars))
+    return prices, volumes
+
+
+def _full_sort(scan, signal='Buy', key='confidence'):
+    """Reference ranking: every candidate, stable sort by score (NaN last)"""
+    rows = range(len(scan[key]))
+    if signal is not None:
+        rows = [r for r in rows if SIGNAL_LABELS[int(scan['signal'][r])] == signal]
+    score = lambda r: -np.inf if np.isnan(scan[key][r]) else scan[key][r]
+    return sorted(rows, key=lambda r: -score(r))
+
+
+def test_scan_matches_scalar_functions():
+    weights = load_weights()
+    for tf in ('scalping', '4h', 'daily', 'weekly'):
+        prices, volumes = _universe(60)
+        scan = scan_universe(prices, volumes, tf, weights)
+        for i in range(len(prices)):
+            p, v = list(prices[i]), list(volumes[i])
+            assert SIGNAL_LABELS[int(scan['signal'][i])] == generate_signal(p, v, tf, weights), (tf, i)
+            confidence = get_signal_confidence(p, v, tf, weights)
+            assert np.isclose(scan['confidence'][i], confidence['overall'], rtol=0, atol=1e-9)
+            sl, tp = calculate_sl_tp(p[-1], tf, trend_strength=scan['momentum'][i])
+            assert np.isclose(scan['stop_loss'][i], sl, rtol=1e-12)
+            assert (np.isnan(scan['take_profit'][i]) and tp is None) or np.isclose(scan['take_profit'][i], tp)
+
+
+def test_rank_matches_full_sort():
+    prices, volumes = _universe()
+    scan = scan_universe(prices, volumes, '4h')
+    symbols = [f"SYM{i}" for i in range(len(prices))]
+    for signal in ('Buy', 'Sell', None):
+        expected = _full_sort(scan, signal)
+        assert len(expected) > 10
+        for top_n in (1, 5, 10, len(expected) - 1):
+            ranked = rank_top_n(scan, top_n, symbols=symbols, signal=signal)
+            assert [row['symbol'] for row in ranked] == [symbols[r] for r in expected[:top_n]], (signal, top_n)
+        for row in rank_top_n(scan, 5, signal=signal):
+            assert signal is None or row['signal'] == signal
+            assert row['take_profit'] is None or row['take_profit'] > row['entry_price']
+
+
+def test_ties_keep_row_order():
+    prices, volumes = _universe()
+    scan = scan_universe(prices, volumes, '4h')
+    # Few distinct values, so the top_n boundary always falls inside a tie
+    scan['confidence'] = np.round(scan['confidence'] / 20) * 20
+    scan['confidence'][::7] = np.nan
+    for signal in ('Buy', None):
+        expected = _full_sort(scan, signal)
+        for top_n in range(1, len(expected) + 1, 3):
+            ranked = [row['symbol'] for row in rank_top_n(scan, top_n, signal=signal)]
+            assert ranked == expected[:top_n], (signal, top_n)
+
+    scan['confidence'][:] = 5.0
+    ranked = rank_top_n(scan, 4, signal=None)
+    assert [row['symbol'] for row in ranked] == [0, 1, 2, 3]
+
+
+def test_top_n_beyond_universe_and_empty_results():
+    prices, volumes = _universe(20)
+    scan = scan_universe(prices, volumes, '4h')
+    everything = rank_top_n(scan, 1000, signal=None)
+    assert [row['symbol'] for row in everything] == _full_sort(scan, None)
+    buys = int((scan['signal'] == SIGNAL_BUY).sum())
+    assert len(rank_top_n(scan, 1000)) == buys
+    assert rank_top_n(scan, 0, signal=None) == []
+    assert rank_top_n(scan, -3, signal=None) == []
+
+    scan['signal'][:] = SIGNAL_BUY - 1  # No Buy rows left
+    assert rank_top_n(scan, 5) == []
+
+
+def test_scan_validation_and_short_history():
+    prices, volumes = _universe(5, 20)
+    scan = scan_universe(prices, volumes, 'daily')  # Fewer bars than the long MA
+    assert (scan['signal'] == 0).all() and (scan['confidence'] == 0).all()
+    try:
+        scan_universe(prices[0], volumes[0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for 1-D input")
+    try:
+        scan_universe(prices, volumes[:, 1:])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for mismatched shapes")
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,303 @@
+"""
+SignalCache tests.
+Run with pytest or directly: python tests/test_signal_cache.py
+"""
+
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core import signal_cache
+from src.core.signal_cache import SignalCache, rolling_hash, series_fingerprint
+from src.core.signal_integration import SignalGenerator
+
+
+def _series(n: int, seed: int = 8):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    volumes = rng.lognormal(0, 0.6, n) * 2e10
+    return prices, volumes
+
+
+class _Counter:
+    """compute/extend pair that sums the series and counts calls."""
+
+    def __init__(self):
+        self.computes = 0
+        self.extends = 0
+
+    def compute(self, prices, volumes):
+        self.computes += 1
+        total = float(np.sum(prices))
+        return total, total
+
+    def extend(self, state, new_prices, new_volumes):
+        self.extends += 1
+        total = state + float(np.sum(new_prices))
+        return total, total
+
+
+def test_fingerprint_covers_every_bar():
+    prices, volumes = _series(500)
+    other = prices.copy()
+    other[10] *= 1.05  # Far before any trailing window
+    assert series_fingerprint(prices, volumes) != series_fingerprint(other, volumes)
+    other_volumes = volumes.copy()
+    other_volumes[0] *= 2
+    assert series_fingerprint(prices, volumes) != series_fingerprint(prices, other_volumes)
+    swapped = prices.copy()
+    swapped[[100, 101]] = swapped[[101, 100]]
+    assert series_fingerprint(prices, volumes) != series_fingerprint(swapped, volumes)
+
+    # The cache anchors on length, first and last bar before hashing
+    cache = SignalCache(ttl=None)
+    counter = _Counter()
+    last = prices.copy()
+    last[-1] += 1.0
+    first = cache.get_or_compute(prices, volumes, 'ctx', counter.compute)
+    second = cache.get_or_compute(last, volumes, 'ctx', counter.compute)
+    third = cache.get_or_compute(prices, other_volumes, 'ctx', counter.compute)
+    assert counter.computes == 3
+    assert first == np.sum(prices) and second == np.sum(last) and third == np.sum(prices)
+
+
+def test_rolling_hash_extends_over_appended_bars():
+    prices, volumes = _series(300)
+    full = series_fingerprint(prices, volumes)
+    chained = (series_fingerprint(prices, volumes, 290)[5] + rolling_hash(prices, volumes, 290, 300)) % 2 ** 64
+    assert full[5] == chained
+
+    # A series reached by extension has the key a cold request computes
+    cache = SignalCache(ttl=None)
+    counter = _Counter()
+    cache.get_or_compute(prices[:290], volumes[:290], 'ctx', counter.compute, counter.extend)
+    cache.get_or_compute(prices, volumes, 'ctx', counter.compute, counter.extend)
+    cold = SignalCache(ttl=None)
+    cold.get_or_compute(prices, volumes, 'ctx', counter.compute)
+    assert set(cache._entries) >= set(cold._entries)
+
+
+def test_hits_and_extensions_only_hash_appended_bars():
+    prices, volumes = _series(5000)
+    hashed = []
+    original = signal_cache.rolling_hash
+
+    def recording(prices, volumes, start, end):
+        hashed.append(end - start)
+        return original(prices, volumes, start, end)
+
+    signal_cache.rolling_hash = recording
+    try:
+        _check_hashed_bars(prices, volumes, hashed)
+    finally:
+        signal_cache.rolling_hash = original
+
+
+def _check_hashed_bars(prices, volumes, hashed):
+    cache = SignalCache(ttl=None)
+    counter = _Counter()
+    cache.get_or_compute(prices[:4990], volumes[:4990], 'ctx', counter.compute, counter.extend)
+    assert hashed == [4990]  # Unknown series: hashed once in full
+    hashed.clear()
+    cache.get_or_compute(prices[:4990], volumes[:4990], 'ctx', counter.compute, counter.extend)
+    assert hashed == [] and cache.stats['hits'] == 1
+    cache.get_or_compute(prices, volumes, 'ctx', counter.compute, counter.extend)
+    assert hashed == [10] and counter.extends == 1
+    hashed.clear()
+    cache.get_or_compute(prices, volumes, 'ctx', counter.compute, counter.extend)
+    assert hashed == [] and cache.stats['hits'] == 2
+
+
+def test_signals_not_shared_between_early_differing_series():
+    prices, volumes = _series(400)
+    other = prices.copy()
+    other[:50] *= 0.7
+    cached = SignalGenerator(cache_size=8, cache_ttl=None)
+    fresh = SignalGenerator(cache_size=0)
+    cached.generate_multi_timeframe_signals(list(prices), list(volumes))
+    got = cached.generate_multi_timeframe_signals(list(other), list(volumes))
+    expected = fresh.generate_multi_timeframe_signals(list(other), list(volumes))
+    assert cached.cache_stats()['hits'] == 0
+    for tf in expected:
+        assert got[tf]['confidence'] == expected[tf]['confidence']
+
+
+def test_hit_and_lru_eviction():
+    cache = SignalCache(max_entries=2, ttl=None)
+    counter = _Counter()
+    series = [_series(100, seed) for seed in range(3)]
+    for prices, volumes in series:
+        cache.get_or_compute(prices, volumes, 'ctx', counter.compute)
+    assert len(cache) == 2
+    assert cache.stats['evictions'] == 1
+    cache.get_or_compute(*series[2], 'ctx', counter.compute)
+    assert cache.stats['hits'] == 1
+    cache.get_or_compute(*series[0], 'ctx', counter.compute)  # Evicted earlier
+    assert counter.computes == 4
+
+
+def test_context_is_part_of_key():
+    prices, volumes = _series(100)
+    cache = SignalCache(ttl=None)
+    counter = _Counter()
+    cache.get_or_compute(prices, volumes, ('a', 1), counter.compute)
+    cache.get_or_compute(prices, volumes, ('a', 2), counter.compute)
+    assert counter.computes == 2
+
+
+def test_ttl_expiry():
+    prices, volumes = _series(100)
+    cache = SignalCache(ttl=0.01)
+    counter = _Counter()
+    cache.get_or_compute(prices, volumes, 'ctx', counter.compute)
+    time.sleep(0.02)
+    cache.get_or_compute(prices, volumes, 'ctx', counter.compute)
+    assert counter.computes == 2
+    assert cache.stats['expirations'] == 1
+
+
+def test_appended_bars_extend_cached_state():
+    prices, volumes = _series(300)
+    cache = SignalCache(ttl=None, max_append=16)
+    counter = _Counter()
+    cache.get_or_compute(prices[:290], volumes[:290], 'ctx', counter.compute, counter.extend)
+    result = cache.get_or_compute(prices, volumes, 'ctx', counter.compute, counter.extend)
+    assert counter.computes == 1 and counter.extends == 1
+    assert np.isclose(result, np.sum(prices))
+
+    # A series whose cached-length prefix differs must not be extended
+    other = prices.copy()
+    other[289] += 1.0
+    result = cache.get_or_compute(other[:295], volumes[:295], 'ctx', counter.compute, counter.extend)
+    assert counter.computes == 2 and counter.extends == 1
+    assert np.isclose(result, np.sum(other[:295]))
+
+
+def test_extended_signals_match_full_recompute():
+    prices, volumes = _series(600)
+    cached = SignalGenerator(cache_size=8, cache_ttl=None)
+    fresh = SignalGenerator(cache_size=0)
+    # Forward, then branching off earlier prefixes that were extended before
+    for end in list(range(500, 600, 7)) + [503, 510, 517]:
+        got = cached.generate_multi_timeframe_signals(list(prices[:end]), list(volumes[:end]))
+        expected = fresh.generate_multi_timeframe_signals(list(prices[:end]), list(volumes[:end]))
+        for tf in expected:
+            assert np.isclose(got[tf]['confidence'], expected[tf]['confidence'])
+            assert got[tf]['signal'] == expected[tf]['signal']
+    assert cached.cache_stats()['extensions'] > 0
+
+
+def test_returned_results_are_private_and_freshly_stamped():
+    prices, volumes = _series(300)
+    generator = SignalGenerator(cache_size=8, cache_ttl=None)
+    first = generator.generate_multi_timeframe_signals(list(prices), list(volumes))
+    expected = {tf: dict(data['confidence_details']) for tf, data in first.items()}
+    for data in first.values():
+        data['confidence_details']['ma'] = -1.0
+        data['signal'] = 'Mutated'
+    time.sleep(0.01)
+    second = generator.generate_multi_timeframe_signals(list(prices), list(volumes))
+    assert generator.cache_stats()['hits'] == 1
+    for tf, data in second.items():
+        assert data['confidence_details'] == expected[tf]
+        assert data['signal'] != 'Mutated'
+        assert data['timestamp'] > first[tf]['timestamp']
+
+
+def _run_threads(target, args_list):
+    threads = [threading.Thread(target=target, args=args) for args in args_list]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_different_keys_compute_in_parallel():
+    cache = SignalCache(ttl=None)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def compute(prices, volumes):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return float(prices[0]), None
+
+    series = [_series(50, seed) for seed in range(4)]
+    _run_threads(lambda p, v: cache.get_or_compute(p, v, 'ctx', compute), series)
+    assert peak[0] > 1  # Not serialized behind the cache lock
+    assert cache.stats['misses'] == 4
+
+
+def test_duplicate_requests_coalesce():
+    cache = SignalCache(ttl=None)
+    prices, volumes = _series(50)
+    calls, results = [], []
+
+    def compute(prices, volumes):
+        calls.append(1)
+        time.sleep(0.05)
+        return 'result', None
+
+    _run_threads(lambda: results.append(cache.get_or_compute(prices, volumes, 'ctx', compute)), [()] * 6)
+    assert len(calls) == 1
+    assert results == ['result'] * 6
+    assert cache.stats['coalesced'] >= 1
+
+
+def test_failed_compute_releases_waiters():
+    cache = SignalCache(ttl=None)
+    prices, volumes = _series(50)
+    calls, errors, results = [], [], []
+
+    def compute(prices, volumes):
+        calls.append(1)
+        time.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return 'result', None
+
+    def request():
+        try:
+            results.append(cache.get_or_compute(prices, volumes, 'ctx', compute))
+        except RuntimeError:
+            errors.append(1)
+
+    _run_threads(request, [()] * 3)
+    assert len(errors) == 1  # Only the failing caller sees the error
+    assert results == ['result'] * 2
+    assert len(calls) == 2
+
+
+def test_extension_leaves_cached_state_untouched():
+    cache = SignalCache(ttl=None)
+    prices, volumes = _series(100)
+    state = {'bars': 90}
+
+    def compute(prices, volumes):
+        return len(prices), state
+
+    def extend(state, new_prices, new_volumes):
+        state['bars'] += len(new_prices)  # Mutates what it is given
+        return state['bars'], state
+
+    cache.get_or_compute(prices[:90], volumes[:90], 'ctx', compute, extend)
+    assert cache.get_or_compute(prices[:95], volumes[:95], 'ctx', compute, extend) == 95
+    assert cache.get_or_compute(prices[:92], volumes[:92], 'ctx', compute, extend) == 92
+    assert state == {'bars': 90}
+    assert cache.stats['extensions'] == 2
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,108 @@
+"""
+SignalService tests.
+Run with pytest or directly: python tests/test_signal_service.py
+"""
+
+import asyncio
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.signal_integration import SignalGenerator
+from src.core.signal_service import SignalService
+
+
+def _universe(n_symbols: int, n_bars: int, seed: int = 10):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (n_symbols, n_bars)), axis=1)
+    volumes = rng.uniform(800, 1200, (n_symbols, n_bars))
+    return prices, volumes
+
+
+def _assert_same_summary(got, expected):
+    assert got['primary_signal'] == expected['primary_signal']
+    assert np.isclose(got['confidence'], expected['confidence'])
+
+
+def test_results_match_generator():
+    prices, volumes = _universe(12, 300)
+    # One odd-length series goes through the per-series path
+    series = [(prices[i], volumes[i]) for i in range(11)] + [(prices[11, :250], volumes[11, :250])]
+
+    async def run():
+        async with SignalService(generator=SignalGenerator(cache_size=0)) as service:
+            results = await asyncio.gather(*(
+                service.get_signals(f"S{i}", p, v) for i, (p, v) in enumerate(series)
+            ))
+            return service.stats, results
+
+    stats, results = asyncio.run(run())
+    generator = SignalGenerator(cache_size=0)
+    for (p, v), got in zip(series, results):
+        _assert_same_summary(got, generator.generate_signal_summary(p, v))
+    assert stats['vectorized'] == 11
+    assert stats['evaluated'] == 12
+
+
+def test_identical_requests_coalesce():
+    prices, volumes = _universe(3, 200)
+
+    async def run():
+        async with SignalService() as service:
+            requests = [service.get_signals(f"S{i}", prices[i], volumes[i]) for i in range(3) for _ in range(4)]
+            results = await asyncio.gather(*requests)
+            return service.stats, results
+
+    stats, results = asyncio.run(run())
+    assert stats['requests'] == 12
+    assert stats['coalesced'] == 9
+    assert stats['evaluated'] == 3
+    for i in range(3):
+        group = results[i * 4:(i + 1) * 4]
+        assert all(r == group[0] for r in group)
+    # Each caller gets its own copy
+    results[0]['primary_signal'] = 'changed'
+    assert results[1]['primary_signal'] != 'changed'
+
+
+def test_inputs_snapshotted_at_request_time():
+    prices, volumes = _universe(1, 200)
+    buffer = prices[0].copy()
+
+    async def run():
+        async with SignalService(batch_window=0.01) as service:
+            pending = asyncio.ensure_future(service.get_signals('S', buffer, volumes[0]))
+            await asyncio.sleep(0)
+            buffer[:] = buffer[::-1]  # Caller reuses its buffer before the batch runs
+            return await pending
+
+    got = asyncio.run(run())
+    _assert_same_summary(got, SignalGenerator(cache_size=0).generate_signal_summary(prices[0], volumes[0]))
+
+
+def test_errors_reach_every_waiter():
+    class Failing(SignalGenerator):
+        def generate_signal_summary(self, prices, volumes):
+            raise RuntimeError('boom')
+
+    prices, volumes = _universe(1, 100)
+
+    async def run():
+        async with SignalService(generator=Failing()) as service:
+            return await asyncio.gather(
+                *(service.get_signals('S', prices[0], volumes[0]) for _ in range(3)),
+                return_exceptions=True
+            )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,175 @@
+"""
+Whole-series signal and vectorized RSI tests against the per-bar functions
+in signals.py and the original scalar Wilder loop.
+Run with pytest or directly: python tests/test_signals.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.signals import (
+    generate_signal, get_signal_confidence, generate_signal_series, get_signal_confidence_series,
+    calculate_ma, calculate_ma_series, calculate_momentum, calculate_momentum_series,
+    calculate_rsi, calculate_rsi_series, rsi_warmup_report, load_weights, SIGNAL_LABELS
+)
+
+TIMEFRAMES = ['scalping', '1h', '4h', 'daily', 'weekly']
+
+
+def _market(n: int = 300, seed: int = 2, drift: float = 0.0):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(drift, 0.015, n))
+    volumes = rng.lognormal(0, 0.6, n) * 2e10
+    return prices, volumes
+
+
+def _markets():
+    # Random walk plus a rally and a slide, so every signal and RSI extreme occurs
+    yield _market()
+    yield _market(seed=4, drift=0.004)
+    yield _market(seed=5, drift=-0.004)
+
+
+def test_signal_series_matches_per_bar_signal():
+    weights = load_weights()
+    seen = set()
+    for prices, volumes in _markets():
+        for tf in TIMEFRAMES:
+            codes = generate_signal_series(prices, volumes, tf, weights)
+            assert codes.dtype == np.int8 and codes.shape == prices.shape
+            for i in range(len(prices)):
+                expected = generate_signal(list(prices[:i + 1]), list(volumes[:i + 1]), tf, weights)
+                assert SIGNAL_LABELS[int(codes[i])] == expected, (tf, i)
+                seen.add(expected)
+    assert seen == {'Buy', 'Sell', 'Hold'}
+
+
+def test_confidence_series_matches_per_bar_confidence():
+    weights = load_weights()
+    for prices, volumes in _markets():
+        for tf in TIMEFRAMES:
+            series = get_signal_confidence_series(prices, volumes, tf, weights)
+            assert all(values.dtype == np.float32 for values in series.values())
+            for i in range(len(prices)):
+                expected = get_signal_confidence(list(prices[:i + 1]), list(volumes[:i + 1]), tf, weights)
+                for key, value in expected.items():
+                    assert np.isclose(series[key][i], value, rtol=1e-6, atol=1e-4), (tf, i, key)
+            assert (series['overall'][:49] == 0).all()  # Fewer than 50 bars
+            assert series['overall'][49:].max() > 0
+
+
+def test_two_dimensional_series_match_rows():
+    weights = load_weights()
+    markets = list(_markets())
+    prices = np.vstack([p for p, _ in markets])
+    volumes = np.vstack([v for _, v in markets])
+    for tf in ('1h', 'daily'):
+        codes = generate_signal_series(prices, volumes, tf, weights)
+        confidence = get_signal_confidence_series(prices, volumes, tf, weights)
+        for row in range(len(markets)):
+            assert np.array_equal(codes[row], generate_signal_series(prices[row], volumes[row], tf, weights))
+            single = get_signal_confidence_series(prices[row], volumes[row], tf, weights)
+            for key in single:
+                assert np.array_equal(confidence[key][row], single[key])
+
+
+def test_indicator_series_match_prefix_values():
+    prices, _ = _market(500, seed=9)
+    ma = calculate_ma_series(prices, 30)
+    momentum = calculate_momentum_series(prices, 10)
+    assert np.isnan(ma[:29]).all()
+    for i in range(len(prices)):
+        expected = calculate_ma(prices[:i + 1], 30)
+        if expected is not None:
+            assert np.isclose(ma[i], expected, rtol=1e-12)
+        assert np.isclose(momentum[i], calculate_momentum(prices[:i + 1], 10), rtol=1e-12, atol=1e-12)
+
+
+def test_short_series():
+    weights = load_weights()
+    for n in (0, 1, 5):
+        prices, volumes = _market(n)
+        assert (generate_signal_series(prices, volumes, 'daily', weights) == 0).all()
+        assert (get_signal_confidence_series(prices, volumes, 'daily', weights)['overall'] == 0).all()
+
+
+def _scalar_wilder_rsi(prices, period: int = 14) -> float:
+    """The original per-delta Wilder loop that calculate_rsi replaced"""
+    if len(prices) < period + 1:
+        return 50.0
+    deltas = np.diff(prices)
+    seed = deltas[:period + 1]
+    up = seed[seed >= 0].sum() / period
+    down = -seed[seed < 0].sum() / period
+    rs = up / down if down != 0 else 100
+    rsi = 100. - 100. / (1. + rs)
+    for i in range(period, len(prices)):
+        delta = deltas[i - 1]
+        upval, downval = (delta, 0.) if delta > 0 else (0., -delta)
+        up = (up * (period - 1) + upval) / period
+        down = (down * (period - 1) + downval) / period
+        rs = up / down if down != 0 else 100
+        rsi = 100. - 100. / (1. + rs)
+    return rsi
+
+
+def _rsi_inputs():
+    rng = np.random.default_rng(13)
+    yield _market(400, seed=13)[0]
+    yield np.full(40, 100.0)  # No gains or losses
+    yield 100 + np.arange(40.0)  # Gains only
+    yield 100 - np.arange(40.0)  # Losses only
+    yield np.round(100 + rng.normal(0, 1, 60).cumsum())  # Repeated prices, zero deltas
+
+
+def test_rsi_matches_scalar_wilder_loop():
+    for prices in _rsi_inputs():
+        for n in range(len(prices) + 1):
+            for period in (14, 5):
+                expected = _scalar_wilder_rsi(prices[:n], period)
+                assert np.isclose(calculate_rsi(prices[:n], period), expected, rtol=0, atol=1e-9), (n, period)
+                assert np.isclose(calculate_rsi(list(prices[:n]), period), expected, rtol=0, atol=1e-9)
+
+
+def test_rsi_series_matches_prefixes():
+    for prices in _rsi_inputs():
+        series = calculate_rsi_series(prices)
+        for n in range(1, len(prices) + 1):
+            assert np.isclose(series[n - 1], calculate_rsi(prices[:n]), rtol=0, atol=1e-9), n
+
+
+def test_two_dimensional_rsi_matches_rows():
+    rng = np.random.default_rng(14)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.01, (6, 300)), axis=1)
+    for n in (5, 15, 16, 300):
+        rows = calculate_rsi(prices[:, :n])
+        assert rows.shape == (6,)
+        for row in range(6):
+            assert rows[row] == calculate_rsi(prices[row, :n]), (n, row)
+    assert np.array_equal(calculate_rsi_series(prices), np.vstack([calculate_rsi_series(p) for p in prices]))
+
+
+def test_rsi_warmup_tail_mode():
+    prices = _market(3000, seed=15)[0]
+    for warmup in (0, 10, 100):
+        tail = prices[-(14 + 1 + warmup):]
+        assert calculate_rsi(prices, warmup=warmup) == calculate_rsi(tail)
+        assert calculate_rsi(list(prices), warmup=warmup) == calculate_rsi(tail)
+    # A warm-up longer than the history is exact
+    assert calculate_rsi(prices[:200], warmup=500) == calculate_rsi(prices[:200])
+
+    report = rsi_warmup_report(prices, warmups=(10, 50, 200, 400))
+    assert report[400]['max_abs_error'] <= report[10]['max_abs_error']
+    assert report[400]['max_abs_error'] < 1e-6
+    assert all(stats['bars_evaluated'] > 0 for stats in report.values())
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
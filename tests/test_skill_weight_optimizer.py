@@ -0,0 +1,342 @@
+"""
+Skill weight optimizer tests: gradients, SkillBank storage, the sharded
+loader and the least-squares solver.
+Run with pytest or directly: python tests/test_skill_weight_optimizer.py
+"""
+
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.skill_weight_optimizer import (
+    SkillBank, SkillMath, SkillVector, TrainingExample, SkillWeightTrainer, ShardedLoader, NormalEquations,
+    SyntheticDataGenerator, WeightConfig, solve_simplex_least_squares, write_shards
+)
+
+NAMES = ['análisis', 'synthèse', '推理', 'plain', 'emoji 🚀']
+
+
+def _examples(n: int = 40, seed: int = 23):
+    rng = np.random.default_rng(seed)
+    examples = []
+    for i in range(n):
+        values = rng.uniform(0, 1, 8)
+        skill = SkillVector(NAMES[i % len(NAMES)] + f"_{i}", *values)
+        examples.append(TrainingExample(skill, float(values.mean()), context=['', 'code', 'écrit'][i % 3]))
+    return examples
+
+
+def test_analytic_gradients_match_finite_differences():
+    rng = np.random.default_rng(21)
+    examples = _examples(300)
+    trainer = SkillWeightTrainer(weight_decay=1e-3)
+    for _ in range(5):
+        theta = WeightConfig().to_array() * rng.uniform(0.5, 1.5, 13)
+        assert trainer.check_gradients(examples, theta) < 1e-4
+    # Weights concentrated on one dimension
+    theta = WeightConfig().to_array()
+    theta[:8] = [3, 0.01, 0.01, 0.01, 0.01, 0.01, 0.01, 0.01]
+    assert trainer.check_gradients(examples, theta) < 1e-4
+
+
+def test_batched_q_scores_match_per_skill():
+    examples = _examples(100)
+    bank = SkillBank.from_examples(examples)
+    weights = WeightConfig()
+    batched = SkillMath.compute_q_scores(bank.skills, weights.q_weights())
+    single = [SkillMath.compute_q_score(ex.skill, weights) for ex in examples]
+    assert np.allclose(batched, single, rtol=0, atol=1e-12)
+
+    # Clipping applies only when asked for
+    skills = np.vstack([np.full(8, 2.0), np.full(8, -1.0)])
+    assert np.array_equal(SkillMath.compute_q_scores(skills, weights.q_weights()), [1.0, 0.0])
+    assert np.allclose(SkillMath.compute_q_scores(skills, weights.q_weights(), clip=False), [2.0, -1.0])
+
+
+def test_training_reduces_loss():
+    np.random.seed(21)
+    examples = SyntheticDataGenerator.generate_training_set(n_examples=200)
+    trainer = SkillWeightTrainer(learning_rate=0.05)
+    history = trainer.train(examples[:160], examples[160:], epochs=30, verbose=False)
+    assert history['train_loss'][-1] < history['train_loss'][0]
+    assert np.isclose(trainer.weights.q_weights().sum(), 1.0)
+
+
+def _assert_same_example(got: TrainingExample, expected: TrainingExample):
+    assert got.skill.name == expected.skill.name
+    assert np.allclose(got.skill.to_array(), expected.skill.to_array())
+    assert got.target_q == expected.target_q
+    assert got.context == expected.context
+
+
+def test_non_ascii_names_round_trip():
+    examples = _examples()
+    bank = SkillBank.from_examples(examples)
+    for i, example in enumerate(examples):
+        _assert_same_example(bank[i], example)
+    skills = SkillBank.from_skills([ex.skill for ex in examples])
+    assert [skills.name(i) for i in range(len(skills))] == [ex.skill.name for ex in examples]
+    assert np.isnan(skills.targets).all()
+
+
+def test_slices_are_views_and_masks_select_rows():
+    bank = SkillBank.from_examples(_examples())
+    part = bank[10:20]
+    assert np.shares_memory(part.skills, bank.skills)
+    assert np.shares_memory(part.targets, bank.targets)
+    assert part.name(0) == bank.name(10)
+    assert part[3].context == bank[13].context
+
+    mask = bank.targets > np.median(bank.targets)
+    chosen = bank[mask]
+    assert len(chosen) == int(mask.sum())
+    assert [chosen.name(i) for i in range(len(chosen))] == [bank.name(i) for i in np.flatnonzero(mask)]
+
+
+def test_contexts_and_iteration():
+    examples = _examples()
+    bank = SkillBank.from_examples(examples)
+    assert list(bank.contexts()) == [ex.context for ex in examples]
+    assert sorted(bank.context_labels) == ['', 'code', 'écrit']
+    for got, expected in zip(bank, examples):
+        _assert_same_example(got, expected)
+
+
+def test_save_and_memory_mapped_load():
+    examples = _examples()
+    bank = SkillBank.from_examples(examples)
+    with tempfile.TemporaryDirectory() as tmp:
+        bank.save(tmp)
+        mapped = SkillBank.load(tmp)
+        assert isinstance(mapped.skills, np.memmap)
+        assert mapped.memory_bytes() == 0
+        assert np.array_equal(mapped.skills, bank.skills)
+        for i, example in enumerate(examples):
+            _assert_same_example(mapped[i], example)
+        loaded = SkillBank.load(tmp, mmap=False)
+        assert not isinstance(loaded.skills, np.memmap)
+        assert loaded.memory_bytes() > 0
+
+        # Unnamed banks drop a stale names column on save
+        SkillBank(bank.skills, bank.targets).save(tmp)
+        assert SkillBank.load(tmp).name(3) == 'skill_3'
+
+
+def test_allocate_memory_mapped_and_fill():
+    bank = SkillBank.from_examples(_examples())
+    with tempfile.TemporaryDirectory() as tmp:
+        allocated = SkillBank.allocate(len(bank), tmp)
+        for start in range(0, len(bank), 16):
+            allocated.skills[start:start + 16] = bank.skills[start:start + 16]
+            allocated.targets[start:start + 16] = bank.targets[start:start + 16]
+        allocated.save_meta(tmp)
+        reopened = SkillBank.load(tmp)
+        assert np.array_equal(reopened.skills, bank.skills)
+        assert np.array_equal(reopened.targets, bank.targets)
+
+
+def test_example_lists_with_non_ascii_names_train_and_shard():
+    examples = _examples(200)
+    trainer = SkillWeightTrainer()
+    history = trainer.train(examples, epochs=2, batch_size=64, verbose=False)
+    assert len(history['train_loss']) == 2
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_shards(examples, tmp, shard_size=64)
+        assert len(paths) == 4
+        assert SkillBank.load(paths[1]).name(0) == examples[64].skill.name
+
+
+def test_rejects_wrong_shape():
+    try:
+        SkillBank(np.zeros((3, 7)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a non (N, 8) matrix")
+
+
+def _numbered_bank(n: int) -> SkillBank:
+    """Bank whose target is the row number, so batches identify their rows"""
+    rng = np.random.default_rng(n)
+    return SkillBank(rng.uniform(0, 1, (n, 8)), np.arange(n, dtype=float))
+
+
+def _loader_threads():
+    return [t for t in threading.enumerate() if t is not threading.main_thread() and t.daemon]
+
+
+def test_every_row_once_per_epoch():
+    bank = _numbered_bank(1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_shards(bank, tmp, shard_size=300)
+        for drop_last in (False, True):
+            loader = ShardedLoader.from_directory(tmp, batch_size=64, seed=1, drop_last=drop_last)
+            epochs = []
+            for _ in range(2):
+                batches = list(loader)
+                assert len(batches) == len(loader)
+                for skills, targets in batches:
+                    assert np.array_equal(skills, bank.skills[targets.astype(int)])
+                epochs.append(np.concatenate([targets for _, targets in batches]).astype(int))
+            for rows in epochs:
+                assert len(np.unique(rows)) == len(rows)  # No row twice
+                if not drop_last:
+                    assert np.array_equal(np.sort(rows), np.arange(1000))
+                else:
+                    assert len(rows) == sum(n // 64 * 64 for n in loader.shard_sizes)
+            assert not np.array_equal(epochs[0], epochs[1])  # Reshuffled each epoch
+
+
+def test_unshuffled_order_is_sequential():
+    bank = _numbered_bank(250)
+    loader = ShardedLoader([bank[:100], bank[100:]], batch_size=32, shuffle=False)
+    rows = np.concatenate([targets for _, targets in loader])
+    assert np.array_equal(rows, np.arange(250))
+
+
+def test_early_break_stops_the_producer():
+    before = len(_loader_threads())
+    loader = ShardedLoader([_numbered_bank(10000)], batch_size=10, prefetch=2)
+    for i, _ in enumerate(loader):
+        if i == 3:
+            break
+    assert len(_loader_threads()) == before
+
+    # An exception in the consumer also releases the producer
+    try:
+        for _ in loader:
+            raise KeyError('consumer failed')
+    except KeyError:
+        pass
+    assert len(_loader_threads()) == before
+
+
+def test_producer_error_is_raised_in_consumer():
+    bank = _numbered_bank(300)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_shards(bank, tmp, shard_size=100)
+        loader = ShardedLoader(paths, batch_size=50, shuffle=False)
+        shutil.rmtree(paths[1])  # Shard disappears after the loader was built
+        seen = 0
+        try:
+            for _, targets in loader:
+                seen += len(targets)
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("expected the producer's FileNotFoundError")
+        assert seen == 100  # The first shard was delivered before the failure
+
+
+def test_minibatch_training_over_loader_reduces_loss():
+    bank = _numbered_bank(2000)
+    bank.targets[:] = bank.skills @ np.array([0.3, 0.2, 0.1, 0.1, 0.1, 0.1, 0.05, 0.05])
+    trainer = SkillWeightTrainer(learning_rate=0.05)
+    history = trainer.train(ShardedLoader([bank], batch_size=128, seed=0), epochs=5, verbose=False)
+    assert len(history['train_loss']) == 5
+    assert history['train_loss'][-1] < history['train_loss'][0]
+
+
+def test_full_batch_training_with_loader_validation():
+    examples = _examples(300)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_shards(SkillBank.from_examples(examples[200:]), tmp, shard_size=40)
+        held_out = ShardedLoader.from_directory(tmp, batch_size=32)
+        streamed = SkillWeightTrainer(learning_rate=0.05)
+        history = streamed.train(examples[:200], held_out, epochs=4, verbose=False)
+    in_memory = SkillWeightTrainer(learning_rate=0.05)
+    expected = in_memory.train(examples[:200], examples[200:], epochs=4, verbose=False)
+    assert len(history['val_loss']) == 4
+    assert np.allclose(history['val_loss'], expected['val_loss'])
+    assert np.allclose(history['val_mae'], expected['val_mae'])
+
+
+def _brute_force_simplex(xtx, xty, n, ridge=0.0):
+    """Best feasible KKT point over every support: the exact simplex least-squares optimum"""
+    Q, c = xtx / n + ridge * np.eye(8), xty / n
+    best, best_value = None, np.inf
+    for size in range(1, 9):
+        for support in itertools.combinations(range(8), size):
+            free = list(support)
+            kkt = np.zeros((size + 1, size + 1))
+            kkt[:size, :size] = Q[np.ix_(free, free)]
+            kkt[:size, size] = kkt[size, :size] = 1.0
+            solution = np.linalg.lstsq(kkt, np.append(c[free], 1.0), rcond=None)[0]
+            if solution[:size].min() < -1e-12:
+                continue
+            w = np.zeros(8)
+            w[free] = np.maximum(solution[:size], 0.0)
+            w /= w.sum()
+            value = 0.5 * w @ Q @ w - c @ w
+            if value < best_value:
+                best, best_value = w, value
+    return best, best_value
+
+
+def test_simplex_least_squares_matches_brute_force():
+    rng = np.random.default_rng(25)
+    for trial in range(60):
+        n = int(rng.integers(20, 200))
+        skills = rng.uniform(0, 1, (n, 8))
+        if trial % 3 == 0:
+            skills[:, 3] = skills[:, 1]  # Collinear columns
+        true_w = rng.dirichlet(np.full(8, 0.5))
+        targets = skills @ true_w + rng.normal(0, 0.05 * (trial % 4), n)
+        if trial % 5 == 0:
+            targets = rng.uniform(0, 1, n)  # No good fit; many weights at zero
+        stats = NormalEquations()
+        stats.update(skills, targets)
+        ridge = 1e-4 if trial % 2 else 0.0
+        w, info = solve_simplex_least_squares(stats.xtx, stats.xty, stats.n, ridge)
+        expected, expected_value = _brute_force_simplex(stats.xtx, stats.xty, stats.n, ridge)
+        Q, c = stats.xtx / n + ridge * np.eye(8), stats.xty / n
+        assert w.min() >= 0 and np.isclose(w.sum(), 1.0)
+        assert 0.5 * w @ Q @ w - c @ w <= expected_value + 1e-10, trial
+        assert info['iterations'] <= 100
+
+
+def test_normal_equations_stream_equals_batch():
+    bank = _numbered_bank(1000)
+    bank.targets[:] = np.random.default_rng(3).uniform(0, 1, 1000)
+    batch = NormalEquations()
+    batch.update(*bank.arrays())
+    streamed = NormalEquations.from_data(ShardedLoader([bank[:400], bank[400:]], batch_size=64))
+    assert streamed.n == batch.n
+    assert np.allclose(streamed.xtx, batch.xtx) and np.allclose(streamed.xty, batch.xty)
+    w = np.full(8, 1 / 8)
+    assert np.isclose(batch.mse(w), np.mean((bank.skills @ w - bank.targets) ** 2))
+
+
+def test_fit_least_squares_history_and_info():
+    np.random.seed(25)
+    examples = SyntheticDataGenerator.generate_training_set(n_examples=300)
+    train, val = examples[:240], examples[240:]
+    trainer = SkillWeightTrainer()
+    history = trainer.train(train, val, solver='least_squares', verbose=False)
+    assert set(history) == {'train_loss', 'train_mae', 'val_loss', 'val_mae'}
+    assert all(isinstance(v, list) and len(v) == 1 for v in history.values())
+    mse, mae = trainer.stream_metrics(train)
+    assert np.isclose(history['train_mae'][0], mae)
+    assert history['train_loss'][0] >= mse
+    assert trainer.fit_info['solver'] == 'least_squares'
+    assert trainer.fit_info['examples'] == 240
+    assert trainer.fit_info['iterations'] >= 1
+
+    # The one-shot fit is at least as good as gradient descent on the same data
+    sgd = SkillWeightTrainer()
+    sgd.train(train, epochs=50, verbose=False)
+    assert mse <= sgd.stream_metrics(train)[0] + 1e-6
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,127 @@
+"""
+Streaming signal engine tests against the batch functions in signals.py.
+Run with pytest or directly: python tests/test_streaming_signals.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.signals import generate_signal, get_signal_confidence, calculate_rsi, calculate_ma, load_weights
+from src.core.streaming_signals import StreamingSignalEngine, RollingMA, WilderRSI
+
+TIMEFRAMES = ['scalping', '1h', '4h', 'daily', 'weekly']
+
+
+def _series(n: int = 400, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    prices = list(60000 * np.cumprod(1 + rng.normal(0, 0.01, n)))
+    volumes = list(rng.uniform(800, 1200, n))
+    return prices, volumes
+
+
+def _assert_matches_batch(engine, prices, volumes, i, tf, weights):
+    hist_prices, hist_volumes = prices[:i + 1], volumes[:i + 1]
+    assert engine.signal() == generate_signal(hist_prices, hist_volumes, tf, weights), (tf, i)
+    batch = get_signal_confidence(hist_prices, hist_volumes, tf, weights)
+    streamed = engine.confidence()
+    for key in batch:
+        assert abs(streamed[key] - batch[key]) <= 1e-9, (tf, i, key)
+
+
+def test_streaming_matches_batch_on_every_bar():
+    prices, volumes = _series()
+    weights = load_weights()
+    for tf in TIMEFRAMES:
+        engine = StreamingSignalEngine(tf, weights)
+        for i in range(len(prices)):
+            engine.update(prices[i], volumes[i])
+            _assert_matches_batch(engine, prices, volumes, i, tf, weights)
+
+
+def test_warm_start_matches_batch():
+    prices, volumes = _series()
+    weights = load_weights()
+    for tf in TIMEFRAMES:
+        # Cut points before the RSI seed, inside and past the long MA window
+        for cut in (1, 10, 15, 16, 40, 120, 300):
+            engine = StreamingSignalEngine.from_history(prices[:cut], volumes[:cut], tf, weights)
+            _assert_matches_batch(engine, prices, volumes, cut - 1, tf, weights)
+            for i in range(cut, min(cut + 120, len(prices))):
+                engine.update(prices[i], volumes[i])
+                _assert_matches_batch(engine, prices, volumes, i, tf, weights)
+
+
+def test_rsi_seeding_matches_calculate_rsi():
+    prices, _ = _series(60, seed=3)
+    streamed = WilderRSI()
+    for n in range(1, len(prices) + 1):
+        value = streamed.update(prices[n - 1])
+        expected = calculate_rsi(prices[:n])
+        assert abs(value - expected) <= 1e-9, n  # Neutral, period + 1 seed, then smoothed
+        loaded = WilderRSI()
+        loaded.load(prices[:n])
+        assert abs(loaded.value - expected) <= 1e-9, n
+
+    # A flat series (no losses) stays at the batch value too
+    flat = [100.0] * 30
+    streamed = WilderRSI()
+    for n in range(1, 31):
+        assert streamed.update(flat[n - 1]) == calculate_rsi(flat[:n])
+
+
+def test_rolling_ma_resync_limits_drift():
+    rng = np.random.default_rng(5)
+    # Large offset with tiny moves: running sums drift without the periodic re-sum
+    values = 1e12 + rng.normal(0, 1e-3, 20000)
+    ma = RollingMA(7)
+    for i, value in enumerate(values):
+        ma.update(value)
+        if i >= 6:
+            assert abs(ma.value - calculate_ma(values[:i + 1], 7)) <= 1e-3
+        if (i + 1) % 7 == 0:
+            assert ma.total == float(np.sum(ma.window))  # Re-summed once per period
+
+    ma = RollingMA(5)
+    for value in [1.0, 2.0, 3.0]:
+        ma.update(value)
+    assert ma.value is None and ma.partial_mean == 2.0
+
+
+def test_copy_is_independent():
+    prices, volumes = _series()
+    weights = load_weights()
+    for tf in TIMEFRAMES:
+        engine = StreamingSignalEngine.from_history(prices[:200], volumes[:200], tf, weights)
+        before = engine.snapshot()
+        clone = engine.copy()
+        for i in range(200, 260):
+            clone.update(prices[i], volumes[i])
+        assert engine.snapshot() == before
+        _assert_matches_batch(clone, prices, volumes, 259, tf, weights)
+        for i in range(200, 230):
+            engine.update(prices[i], volumes[i])
+        _assert_matches_batch(engine, prices, volumes, 229, tf, weights)
+
+    # Copies taken before the RSI seed is fixed keep their own seed buffer
+    rsi = WilderRSI()
+    for price in prices[:5]:
+        rsi.update(price)
+    clone = rsi.copy()
+    for price in prices[5:30]:
+        clone.update(price)
+    assert len(rsi.seed_deltas) == 4
+    for price in prices[5:30]:
+        rsi.update(price)
+    assert rsi.value == clone.value
+    assert abs(rsi.value - calculate_rsi(prices[:30])) <= 1e-9
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,126 @@
+"""
+Columnar trade log tests.
+Run with pytest or directly: python tests/test_trade_log.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.backtest_engine import precompute_arrays, simulate, ExitReason
+from src.core.metrics import calculate_advanced_metrics
+from src.core.trade_log import TradeLog, META_FILE
+
+
+def _trades(n_bars: int = 20000, seed: int = 18):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    volumes = rng.lognormal(0, 0.6, n_bars) * 2e10
+    return precompute_arrays(prices, volumes, '4h')
+
+
+def test_append_and_reopen_round_trip():
+    arrays = _trades()
+    first, second = simulate(arrays, 50, 10000), simulate(arrays, 10000)
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'run')
+        log = TradeLog.create(path, info={'timeframe': '4h'})
+        log.append(first)
+        log.append(second, symbol=3)
+        reopened = TradeLog(path)
+        assert len(reopened) == len(first) + len(second)
+        assert reopened.info == {'timeframe': '4h'}
+        trades = reopened.to_trades()
+        for name in ('entry_idx', 'exit_idx', 'entry_price', 'exit_price', 'pnl', 'reason'):
+            expected = np.concatenate([getattr(first, name), getattr(second, name)])
+            assert np.array_equal(getattr(trades, name), expected), name
+        assert np.allclose(trades.confidence, np.concatenate([first.confidence, second.confidence]), rtol=1e-6)
+        symbols = reopened.column('symbol')
+        assert (symbols[:len(first)] == 0).all() and (symbols[len(first):] == 3).all()
+
+
+def test_create_refuses_existing_log():
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'run')
+        TradeLog.create(path)
+        try:
+            TradeLog.create(path)
+        except FileExistsError:
+            pass
+        else:
+            raise AssertionError("expected FileExistsError")
+        assert len(TradeLog.create(path, overwrite=True)) == 0
+
+
+def test_bytes_past_count_are_ignored_and_truncated():
+    trades = simulate(_trades())
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'run')
+        log = TradeLog.from_trades(path, trades)
+        # Simulate an append interrupted before meta.json was updated
+        with open(os.path.join(path, 'pnl.bin'), 'ab') as f:
+            np.ones(5).tofile(f)
+        reopened = TradeLog(path)
+        assert len(reopened) == len(trades)
+        assert np.array_equal(reopened.column('pnl'), trades.pnl)
+        reopened.append(trades)
+        assert np.array_equal(reopened.column('pnl'), np.concatenate([trades.pnl, trades.pnl]))
+        with open(os.path.join(path, META_FILE)) as f:
+            assert json.load(f)['count'] == 2 * len(trades)
+
+
+def test_filters_and_aggregates():
+    trades = simulate(_trades())
+    with tempfile.TemporaryDirectory() as root:
+        log = TradeLog.from_trades(os.path.join(root, 'run'), trades)
+        stops = log.mask(reason=[ExitReason.STOP_LOSS], min_confidence=45)
+        expected = (trades.reason == ExitReason.STOP_LOSS) & (trades.confidence.astype(np.float32) >= 45)
+        assert np.array_equal(stops, expected)
+
+        window = log.mask(entry_from=5000, entry_to=15000, min_pnl=0)
+        assert np.array_equal(window, (trades.entry_idx >= 5000) & (trades.entry_idx < 15000) & (trades.pnl >= 0))
+        assert np.array_equal(log.select(window, ['pnl'])['pnl'], trades.pnl[window])
+
+        groups = log.aggregate('reason')
+        assert sum(g['count'] for g in groups.values()) == len(trades)
+        for reason in ExitReason:
+            rows = trades.pnl[trades.reason == reason]
+            if len(rows) == 0:
+                assert reason.label not in groups
+                continue
+            group = groups[reason.label]
+            assert group['count'] == len(rows)
+            assert np.isclose(group['total_pnl'], rows.sum())
+            assert np.isclose(group['win_rate'], (rows > 0).mean() * 100)
+
+
+def test_metrics_match_direct_calculation():
+    trades = simulate(_trades())
+    with tempfile.TemporaryDirectory() as root:
+        log = TradeLog.from_trades(os.path.join(root, 'run'), trades)
+        expected = calculate_advanced_metrics(trades.pnl, None)
+        got = log.metrics()
+        for key in expected:
+            assert np.isclose(got[key], expected[key]), key
+        mask = log.mask(reason=[ExitReason.TAKE_PROFIT])
+        assert log.metrics(mask)['count'] == int(mask.sum())
+
+
+def test_empty_log():
+    with tempfile.TemporaryDirectory() as root:
+        log = TradeLog.create(os.path.join(root, 'run'))
+        assert len(log.column('pnl')) == 0
+        assert log.aggregate() == {}
+        assert log.metrics()['count'] == 0
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
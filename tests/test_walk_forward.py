@@ -0,0 +1,82 @@
+"""
+Walk-forward and shared-worker API tests.
+Run with pytest or directly: python tests/test_walk_forward.py
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.backtest_engine import precompute_arrays, simulate
+from src.core.metrics import calculate_advanced_metrics
+from src.core.param_sweep import SharedSeries, attach_shared, evaluate_window, grid_space
+from src.core.signals import load_weights
+from src.core.walk_forward import build_windows, run_walk_forward
+
+
+def _market(n_bars: int = 1200, seed: int = 13):
+    rng = np.random.default_rng(seed)
+    prices = 60000 * np.cumprod(1 + rng.normal(0, 0.02, n_bars))
+    volumes = rng.lognormal(0, 0.6, n_bars) * 2e10
+    return prices, volumes
+
+
+CONFIGS = grid_space({'short_period': [5, 10], 'long_period': [20, 50], 'entry_confidence': [30, 40]})
+
+
+def test_evaluate_window_matches_simulate():
+    prices, volumes = _market()
+    weights = load_weights()
+    with SharedSeries(prices, volumes) as shared:
+        attach_shared(shared.name, shared.shape, shared.columns, '4h', weights)
+        for params in CONFIGS[:3]:
+            arrays = precompute_arrays(prices, volumes, '4h', weights, params)
+            for start, stop in ((50, None), (300, 700)):
+                got = evaluate_window(params, start, stop)
+                expected = simulate(arrays, start, stop, params)
+                assert np.array_equal(got.entry_idx, expected.entry_idx)
+                assert np.array_equal(got.pnl, expected.pnl)
+
+
+def test_build_windows():
+    rolling = build_windows(1000, 300, 100)
+    assert [w.test_start for w in rolling] == [350, 450, 550, 650, 750, 850]
+    assert all(w.train_stop - w.train_start == 300 for w in rolling)
+    anchored = build_windows(1000, 300, 100, anchored=True)
+    assert all(w.train_start == 50 for w in anchored)
+    assert all(w.test_stop <= 1000 for w in anchored)
+
+
+def test_test_metrics_match_direct_backtest():
+    prices, volumes = _market()
+    weights = load_weights()
+    windows = build_windows(len(prices), 400, 150)
+    result = run_walk_forward(prices, volumes, CONFIGS, windows, timeframe='4h', min_trades=2, max_workers=2)
+    assert len(result['windows']) == len(windows)
+
+    arrays = {p: precompute_arrays(prices, volumes, '4h', weights, p) for p in CONFIGS}
+    all_pnl = []
+    for row in result['windows']:
+        window, params = row['window'], row['params']
+        if params is None:
+            continue
+        trains = [simulate(arrays[p], window.train_start, window.train_stop, p) for p in CONFIGS]
+        best = max(calculate_advanced_metrics(t.pnl, None)['sharpe'] for t in trains if len(t) >= 2)
+        assert np.isclose(row['train_score'], best)
+        test = simulate(arrays[params], window.test_start, window.test_stop, params)
+        expected = calculate_advanced_metrics(test.pnl, None)
+        assert row['test']['count'] == expected['count']
+        assert np.isclose(row['test']['sharpe'], expected['sharpe'])
+        all_pnl.extend(test.pnl)
+    assert result['out_of_sample']['count'] == len(all_pnl)
+    assert np.isclose(result['out_of_sample']['roi'], calculate_advanced_metrics(all_pnl, None)['roi'])
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
@@ -0,0 +1,119 @@
+"""
+Weights registry and weights-version tests.
+Run with pytest or directly: python tests/test_weights_registry.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.weights_registry import WeightsRegistry
+from src.core.signal_integration import SignalGenerator
+
+
+def _write_weights(path: str, weights: dict, history_len: int = 10):
+    with open(path, 'w') as f:
+        json.dump({'weights': weights, 'training_history': {'train_loss': [0.1] * history_len}}, f)
+
+
+def test_parses_once_until_file_changes():
+    registry = WeightsRegistry()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'w.json')
+        _write_weights(path, {'w_C': 0.2})
+        assert registry.get(path) == {'w_C': 0.2}
+        version = registry.version(path)
+        registry.get(path)
+        assert registry.parse_count == 1
+        assert registry.version(path) == version
+
+        _write_weights(path, {'w_C': 0.3}, history_len=20)  # Size changes
+        assert registry.get(path) == {'w_C': 0.3}
+        assert registry.version(path) > version
+        assert registry.parse_count == 2
+
+
+def test_get_returns_independent_nested_copies():
+    registry = WeightsRegistry()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'w.json')
+        _write_weights(path, {'w_C': 0.2, 'synthesis_weights': {'alpha': [1.0, 2.0]}})
+        weights = registry.get(path)
+        weights['synthesis_weights']['alpha'].append(3.0)
+        weights['synthesis_weights']['beta'] = 0.5
+        assert registry.get(path) == {'w_C': 0.2, 'synthesis_weights': {'alpha': [1.0, 2.0]}}
+        assert registry.parse_count == 1
+
+
+def test_version_never_repeats_after_invalidate():
+    registry = WeightsRegistry()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'w.json')
+        _write_weights(path, {'w_C': 0.2})
+        seen = {registry.version(path)}
+        for value in (0.3, 0.4, 0.5):
+            registry.invalidate(path)
+            _write_weights(path, {'w_C': value})
+            version = registry.version(path)
+            assert version not in seen
+            assert version > max(seen)
+            seen.add(version)
+        registry.invalidate()
+        assert registry.version(path) > max(seen)
+
+
+def test_versions_unique_across_registries_and_paths():
+    first, second = WeightsRegistry(), WeightsRegistry()
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = os.path.join(tmp, 'a.json'), os.path.join(tmp, 'b.json')
+        _write_weights(a, {'w_C': 0.2})
+        _write_weights(b, {'w_C': 0.2})
+        versions = [first.version(a), first.version(b), second.version(a)]
+        assert len(set(versions)) == 3
+
+
+def test_missing_file_gives_empty_weights():
+    registry = WeightsRegistry()
+    assert registry.get('/nonexistent/weights.json') == {}
+
+
+def test_override_version_bumps_on_every_assignment():
+    generator = SignalGenerator(cache_size=0)
+    weights = {'w_C': 0.2, 'w_S': 0.2, 'w_V': 0.1}
+    generator.weights = weights
+    first = generator._weights_version()
+    weights['w_C'] = 0.9  # In-place change of the caller's dict...
+    assert generator.weights['w_C'] == 0.2  # ...does not leak into the generator
+    generator.weights = weights
+    assert generator._weights_version() != first
+
+
+def test_cache_not_served_across_override_changes():
+    np.random.seed(4)
+    prices = list(60000 * np.cumprod(1 + np.random.normal(0, 0.02, 300)))
+    volumes = list(np.random.lognormal(0, 0.6, 300) * 2e10)
+    cached = SignalGenerator(cache_size=16, cache_ttl=None)
+    fresh = SignalGenerator(cache_size=0)
+
+    weights = {'w_C': 0.05, 'w_S': 0.05, 'w_V': 0.05}
+    for value in (0.05, 0.9, 0.05):
+        weights.update(w_C=value, w_S=value)
+        cached.weights = weights
+        fresh.weights = weights
+        got = cached.generate_multi_timeframe_signals(prices, volumes)
+        expected = fresh.generate_multi_timeframe_signals(prices, volumes)
+        for tf in expected:
+            assert got[tf]['confidence'] == expected[tf]['confidence']
+            assert got[tf]['signal'] == expected[tf]['signal']
+
+
+if __name__ == '__main__':
+    tests = [(name, fn) for name, fn in list(globals().items()) if name.startswith('test_')]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
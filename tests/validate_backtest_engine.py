@@ -0,0 +1,128 @@
+import sys
+import os
+import time
+import pandas as pd
+import numpy as np
+from typing import Dict
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.signals import load_weights
+from src.core.backtest_engine import precompute_arrays, simulate, run_backtest_arrays, AMBIGUOUS_RULES
+# The reference loop and parity assertions live in the pytest module
+from test_backtest_engine import (
+    TIMEFRAMES, reference_backtest, trade_mismatches, bar_arrays, engine_roi, random_walk
+)
+
+def compare_with_reference(df: pd.DataFrame, intrabar: bool = False, rules=('stop_first',), label: str = '') -> int:
+    """Trade-by-trade comparison table for every timeframe; returns the mismatch count."""
+    mismatches = 0
+    print(f"\n{label}")
+    print("| Timeframe | Rule         | Trades | Ref trades | Mismatched | ROI (%) | Ref ROI (%) |")
+    print("|-----------|--------------|--------|------------|------------|---------|-------------|")
+    for tf in TIMEFRAMES:
+        arrays = precompute_arrays(df['Close'].to_numpy(), df['Volume'].to_numpy(), tf, **bar_arrays(df, intrabar))
+        for rule in rules:
+            ref = reference_backtest(df, tf, intrabar=intrabar, ambiguous=rule)
+            trades = simulate(arrays, 50, ambiguous=rule)
+            roi = engine_roi(trades)
+            bad = trade_mismatches(ref['trade_details'], trades)
+            if abs(roi - ref['roi']) > 1e-9:
+                bad += 1
+            mismatches += bad
+            print(f"| {tf:9} | {rule:12} | {len(trades):6} | {ref['count']:10} | {bad:10} | {roi:7.2f} | {ref['roi']:11.2f} |")
+    return mismatches
+
+def compare_random_walks(n_bars: int = 1500, seeds=(11, 12)) -> int:
+    """Close-only and intrabar (every ambiguity rule) parity on long random walks."""
+    mismatches = 0
+    for seed in seeds:
+        df = random_walk(n_bars, seed)
+        mismatches += compare_with_reference(df, label=f"Random walk {seed}, {n_bars} bars, close only")
+        mismatches += compare_with_reference(
+            df, intrabar=True, rules=AMBIGUOUS_RULES, label=f"Random walk {seed}, {n_bars} bars, intrabar"
+        )
+        no_open = df.drop(columns=['Open'])
+        mismatches += compare_with_reference(
+            no_open, intrabar=True, rules=('open_nearest',), label=f"Random walk {seed}, {n_bars} bars, High/Low only"
+        )
+    return mismatches
+
+def compare_intrabar_rules(n_bars: int = 20_000, timeframe: str = 'scalping') -> int:
+    """
+    Intrabar SL/TP on synthetic OHLC bars. A zero-range bar (High = Low = Close)
+    must reproduce the close-only result exactly; returns the mismatch count.
+    """
+    np.random.seed(17)
+    close = 60000 * np.cumprod(1 + np.random.normal(0, 0.02, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e10
+    open_ = np.concatenate(([close[0]], close[:-1])) * np.random.uniform(0.995, 1.005, n_bars)
+    high = np.maximum(open_, close) * np.random.uniform(1.0, 1.03, n_bars)
+    low = np.minimum(open_, close) * np.random.uniform(0.97, 1.0, n_bars)
+
+    close_only = run_backtest_arrays(close, volumes, timeframe)
+    degenerate = run_backtest_arrays(close, volumes, timeframe, high=close, low=close)
+    mismatches = int(close_only['count'] != degenerate['count'] or abs(close_only['roi'] - degenerate['roi']) > 1e-12)
+
+    print(f"\n| Fill model            | Trades | ROI (%) | Sharpe | Win rate (%) |")
+    print(f"|-----------------------|--------|---------|--------|--------------|")
+    print(f"| close only            | {close_only['count']:6} | {close_only['roi']:7.1f} | {close_only['sharpe']:6.2f} | {close_only['win_rate']:12.1f} |")
+    for rule in AMBIGUOUS_RULES:
+        res = run_backtest_arrays(close, volumes, timeframe, high=high, low=low, open=open_, ambiguous=rule)
+        print(f"| intrabar {rule:12} | {res['count']:6} | {res['roi']:7.1f} | {res['sharpe']:6.2f} | {res['win_rate']:12.1f} |")
+    return mismatches
+
+def measure_throughput(n_bars: int = 100_000, timeframe: str = '4h') -> Dict[str, float]:
+    """Bars per second for precomputation and simulation on a synthetic series."""
+    np.random.seed(7)
+    prices = 60000 * np.cumprod(1 + np.random.normal(0, 0.02, n_bars))
+    volumes = np.random.lognormal(0, 0.6, n_bars) * 2e10
+    weights = load_weights()
+
+    start = time.perf_counter()
+    arrays = precompute_arrays(prices, volumes, timeframe, weights)
+    precompute_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trades = simulate(arrays)
+    simulate_s = time.perf_counter() - start
+
+    total = precompute_s + simulate_s
+    return {
+        'bars': n_bars,
+        'trades': len(trades),
+        'precompute_s': precompute_s,
+        'simulate_s': simulate_s,
+        'bars_per_sec': n_bars / total
+    }
+
+if __name__ == '__main__':
+    data_path = 'kaggle_data/bitcoin_demo.csv'
+    df = pd.read_csv(data_path)
+
+    print("="*80)
+    print("BACKTEST ENGINE PARITY (vs. per-bar reference loop)")
+    print("="*80)
+    mismatches = compare_with_reference(df, label=data_path)
+    mismatches += compare_random_walks()
+
+    print("\n" + "="*80)
+    print("INTRABAR SL/TP (High/Low)")
+    print("="*80)
+    mismatches += compare_intrabar_rules()
+
+    print("\n" + "="*80)
+    print("THROUGHPUT")
+    print("="*80)
+    stats = measure_throughput()
+    print(f"Bars: {stats['bars']:,}, trades: {stats['trades']:,}")
+    print(f"Precompute: {stats['precompute_s'] * 1000:.1f} ms, simulate: {stats['simulate_s'] * 1000:.1f} ms")
+    print(f"Throughput: {stats['bars_per_sec']:,.0f} bars/sec")
+
+    print("\n" + "="*80)
+    if mismatches == 0:
+        print("✅ ENGINE MATCHES REFERENCE")
+    else:
+        print(f"⚠️ {mismatches} trade(s) differ from the reference")
+    print("="*80 + "\n")
@@ -4,12 +4,16 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.core.signals import generate_signal, calculate_sl_tp, load_weights, get_signal_confidence
+from src.core.backtest_engine import run_backtest_arrays
+from src.core.indicator_bank import IndicatorBank
+from src.core.metrics import calculate_advanced_metrics
+from src.core.param_sweep import grid_space
+from src.core.walk_forward import build_windows, run_walk_forward
 
 def generate_emergency_data(path: str) -> pd.DataFrame:
     """Generate synthetic BTC data for testing when real data unavailable."""
@@ -30,169 +34,42 @@ def generate_emergency_data(path: str) -> pd.DataFrame:
     df.to_csv(path, index=False)
     return df
 
-def calculate_advanced_metrics(trades: List[float], equity_curve: List[float]) -> Dict[str, float]:
-    """
-    Calculate comprehensive backtest metrics.
-    
-    Args:
-        trades: List of trade P&L ratios
-        equity_curve: List of cumulative equity values
-    
-    Returns:
-        Dictionary with advanced metrics
-    """
-    if not trades:
-        return {
-            'roi': 0, 'sharpe': 0, 'drawdown': 0, 'win_rate': 0, 
-            'count': 0, 'profit_factor': 0, 'recovery': 0, 'calmar': 0
-        }
-    
-    roi = sum(trades) * 100
-    win_count = len([t for t in trades if t > 0])
-    loss_count = len([t for t in trades if t < 0])
-    win_rate = (win_count / len(trades) * 100) if trades else 0
-    
-    # Sharpe Ratio
-    avg_pnl = np.mean(trades)
-    std_pnl = np.std(trades) if len(trades) > 1 else 0
-    sharpe = (avg_pnl / std_pnl * np.sqrt(len(trades))) if std_pnl > 0 else 0
-    
-    # Maximum Drawdown
-    cum_returns = np.cumsum(trades)
-    peak = np.maximum.accumulate(cum_returns)
-    drawdown = (np.min(cum_returns - peak) * 100) if len(cum_returns) > 0 else 0
-    
-    # Profit Factor (gross wins / gross losses)
-    gross_wins = sum([t for t in trades if t > 0])
-    gross_losses = abs(sum([t for t in trades if t < 0]))
-    profit_factor = (gross_wins / gross_losses) if gross_losses > 0 else float('inf') if gross_wins > 0 else 0
-    
-    # Recovery Factor (ROI / Max Drawdown)
-    recovery = (roi / abs(drawdown)) if drawdown < 0 else 0
-    
-    # Calmar Ratio (annual return / max drawdown)
-    calmar = (roi / abs(drawdown)) if drawdown < 0 else 0
-    
-    return {
-        'roi': float(roi),
-        'sharpe': float(sharpe),
-        'drawdown': float(drawdown),
-        'win_rate': float(win_rate),
-        'count': len(trades),
-        'profit_factor': float(profit_factor) if profit_factor != float('inf') else 999,
-        'recovery': float(recovery),
-        'calmar': float(calmar)
-    }
+def bar_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Open/High/Low arrays for intrabar SL/TP when the data has them (Close-only otherwise)."""
+    columns = {}
+    if 'High' in df.columns and 'Low' in df.columns:
+        columns['high'] = df['High'].to_numpy()
+        columns['low'] = df['Low'].to_numpy()
+        if 'Open' in df.columns:
+            columns['open'] = df['Open'].to_numpy()
+    return columns
 
-def run_backtest(df: pd.DataFrame, timeframe: str, min_history: int = 50) -> Dict:
+def run_backtest(
+    df: pd.DataFrame,
+    timeframe: str,
+    min_history: int = 50,
+    n_bootstrap: int = 0,
+    bank: Optional[IndicatorBank] = None
+) -> Dict:
     """
     Run walk-forward backtest with enhanced position management.
+    Indicators are precomputed once by src.core.backtest_engine.
     
     Args:
-        df: DataFrame with 'Close' and 'Volume' columns
+        df: DataFrame with 'Close' and 'Volume' columns; optional 'Open', 'High'
+            and 'Low' columns resolve SL/TP hits intrabar
         timeframe: Trading timeframe
         min_history: Minimum bars needed before first trade
+        n_bootstrap: Trade resamples for the metric confidence intervals (0 to skip)
+        bank: Indicators for df shared with other runs (None computes them here)
     
     Returns:
         Dictionary with backtest results and metrics
     """
-    prices = df['Close'].tolist()
-    volumes = df['Volume'].tolist()
-    weights = load_weights()
-    
-    trades = []
-    equity_curve = [1.0]  # Starting equity normalized to 1
-    current_position = None
-    trade_details = []
-    signal_scores = []
-    
-    # Start trading after sufficient history
-    start_idx = max(min_history, 50)
-    
-    for i in range(start_idx, len(df)):
-        current_price = prices[i]
-        hist_prices = prices[:i+1]
-        hist_volumes = volumes[:i+1]
-        
-        # Get signal confidence
-        confidence = get_signal_confidence(hist_prices, hist_volumes, timeframe, weights)
-        signal_scores.append(confidence['overall'])
-        
-        # Check existing position
-        if current_position:
-            pos_return = (current_price - current_position['entry']) / current_position['entry']
-            
-            # Check SL hit
-            if current_price <= current_position['sl']:
-                pnl = (current_position['sl'] - current_position['entry']) / current_position['entry']
-                trades.append(pnl)
-                trade_details.append({
-                    'entry': current_position['entry'],
-                    'exit': current_position['sl'],
-                    'pnl': pnl,
-                    'reason': 'stop_loss'
-                })
-                equity_curve.append(equity_curve[-1] * (1 + pnl))
-                current_position = None
-            # Check TP hit
-            elif current_position['tp'] and current_price >= current_position['tp']:
-                pnl = (current_position['tp'] - current_position['entry']) / current_position['entry']
-                trades.append(pnl)
-                trade_details.append({
-                    'entry': current_position['entry'],
-                    'exit': current_position['tp'],
-                    'pnl': pnl,
-                    'reason': 'take_profit'
-                })
-                equity_curve.append(equity_curve[-1] * (1 + pnl))
-                current_position = None
-            # Check exit signal
-            else:
-                sig = generate_signal(hist_prices, hist_volumes, timeframe, weights)
-                if sig == 'Sell' and confidence['overall'] > 30:  # Exit on strong sell signal
-                    pnl = (current_price - current_position['entry']) / current_position['entry']
-                    trades.append(pnl)
-                    trade_details.append({
-                        'entry': current_position['entry'],
-                        'exit': current_price,
-                        'pnl': pnl,
-                        'reason': 'signal_exit'
-                    })
-                    equity_curve.append(equity_curve[-1] * (1 + pnl))
-                    current_position = None
-        
-        # Look for entry (only if not in position and confidence high enough)
-        if not current_position and confidence['overall'] > 40:
-            sig = generate_signal(hist_prices, hist_volumes, timeframe, weights)
-            if sig == 'Buy':
-                momentum = ((prices[i] - prices[max(0, i-10)]) / prices[max(0, i-10)]) * 100
-                sl, tp = calculate_sl_tp(current_price, timeframe, trend_strength=momentum)
-                current_position = {
-                    'entry': current_price,
-                    'sl': sl,
-                    'tp': tp,
-                    'entry_idx': i,
-                    'confidence': confidence['overall']
-                }
-    
-    # Close open position at end
-    if current_position:
-        pnl = (prices[-1] - current_position['entry']) / current_position['entry']
-        trades.append(pnl)
-        trade_details.append({
-            'entry': current_position['entry'],
-            'exit': prices[-1],
-            'pnl': pnl,
-            'reason': 'end_of_period'
-        })
-        equity_curve.append(equity_curve[-1] * (1 + pnl))
-    
-    # Calculate metrics
-    metrics = calculate_advanced_metrics(trades, equity_curve)
-    metrics['avg_signal_confidence'] = float(np.mean(signal_scores)) if signal_scores else 0
-    metrics['trade_details'] = trade_details[:5]  # Store first 5 trades for debugging
-    
-    return metrics
+    return run_backtest_arrays(
+        df['Close'].to_numpy(), df['Volume'].to_numpy(), timeframe, min_history=min_history,
+        n_bootstrap=n_bootstrap, bank=bank, **bar_columns(df)
+    )
 
 def run_multi_timeframe_validation(df: pd.DataFrame) -> Dict[str, Dict]:
     """
@@ -200,6 +77,8 @@ def run_multi_timeframe_validation(df: pd.DataFrame) -> Dict[str, Dict]:
     """
     timeframes = ['scalping', '1h', '4h', 'daily', 'weekly']
     results = {}
+    # All timeframes read their MAs, RSI and volume means from one bank
+    bank = IndicatorBank(df['Close'].to_numpy(), df['Volume'].to_numpy())
     
     print("\n" + "="*100)
     print("MULTI-TIMEFRAME SIGNAL VALIDATION REPORT")
@@ -208,14 +87,16 @@ def run_multi_timeframe_validation(df: pd.DataFrame) -> Dict[str, Dict]:
     print(f"Bars: {len(df)}")
     print("="*100)
     
-    print("\n| Timeframe | ROI (%) | Sharpe | Max DD (%) | Win Rate (%) | # Trades | Profit Factor | Confidence |")
-    print("|-----------|---------|--------|------------|--------------|----------|---------------|------------|")
+    print("\n| Timeframe | ROI (%) | Sharpe | Sharpe 95% CI     | Max DD (%) | Win Rate (%) | # Trades | Profit Factor | Confidence |")
+    print("|-----------|---------|--------|-------------------|------------|--------------|----------|---------------|------------|")
     
     for tf in timeframes:
-        res = run_backtest(df, tf)
+        res = run_backtest(df, tf, n_bootstrap=2000, bank=bank)
         results[tf] = res
         pf_str = f"{res['profit_factor']:.2f}" if res['profit_factor'] != 999 else "N/A"
-        print(f"| {tf.capitalize():9} | {res['roi']:7.1f} | {res['sharpe']:6.2f} | {res['drawdown']:10.1f} | {res['win_rate']:12.1f} | {res['count']:8} | {pf_str:13} | {res['avg_signal_confidence']:10.1f} |")
+        lo, hi = res['intervals']['sharpe']
+        ci_str = f"[{lo:6.2f}, {hi:6.2f}]"
+        print(f"| {tf.capitalize():9} | {res['roi']:7.1f} | {res['sharpe']:6.2f} | {ci_str:17} | {res['drawdown']:10.1f} | {res['win_rate']:12.1f} | {res['count']:8} | {pf_str:13} | {res['avg_signal_confidence']:10.1f} |")
     
     # Aggregate analysis
     print("\n" + "-"*100)
@@ -237,6 +118,11 @@ def run_multi_timeframe_validation(df: pd.DataFrame) -> Dict[str, Dict]:
     baseline_sharpe = 1.28  # From prior validation
     delta = agg_sharpe - baseline_sharpe
     print(f"\nSharpe Delta from baseline (1.28): {delta:+.2f}")
+    # A single Sharpe over a handful of trades is noisy; only a CI clear of the baseline is conclusive
+    above = [tf for tf, r in results.items() if r['count'] > 1 and r['intervals']['sharpe'][0] > baseline_sharpe]
+    below = [tf for tf, r in results.items() if r['count'] > 1 and r['intervals']['sharpe'][1] < baseline_sharpe]
+    print(f"Sharpe 95% CI above baseline: {len(above)}/{len(results)} timeframes {above}")
+    print(f"Sharpe 95% CI below baseline: {len(below)}/{len(results)} timeframes {below}")
     
     print("\n" + "="*100)
     if delta > 0:
@@ -249,6 +135,42 @@ def run_multi_timeframe_validation(df: pd.DataFrame) -> Dict[str, Dict]:
     
     return results
 
+def run_walk_forward_validation(df: pd.DataFrame, timeframe: str = 'daily', min_test_bars: int = 50) -> Dict:
+    """
+    Out-of-sample check: tune on rolling train windows, score on the next test window.
+    Skipped when the data is too short for windows of at least `min_test_bars`.
+    """
+    n_bars = len(df)
+    test_size = (n_bars - 50) // 6
+    if test_size < min_test_bars:
+        print(f"Walk-forward skipped: {n_bars} bars is too short for {min_test_bars}-bar test windows")
+        return {}
+
+    configs = grid_space({
+        'short_period': [5, 7, 10],
+        'long_period': [20, 30, 50],
+        'entry_confidence': [30, 40, 50]
+    }, timeframe=timeframe)
+    windows = build_windows(n_bars, train_size=2 * test_size, test_size=test_size)
+    report = run_walk_forward(
+        df['Close'].to_numpy(), df['Volume'].to_numpy(), configs, windows, timeframe, bars=bar_columns(df)
+    )
+
+    print("\n" + "="*100)
+    print(f"WALK-FORWARD VALIDATION ({timeframe}, {len(windows)} windows x {len(configs)} configs)")
+    print("="*100)
+    print("| Test window     | MA periods | Entry conf | Train Sharpe | Test ROI (%) | Test Sharpe | # Trades |")
+    print("|-----------------|------------|------------|--------------|--------------|-------------|----------|")
+    for row in report['windows']:
+        w, p, t = row['window'], row['params'], row['test']
+        periods = f"{p.short_period}/{p.long_period}" if p else "-"
+        entry = f"{p.entry_confidence}" if p else "-"
+        train = f"{row['train_score']:.2f}" if p else "-"
+        print(f"| {w.test_start:6}-{w.test_stop:<8} | {periods:10} | {entry:10} | {train:12} | {t['roi']:12.1f} | {t['sharpe']:11.2f} | {t['count']:8} |")
+    oos = report['out_of_sample']
+    print(f"\nOut-of-sample Sharpe: {oos['sharpe']:.2f}, ROI: {oos['roi']:.2f}%, trades: {oos['count']}")
+    return report
+
 if __name__ == '__main__':
     data_path = 'kaggle_data/bitcoin_demo.csv'
     if not os.path.exists(data_path):
@@ -262,3 +184,4 @@ if __name__ == '__main__':
         df['Date'] = pd.date_range(start='2025-12-01', periods=len(df), freq='D')
     
     results = run_multi_timeframe_validation(df)
+    run_walk_forward_validation(df)